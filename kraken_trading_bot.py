@@ -11,6 +11,11 @@ from datetime import datetime, timedelta
 import json
 import time
 import os
+import sys
+
+# Shared indicator kernels live in the trading-bot package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trading-bot'))
+from src.indicators import kernels
 
 class KrakenTradingBot:
     def __init__(self, api_key=None, private_key=None, paper_trading=True):
@@ -74,29 +79,7 @@ class KrakenTradingBot:
     
     def calculate_rsi(self, closes, period=14):
         """Calculate RSI for a series of closing prices"""
-        deltas = np.diff(closes)
-        seed = deltas[:period+1]
-        up = seed[seed >= 0].sum()/period
-        down = -seed[seed < 0].sum()/period
-        rs = up/down if down != 0 else 0
-        rsi = np.zeros_like(closes)
-        rsi[:period] = 100. - 100./(1. + rs)
-        
-        for i in range(period, len(closes)):
-            delta = deltas[i - 1]
-            if delta > 0:
-                upval = delta
-                downval = 0.
-            else:
-                upval = 0.
-                downval = -delta
-            
-            up = (up * (period - 1) + upval) / period
-            down = (down * (period - 1) + downval) / period
-            rs = up/down if down != 0 else 0
-            rsi[i] = 100. - 100./(1. + rs)
-        
-        return rsi
+        return kernels.rsi(np.asarray(closes, dtype=float), period)
     
     def fetch_ohlcv(self, symbol, timeframe='1h', limit=100):
         """Fetch OHLCV data"""
@@ -10,9 +10,13 @@ import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List
+import sys
 import time
 import logging
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.data.historical_store import HistoricalStore
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -30,6 +34,7 @@ class KrakenDataFetcher:
         self.exchange = ccxt.kraken({'enableRateLimit': True})
         self.data_dir = Path.home() / ".vayu" / "backtest_data"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.store = HistoricalStore(self.data_dir)
     
     def fetch_ohlcv(
         self,
@@ -121,13 +126,9 @@ class KrakenDataFetcher:
         return df
     
     def _save_data(self, df: pd.DataFrame, symbol: str, timeframe: str):
-        """Save data to disk for caching."""
-        # Clean symbol for filename
-        safe_symbol = symbol.replace('/', '_')
-        filename = f"{safe_symbol}_{timeframe}.csv"
-        filepath = self.data_dir / filename
-        
-        df.to_csv(filepath, index=False)
+        """Save data to disk for caching (merged with earlier downloads)."""
+        # The timestamp index is written as epoch ms so the range checks can use it
+        filepath = self.store.save(df, symbol, timeframe)
         logger.info(f"Saved to {filepath}")
     
     def load_cached(
@@ -143,19 +144,17 @@ class KrakenDataFetcher:
         Returns:
             DataFrame or None if cache miss
         """
-        safe_symbol = symbol.replace('/', '_')
-        filename = f"{safe_symbol}_{timeframe}.csv"
-        filepath = self.data_dir / filename
-        
-        if not filepath.exists():
+        if not self.store.has(symbol, timeframe):
             return None
         
-        df = pd.read_csv(filepath)
+        df = self.store.load(symbol, timeframe)
+        df.index = pd.to_datetime(df.pop('timestamp'), unit='ms')
+        df.index.name = 'timestamp'
         
         # Check if data covers requested range
-        if since and df.index[0] > since:
+        if since and df.index[0] > pd.Timestamp(since):
             return None  # Cache doesn't go back far enough
-        if until and df.index[-1] < until:
+        if until and df.index[-1] < pd.Timestamp(until):
             return None  # Cache doesn't go forward far enough
         
         # Filter to requested range
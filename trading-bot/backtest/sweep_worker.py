@@ -0,0 +1,59 @@
+"""
+VAYU Trading Bot - Sweep Worker
+===============================
+Serve a sweep job queue (src/utils/job_queue.py) from this machine.
+
+Start one of these on every machine that mounts the queue file; each
+runs --workers processes that pull tasks until the queue is drained
+(or stays empty for --idle-timeout seconds). Stopping or crashing a
+worker is safe: its running tasks are re-queued once their lease
+expires, and finished tasks are already checkpointed.
+
+Usage:
+    python backtest/sweep_worker.py --queue /shared/vayu/sweeps.sqlite
+        [--job JOB_ID] [--workers N] [--lease 300] [--idle-timeout 0]
+
+    # Queue a job from Python, then collect it once the workers finish:
+    queue = JobQueue("/shared/vayu/sweeps.sqlite")
+    job_id = VAYUBacktester().submit_walk_forward(queue, price, ...)
+    ...
+    df = queue.collect(job_id)
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backtest"))   # Task functions live in vectorbt_backtest
+
+from src.utils.job_queue import JobQueue, run_local_workers
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--queue", required=True, help="Queue database (SQLite file)")
+    parser.add_argument("--job", default=None, help="Only serve this job id")
+    parser.add_argument("--workers", type=int, default=-1, help="Worker processes (default: every core)")
+    parser.add_argument("--lease", type=float, default=300.0, help="Task lease in seconds")
+    parser.add_argument("--idle-timeout", type=float, default=0.0,
+                        help="Keep polling an empty queue this long before exiting")
+    parser.add_argument("--status", action="store_true", help="Print job progress and exit")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        queue = JobQueue(args.queue)
+        for job_id in ([args.job] if args.job else queue.jobs()):
+            print(f"{job_id}: {queue.progress(job_id)}")
+        queue.close()
+        return 0
+
+    done = run_local_workers(args.queue, args.workers, job_id=args.job,
+                             lease_seconds=args.lease, idle_timeout=args.idle_timeout)
+    print(f"✅ {done} task(s) completed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
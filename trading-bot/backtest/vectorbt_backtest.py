@@ -3,9 +3,11 @@ VAYU Trading Bot - VectorBT Backtest Framework
 ================================================
 Proper backtesting with:
 - Look-ahead bias prevention (shift indicators)
+- ATR-stop and max-hold exits like the live strategy (optional)
 - Parameter optimization
 - Out-of-sample validation
 - Walk-forward analysis
+- Resumable sweep jobs on a shared work queue (backtest/sweep_worker.py)
 """
 
 import vectorbt as vbt
@@ -15,22 +17,85 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import yaml
 from typing import Dict, Tuple, Optional
+import gc
 import logging
+import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+# Share indicator kernels with the live strategy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.indicators import kernels
+from src.indicators.windowed import WindowedIndicators
+from src.utils.shared_arrays import SharedArrays, SharedArraysSpec
+from src.utils.result_cache import ResultCache, make_key, data_digest
+from src.utils.job_queue import JobQueue
+from src.backtest.monte_carlo import MonteCarloSimulator
+from src.backtest import metrics as fast_metrics
+from src.backtest.search import SearchResult, SuccessiveHalving, TPESearch
+from src.backtest.exits import apply_exits
+from src.backtest.pruning import PruningRules
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parameter grid searched in each walk-forward training window (reduced for speed)
+WALK_FORWARD_GRID = {
+    'rsi_windows': range(10, 21, 2),
+    'oversold_range': range(25, 36, 5),
+    'overbought_range': range(65, 76, 5)
+}
+
+# Default space for search_parameters: generate_signals arguments
+# (the strategy keys of config.paper.yaml)
+SEARCH_SPACE = {
+    'rsi_period': range(7, 29),
+    'rsi_oversold': range(20, 41, 5),
+    'rsi_overbought': range(60, 81, 5),
+    'ema_period': range(50, 301, 25),
+    'atr_multiplier': [2.0, 2.5, 3.0, 4.0, 5.0],
+    'max_hold_bars': [12, 24, 48, 96]
+}
+
+# Part of every result-cache key: bump when generate_signals / run_backtest
+# change in a way that alters results, so stale cached results stop matching
+SIGNAL_VERSION = "2"
+
+
+def _rank_by_metric(df: pd.DataFrame, metric: str) -> pd.DataFrame:
+    """
+    Rows by metric, best first. Columns that never trade rank last with
+    pruned (NaN) ones, as in BacktestObjective: vectorbt gives a flat
+    equity curve an infinite Sharpe ratio. Stable, so ties keep grid order.
+    """
+    if metric not in df.columns:
+        return df
+    score = df[metric].where(df['trades'] > 0) if 'trades' in df.columns else df[metric]
+    order = score.sort_values(ascending=False, kind='stable').index
+    return df.loc[order]
+
 
 class VAYUBacktester:
     """
     VectorBT-based backtest framework for RSI momentum strategy.
     
     Key feature: Proper look-ahead bias prevention by shifting signals.
+    
+    With a ResultCache, optimize_parameters and walk-forward windows are
+    answered from the cache when the price data, parameters and signal
+    version are unchanged.
     """
     
-    def __init__(self, config_path: str = "~/.vayu/config.yaml"):
-        self.config = self._load_config(config_path)
+    def __init__(
+        self,
+        config_path: str = "~/.vayu/config.yaml",
+        config: Optional[Dict] = None,
+        cache: Optional[ResultCache] = None
+    ):
+        self.config = config if config is not None else self._load_config(config_path)
+        self.cache = cache
         self.price_data = {}
         self.results = {}
     
@@ -175,27 +240,17 @@ class VAYUBacktester:
         return price
     
     def calculate_rsi(self, price: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate RSI using pandas-ta or manual method."""
-        try:
-            import pandas_ta as ta
-            rsi = ta.rsi(price, length=period)
-        except ImportError:
-            # Manual RSI calculation (Wilder's method)
-            delta = price.diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.ewm(com=period-1, min_periods=period).mean()
-            avg_loss = loss.ewm(com=period-1, min_periods=period).mean()
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        """Calculate RSI with the shared kernel (same numbers as the live strategy)."""
+        return pd.Series(kernels.rsi(price.to_numpy(), period), index=price.index)
     
     def calculate_ema(self, price: pd.Series, period: int = 200) -> pd.Series:
         """Calculate EMA."""
-        return price.ewm(span=period, adjust=False).mean()
+        return pd.Series(kernels.ema(price.to_numpy(), period), index=price.index)
+    
+    def calculate_atr(self, price: pd.Series, period: int = 14) -> pd.Series:
+        """ATR of a close-only series (true range = |close - previous close|)."""
+        close = price.to_numpy()
+        return pd.Series(kernels.atr(close, close, close, period), index=price.index)
     
     def generate_signals(
         self,
@@ -204,7 +259,12 @@ class VAYUBacktester:
         rsi_oversold: float = 30,
         rsi_overbought: float = 70,
         ema_period: int = 200,
-        prevent_lookahead: bool = True
+        prevent_lookahead: bool = True,
+        rsi: Optional[pd.Series] = None,
+        ema: Optional[pd.Series] = None,
+        atr_multiplier: Optional[float] = None,
+        max_hold_bars: Optional[int] = None,
+        atr: Optional[pd.Series] = None
     ) -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
         """
         Generate entry and exit signals.
@@ -216,13 +276,22 @@ class VAYUBacktester:
             rsi_overbought: Entry threshold (short)
             ema_period: Trend filter period
             prevent_lookahead: If True, shift signals to prevent look-ahead bias
+            rsi, ema: Precomputed indicators aligned with price (computed
+                here when omitted)
+            atr_multiplier: Also exit when the close crosses entry -/+
+                atr_multiplier x ATR(14) (strategy.atr_multiplier)
+            max_hold_bars: Also exit after this many bars in a position
+                (strategy.max_hold_hours on 1h bars)
+            atr: Precomputed ATR for the stop
         
         Returns:
             (long_entries, long_exits, short_entries, short_exits) boolean series
         """
         # Calculate indicators
-        rsi = self.calculate_rsi(price, rsi_period)
-        ema = self.calculate_ema(price, ema_period)
+        if rsi is None:
+            rsi = self.calculate_rsi(price, rsi_period)
+        if ema is None:
+            ema = self.calculate_ema(price, ema_period)
         
         # Trend filter
         in_uptrend = price > ema
@@ -241,10 +310,10 @@ class VAYUBacktester:
         # LOOK-AHEAD BIAS PREVENTION
         # Shift signals by 1 to simulate executing on NEXT bar's open
         if prevent_lookahead:
-            long_entries = long_entry_raw.shift(1).fillna(False)
-            long_exits = long_exit_raw.shift(1).fillna(False)
-            short_entries = short_entry_raw.shift(1).fillna(False)
-            short_exits = short_exit_raw.shift(1).fillna(False)
+            long_entries = long_entry_raw.shift(1, fill_value=False)
+            long_exits = long_exit_raw.shift(1, fill_value=False)
+            short_entries = short_entry_raw.shift(1, fill_value=False)
+            short_exits = short_exit_raw.shift(1, fill_value=False)
             logger.info("Look-ahead bias prevention: signals shifted by 1 bar")
         else:
             long_entries = long_entry_raw
@@ -252,6 +321,22 @@ class VAYUBacktester:
             short_entries = short_entry_raw
             short_exits = short_exit_raw
         
+        if atr_multiplier is not None or max_hold_bars is not None:
+            # Position-dependent exits: one compiled scan (src/backtest/exits.py)
+            if atr is None:
+                atr = self.calculate_atr(price)
+            *signals, _ = apply_exits(
+                long_entries.to_numpy(), long_exits.to_numpy(),
+                short_entries.to_numpy(), short_exits.to_numpy(),
+                price.to_numpy(dtype=np.float64), np.asarray(atr, dtype=np.float64),
+                atr_multiplier=np.inf if atr_multiplier is None else atr_multiplier,
+                max_hold=0 if max_hold_bars is None else max_hold_bars,
+                lag=1 if prevent_lookahead else 0
+            )
+            long_entries, long_exits, short_entries, short_exits = (
+                pd.Series(a, index=price.index) for a in signals
+            )
+        
         return long_entries, long_exits, short_entries, short_exits
     
     def run_backtest(
@@ -294,59 +379,470 @@ class VAYUBacktester:
         
         return portfolio
     
+    def _sweep_arrays(
+        self,
+        price: pd.Series,
+        rsi_windows,
+        oversold_range,
+        overbought_range,
+        ema_period: int = 200,
+        prevent_lookahead: bool = True,
+        rsi: Optional[np.ndarray] = None,
+        ema: Optional[np.ndarray] = None,
+        atr_multipliers=None,
+        max_hold_range=None
+    ) -> Tuple[tuple, pd.MultiIndex]:
+        """
+        Compact grid signals and the grid's column index.
+        
+        Entries are (bars, W, L) / (bars, W, H) and exits (bars, W) for W
+        RSI windows, L oversold and H overbought levels. RSI is computed
+        once per window and EMA once (unless passed in as (bars, W) and
+        (bars,) arrays); thresholds are broadcast against them.
+        
+        ATR-stop and max-hold values add 'atr_multiplier' /
+        'max_hold_bars' levels to the columns; those exits depend on the
+        position, so _sweep_columns applies them per chunk and the arrays
+        carry (close, atr, lag) for it.
+        """
+        windows, lows, highs = list(rsi_windows), list(oversold_range), list(overbought_range)
+        levels, names = [windows, lows, highs], ['rsi_period', 'oversold', 'overbought']
+        if atr_multipliers is not None:
+            levels.append(list(atr_multipliers))
+            names.append('atr_multiplier')
+        if max_hold_range is not None:
+            levels.append(list(max_hold_range))
+            names.append('max_hold_bars')
+        columns = pd.MultiIndex.from_product(levels, names=names)
+        close = price.to_numpy(dtype=np.float64)
+        if ema is None:
+            ema = kernels.ema(close, ema_period)
+        if rsi is None:
+            rsi = np.column_stack([kernels.rsi(close, w) for w in windows])  # (bars, windows)
+        prev_rsi = np.vstack([np.full((1, len(windows)), np.nan), rsi[:-1]])
+        
+        with np.errstate(invalid="ignore"):
+            in_uptrend = (close > ema)[:, None, None]
+            in_downtrend = (close < ema)[:, None, None]
+            long_entry = (rsi[:, :, None] < np.asarray(lows, dtype=float)) & in_uptrend
+            short_entry = (rsi[:, :, None] > np.asarray(highs, dtype=float)) & in_downtrend
+            long_exit = (rsi > 50) & (prev_rsi <= 50)
+            short_exit = (rsi < 50) & (prev_rsi >= 50)
+        
+        arrays = (long_entry, long_exit, short_entry, short_exit)
+        if prevent_lookahead:
+            # Same as shift(1): act on the next bar
+            arrays = tuple(np.concatenate([np.zeros_like(a[:1]), a[:-1]]) for a in arrays)
+        if len(levels) > 3:
+            atr = kernels.atr(close, close, close, 14)
+            arrays = arrays + (close, atr, 1 if prevent_lookahead else 0)
+        return arrays, columns
+    
+    def _sweep_columns(
+        self,
+        arrays: tuple,
+        columns: pd.MultiIndex,
+        price: pd.Series,
+        start: int,
+        stop: int
+    ) -> Tuple[pd.DataFrame, ...]:
+        """Wide signal frames for grid columns [start, stop) only."""
+        positions = np.arange(start, min(stop, len(columns)))
+        signals = self._sweep_select(arrays, columns, positions, len(price))
+        return tuple(pd.DataFrame(a, index=price.index, columns=columns[positions]) for a in signals)
+    
+    def _sweep_select(
+        self,
+        arrays: tuple,
+        columns: pd.MultiIndex,
+        positions: np.ndarray,
+        end: int
+    ) -> Tuple[np.ndarray, ...]:
+        """(bars[:end], len(positions)) signal arrays for the given grid columns."""
+        long_entry, long_exit, short_entry, short_exit = (a[:end] for a in arrays[:4])
+        w, lo, hi = np.unravel_index(positions, columns.levshape)[:3]
+        signals = (long_entry[:, w, lo], long_exit[:, w], short_entry[:, w, hi], short_exit[:, w])
+        
+        if len(arrays) > 4:
+            close, atr, lag = arrays[4:]
+            cols = columns[positions]
+            multiplier, hold = np.inf, 0
+            if 'atr_multiplier' in columns.names:
+                multiplier = cols.get_level_values('atr_multiplier').to_numpy(dtype=np.float64)
+            if 'max_hold_bars' in columns.names:
+                hold = cols.get_level_values('max_hold_bars').to_numpy(dtype=np.int64)
+            # The scan is causal: running it on the first `end` bars gives
+            # the same signals as the prefix of a full-length run
+            signals = apply_exits(*signals, close[:end], atr[:end],
+                                  atr_multiplier=multiplier, max_hold=hold, lag=lag)[:4]
+        return signals
+    
+    def sweep_signals(
+        self,
+        price: pd.Series,
+        rsi_windows=range(7, 21, 2),
+        oversold_range=range(20, 36, 5),
+        overbought_range=range(65, 81, 5),
+        ema_period: int = 200,
+        prevent_lookahead: bool = True,
+        atr_multipliers=None,
+        max_hold_range=None
+    ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """
+        generate_signals for a whole parameter grid at once.
+        
+        Indicator cost grows with the number of RSI windows rather than
+        the number of combinations.
+        
+        Returns:
+            (long_entries, long_exits, short_entries, short_exits) boolean
+            frames with one column per (rsi_period, oversold, overbought
+            [, atr_multiplier][, max_hold_bars])
+        """
+        arrays, columns = self._sweep_arrays(
+            price, rsi_windows, oversold_range, overbought_range, ema_period, prevent_lookahead,
+            atr_multipliers=atr_multipliers, max_hold_range=max_hold_range
+        )
+        return self._sweep_columns(arrays, columns, price, 0, len(columns))
+    
+    def portfolio_metrics(self, portfolio: vbt.Portfolio, metrics=fast_metrics.METRICS) -> pd.DataFrame:
+        """
+        Per-column optimization metrics (same values as pf.stats()).
+        
+        Computed from the value array and trade records for all columns
+        at once (src/backtest/metrics.py) instead of building a full
+        stats report per column.
+        """
+        return fast_metrics.portfolio_metrics(portfolio, metrics)
+    
     def optimize_parameters(
         self,
         price: pd.Series,
         rsi_windows: range = range(7, 21, 2),
         oversold_range: range = range(20, 36, 5),
         overbought_range: range = range(65, 81, 5),
-        metric: str = 'sharpe_ratio'
+        metric: str = 'sharpe_ratio',
+        vectorized: bool = True,
+        max_columns: int = 500,
+        rsi: Optional[np.ndarray] = None,
+        ema: Optional[np.ndarray] = None,
+        atr_multipliers=None,
+        max_hold_range=None,
+        pruning: Optional[PruningRules] = None
     ) -> pd.DataFrame:
         """
         Grid search for optimal parameters.
         
+        Args:
+            price: Price series
+            rsi_windows, oversold_range, overbought_range: Parameter grid
+            atr_multipliers, max_hold_range: Optional ATR-stop and
+                max-hold grid dimensions (omitted: no such exit)
+            pruning: Simulate the vectorized sweep in segments and stop
+                simulating columns these rules reject at each checkpoint
+                (src/backtest/pruning.py); pruned rows keep NaN metrics
+                and the checkpoint fraction in 'pruned_at'
+            metric: Column to sort by (descending); combinations
+                that never trade sort last
+            vectorized: Simulate the whole grid as one multi-column
+                portfolio (False: one backtest per combination)
+            max_columns: Combinations per portfolio simulation, bounding
+                memory on large grids
+            rsi: Optional precomputed RSI, (bars, len(rsi_windows))
+            ema: Optional precomputed EMA(200), (bars,)
+        
         Returns:
             DataFrame with results for each parameter combination
         """
-        results = []
+        key = None
+        if self.cache is not None:
+            # Precomputed indicators are part of the input (continuous
+            # walk-forward windows see warmed-up values)
+            key = self._cache_key(
+                'optimize', data_digest(price, rsi, ema),
+                rsi_windows=rsi_windows, oversold_range=oversold_range,
+                overbought_range=overbought_range, metric=metric,
+                atr_multipliers=atr_multipliers, max_hold_range=max_hold_range,
+                pruning=pruning if vectorized else None
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info("Parameter grid unchanged: using cached results")
+                return cached
         
+        exit_grid = {'atr_multipliers': atr_multipliers, 'max_hold_range': max_hold_range}
         total_combos = len(rsi_windows) * len(oversold_range) * len(overbought_range)
+        for values in exit_grid.values():
+            total_combos *= len(values) if values is not None else 1
         logger.info(f"Testing {total_combos} parameter combinations...")
         
-        for rsi_p in rsi_windows:
+        if vectorized and pruning is not None:
+            df = self._optimize_pruned(
+                price, rsi_windows, oversold_range, overbought_range, max_columns, pruning, rsi, ema, **exit_grid
+            )
+        elif vectorized:
+            df = self._optimize_vectorized(
+                price, rsi_windows, oversold_range, overbought_range, max_columns, rsi, ema, **exit_grid
+            )
+        else:
+            df = self._optimize_loop(price, rsi_windows, oversold_range, overbought_range, rsi, ema, **exit_grid)
+        
+        df = _rank_by_metric(df, metric)
+        
+        if key is not None:
+            self.cache.put(key, df)
+        
+        return df
+    
+    def search_parameters(
+        self,
+        price: pd.Series,
+        space: Optional[Dict] = None,
+        method: str = 'halving',
+        metric: str = 'sharpe_ratio',
+        n_jobs: int = 1,
+        seed: Optional[int] = 42,
+        **search_kwargs
+    ) -> SearchResult:
+        """
+        Adaptive search for spaces too large to grid (src/backtest/search.py).
+        
+        Args:
+            price: Price series
+            space: generate_signals argument -> candidate values
+                (default SEARCH_SPACE)
+            method: 'halving' (successive halving: low-fidelity runs on
+                the most recent part of the history first, survivors
+                promoted to the full history) or 'tpe'
+            metric: portfolio_metrics column to maximize
+            n_jobs: Worker processes for evaluations
+            seed: Sampling seed
+            **search_kwargs: SuccessiveHalving / TPESearch options
+                (n_candidates, eta, min_fidelity / n_trials, n_startup, ...)
+        
+        Returns:
+            SearchResult with the best parameters and every evaluation
+        """
+        objective = BacktestObjective(price, metric=metric, config=self.config)
+        space = space if space is not None else SEARCH_SPACE
+        if method == 'halving':
+            search = SuccessiveHalving(space, objective, seed=seed, n_jobs=n_jobs, **search_kwargs)
+        elif method == 'tpe':
+            search = TPESearch(space, objective, seed=seed, n_jobs=n_jobs, **search_kwargs)
+        else:
+            raise ValueError(f"Unknown search method {method!r} (expected 'halving' or 'tpe')")
+        
+        result = search.run()
+        logger.info(f"{method} search: best {metric}={result.best_score:.3f} with {result.best_params} "
+                    f"({result.n_full_evaluations} full evaluations, {result.cost:.1f} full-run equivalents)")
+        return result
+    
+    def _cache_key(self, kind: str, data: str, **params) -> str:
+        """Result-cache key: data digest, signal version, costs and parameters."""
+        # Costs are run_backtest's defaults, which every sweep uses
+        return make_key(
+            kind=kind, data=data, signal_version=SIGNAL_VERSION,
+            init_cash=10000, fees=0.001, slippage=0.001, freq='1h',
+            params=params
+        )
+    
+    def _optimize_vectorized(
+        self,
+        price: pd.Series,
+        rsi_windows,
+        oversold_range,
+        overbought_range,
+        max_columns: int,
+        rsi: Optional[np.ndarray] = None,
+        ema: Optional[np.ndarray] = None,
+        atr_multipliers=None,
+        max_hold_range=None
+    ) -> pd.DataFrame:
+        """Sweep path: shared indicators, broadcast thresholds, multi-column simulation."""
+        arrays, columns = self._sweep_arrays(
+            price, rsi_windows, oversold_range, overbought_range, rsi=rsi, ema=ema,
+            atr_multipliers=atr_multipliers, max_hold_range=max_hold_range
+        )
+        
+        # Wide signals are materialized one chunk of columns at a time
+        parts = []
+        for start in range(0, len(columns), max_columns):
+            chunk = self._sweep_columns(arrays, columns, price, start, start + max_columns)
+            metrics = self.portfolio_metrics(self.run_backtest(price, *chunk))
+            metrics.index = chunk[0].columns
+            parts.append(metrics)
+            # Portfolio objects hold reference cycles around large arrays;
+            # collect them before the next chunk is simulated
+            gc.collect()
+        
+        return pd.concat(parts).reset_index()
+    
+    def _optimize_pruned(
+        self,
+        price: pd.Series,
+        rsi_windows,
+        oversold_range,
+        overbought_range,
+        max_columns: int,
+        rules: PruningRules,
+        rsi: Optional[np.ndarray] = None,
+        ema: Optional[np.ndarray] = None,
+        atr_multipliers=None,
+        max_hold_range=None,
+        init_cash: float = 10000
+    ) -> pd.DataFrame:
+        """
+        Sweep path in time segments, dropping pruned columns between them.
+        
+        vectorbt cannot start a simulation from an open position, so each
+        column resumes from the first bar of the position it holds at the
+        checkpoint (the bar after it was last flat), with that bar's cash
+        as its starting capital and earlier signals cleared. Its value and
+        trades from there on are the same as in one full-length run; only
+        the open position is simulated twice.
+        """
+        arrays, columns = self._sweep_arrays(
+            price, rsi_windows, oversold_range, overbought_range, rsi=rsi, ema=ema,
+            atr_multipliers=atr_multipliers, max_hold_range=max_hold_range
+        )
+        n_bars, n_cols = len(price), len(columns)
+        stages = []                                 # (end bar, checkpoint index)
+        for k, fraction in enumerate(rules.checkpoints):
+            end = min(n_bars - 1, max(1, int(round(n_bars * fraction))))
+            if not stages or end > stages[-1][0]:
+                stages.append((end, k))
+        stages.append((n_bars, None))
+        ann_factor = fast_metrics.annualization_factor('1h', vbt.settings.returns['year_freq'])
+        
+        active = np.arange(n_cols)                  # Grid positions still simulated
+        value = np.empty((0, n_cols))               # Value history of active columns
+        start = np.zeros(n_cols, dtype=np.int64)    # First bar each column resumes from
+        cash = np.full(n_cols, float(init_cash))    # Cash at that bar (flat before it)
+        trades = np.zeros(0, dtype=[('col', np.int64), ('pnl', np.float64),
+                                    ('closed', np.bool_), ('entry', np.int64)])
+        pruned_at = np.full(n_cols, np.nan)
+        simulated = 0
+        
+        for end, k in stages:
+            seg = int(start.min())
+            history = np.empty((end, len(active)))
+            history[:len(value)] = value
+            last_flat = np.full(len(active), -1, dtype=np.int64)
+            new_trades = []
+            
+            for lo in range(0, len(active), max_columns):
+                idx = np.arange(lo, min(lo + max_columns, len(active)))
+                rows = np.arange(seg, end)[:, None]
+                before = rows < start[idx]              # Bars already settled
+                signals = [a[seg:] & ~before for a in self._sweep_select(arrays, columns, active[idx], end)]
+                pf = self.run_backtest(
+                    price.iloc[seg:end], *(pd.DataFrame(a, index=price.index[seg:end]) for a in signals),
+                    init_cash=cash[idx]
+                )
+                simulated += (end - start[idx]).sum()
+                
+                seg_value = pf.value().to_numpy()
+                chunk = history[seg:, idx]
+                chunk[~before] = seg_value[~before]
+                history[seg:, idx] = chunk
+                
+                flat = (pf.assets().to_numpy() == 0) & ~before
+                has_flat = flat.any(axis=0)
+                last_flat[idx[has_flat]] = seg + len(rows) - 1 - np.argmax(flat[::-1, has_flat], axis=0)
+                
+                rec = pf.trades.records_arr
+                new_trades.append(np.rec.fromarrays(
+                    [idx[rec['col']], rec['pnl'], rec['status'] == 1, rec['entry_idx'] + seg],
+                    dtype=trades.dtype
+                ))
+                gc.collect()
+            
+            # Trades entered before a column's resume bar were closed then
+            keep = trades['entry'] < start[trades['col']]
+            trades = np.concatenate([trades[keep]] + new_trades)
+            value = history
+            
+            # Resume after the last flat bar (columns never flat keep their start)
+            moved = last_flat >= start
+            start = np.where(moved, last_flat + 1, start)
+            cash = np.where(moved, value[np.minimum(last_flat, end - 1), np.arange(len(active))], cash)
+            
+            if k is None:
+                break
+            
+            metrics = fast_metrics.compute_metrics(
+                value, init_cash, trades['col'], trades['pnl'], trades['closed'], ann_factor,
+                ('sharpe_ratio', 'max_drawdown', 'trades')
+            )
+            drop = rules.prune(metrics, k)
+            pruned_at[active[drop]] = rules.checkpoints[k]
+            survivors = np.flatnonzero(~drop)
+            remap = np.full(len(active), -1)
+            remap[survivors] = np.arange(len(survivors))
+            trades = trades[~drop[trades['col']]]
+            trades['col'] = remap[trades['col']]
+            active, value, start, cash = active[survivors], value[:, survivors], start[survivors], cash[survivors]
+        
+        logger.info(f"Pruning: {n_cols - len(active)}/{n_cols} combinations dropped, "
+                    f"{simulated / (n_bars * n_cols):.0%} of the full sweep's bar-columns simulated")
+        
+        metrics = fast_metrics.compute_metrics(
+            value, init_cash, trades['col'], trades['pnl'], trades['closed'], ann_factor
+        )
+        df = pd.DataFrame(np.nan, index=columns, columns=list(fast_metrics.METRICS))
+        df.iloc[active] = pd.DataFrame(metrics).to_numpy()
+        df['pruned_at'] = pruned_at
+        return df.reset_index()
+    
+    def _optimize_loop(
+        self,
+        price: pd.Series,
+        rsi_windows,
+        oversold_range,
+        overbought_range,
+        rsi: Optional[np.ndarray] = None,
+        ema: Optional[np.ndarray] = None,
+        atr_multipliers=None,
+        max_hold_range=None
+    ) -> pd.DataFrame:
+        """Reference path: one generate_signals + backtest + stats per combination."""
+        results = []
+        ema_series = pd.Series(ema, index=price.index) if ema is not None else None
+        exit_combos = [{}]
+        if atr_multipliers is not None:
+            exit_combos = [dict(c, atr_multiplier=m) for c in exit_combos for m in atr_multipliers]
+        if max_hold_range is not None:
+            exit_combos = [dict(c, max_hold_bars=h) for c in exit_combos for h in max_hold_range]
+        
+        for i, rsi_p in enumerate(rsi_windows):
+            rsi_series = pd.Series(rsi[:, i], index=price.index) if rsi is not None else None
             for oversold in oversold_range:
                 for overbought in overbought_range:
-                    long_entries, long_exits, short_entries, short_exits = self.generate_signals(
-                        price, rsi_p, oversold, overbought,
-                        prevent_lookahead=True
-                    )
-                    
-                    pf = self.run_backtest(
-                        price, long_entries, long_exits, 
-                        short_entries, short_exits
-                    )
-                    
-                    stats = pf.stats()
-                    
-                    results.append({
-                        'rsi_period': rsi_p,
-                        'oversold': oversold,
-                        'overbought': overbought,
-                        'total_return': stats.get('Total Return [%]', 0),
-                        'sharpe_ratio': stats.get('Sharpe Ratio', 0),
-                        'max_drawdown': stats.get('Max Drawdown [%]', 0),
-                        'trades': stats.get('Total Trades', 0),
-                        'win_rate': stats.get('Win Rate [%]', 0),
-                        'profit_factor': stats.get('Profit Factor', 0)
-                    })
-        
-        df = pd.DataFrame(results)
-        
-        # Sort by metric
-        if metric in df.columns:
-            df = df.sort_values(metric, ascending=False)
+                    for exit_params in exit_combos:
+                        long_entries, long_exits, short_entries, short_exits = self.generate_signals(
+                            price, rsi_p, oversold, overbought,
+                            prevent_lookahead=True,
+                            rsi=rsi_series,
+                            ema=ema_series,
+                            **exit_params
+                        )
+                        
+                        pf = self.run_backtest(
+                            price, long_entries, long_exits, 
+                            short_entries, short_exits
+                        )
+                        
+                        stats = self.portfolio_metrics(pf).iloc[0]
+                        
+                        results.append({
+                            'rsi_period': rsi_p,
+                            'oversold': oversold,
+                            'overbought': overbought,
+                            **exit_params,
+                            **stats.to_dict()
+                        })
         
-        return df
+        return pd.DataFrame(results)
     
     def walk_forward_analysis(
         self,
@@ -354,82 +850,263 @@ class VAYUBacktester:
         train_size: int = 500,  # bars
         test_size: int = 100,   # bars
         step_size: int = 100,
+        n_jobs: int = 1,
+        reuse_indicators: bool = True,
+        continuous_history: bool = False,
         **strategy_params
     ) -> pd.DataFrame:
         """
         Walk-forward optimization.
         
         Train on train_size bars, test on test_size bars, roll forward.
+        
+        Args:
+            n_jobs: Worker processes for the (independent) windows; 1 runs
+                serially, None or -1 uses every core. Workers read the
+                prices from shared memory; results keep window order.
+            reuse_indicators: Compute RSI/EMA once over the full series
+                and slice them per window (O(n) instead of
+                O(windows x n)). Each window still sees the values it
+                would get if run in isolation.
+            continuous_history: Let each window's indicators carry the
+                history before it (warmed-up values from the full
+                series) instead of restarting at the window's first bar.
+                Implies reuse_indicators.
+        
+        With a cache, each window is keyed on the prices it depends on
+        (its own bars, or all bars up to its end with continuous_history)
+        and only windows without a cached result are run.
         """
-        results = []
+        starts = list(range(0, len(price) - train_size - test_size + 1, step_size))
+        tasks = [(i + 1, start, train_size, test_size) for i, start in enumerate(starts)]
         
-        n = len(price)
-        start = 0
-        window_num = 0
+        cached, keys = {}, {}
+        if self.cache is not None:
+            for task in tasks:
+                window_num, start = task[0], task[1]
+                first = 0 if continuous_history else start
+                keys[window_num] = self._cache_key(
+                    'walk_forward_window', data_digest(price.iloc[first:start + train_size + test_size]),
+                    train_size=train_size, test_size=test_size, grid=WALK_FORWARD_GRID,
+                    reuse_indicators=reuse_indicators, continuous_history=continuous_history
+                )
+                hit = self.cache.get(keys[window_num])
+                if hit is not None:
+                    cached[window_num] = dict(hit, window=window_num)
+            if cached:
+                logger.info(f"Walk-forward: {len(cached)}/{len(tasks)} windows cached")
         
-        while start + train_size + test_size <= n:
-            window_num += 1
-            train_end = start + train_size
-            test_end = train_end + test_size
-            
-            # Training data
-            train_price = price.iloc[start:train_end]
-            
-            # Test data
-            test_price = price.iloc[train_end:test_end]
-            
-            # Optimize on training
-            opt_df = self.optimize_parameters(
-                train_price,
-                rsi_windows=range(10, 21, 2),  # Reduced for speed
-                oversold_range=range(25, 36, 5),
-                overbought_range=range(65, 76, 5)
-            )
-            
-            if len(opt_df) == 0:
-                start += step_size
-                continue
-            
-            # Get best params
-            best = opt_df.iloc[0]
-            
-            # Test on out-of-sample
-            long_entries, long_exits, short_entries, short_exits = self.generate_signals(
-                test_price,
-                rsi_period=int(best['rsi_period']),
-                rsi_oversold=best['oversold'],
-                rsi_overbought=best['overbought'],
-                prevent_lookahead=True
-            )
-            
-            pf = self.run_backtest(
-                test_price, long_entries, long_exits,
-                short_entries, short_exits
+        todo = [task for task in tasks if task[0] not in cached]
+        if todo:
+            for task, result in zip(todo, self._run_walk_forward_tasks(
+                    price, todo, reuse_indicators, continuous_history, n_jobs)):
+                cached[task[0]] = result
+                if result is not None and self.cache is not None:
+                    self.cache.put(keys[task[0]], result)
+        
+        results = [cached[task[0]] for task in tasks]
+        return pd.DataFrame([r for r in results if r is not None])
+    
+    def submit_walk_forward(
+        self,
+        queue: JobQueue,
+        price: pd.Series,
+        train_size: int = 500,
+        test_size: int = 100,
+        step_size: int = 100,
+        reuse_indicators: bool = True,
+        continuous_history: bool = False,
+        job_id: Optional[str] = None
+    ) -> str:
+        """
+        Queue walk_forward_analysis as a resumable job, one task per window.
+        
+        Workers (run_local_workers, or backtest/sweep_worker.py on other
+        machines) run the windows; queue.collect(job_id) then returns the
+        same frame walk_forward_analysis would. The default job_id is
+        derived from the data and settings, so submitting the same run
+        again resumes it.
+        
+        Returns:
+            job_id
+        """
+        starts = range(0, len(price) - train_size - test_size + 1, step_size)
+        tasks = [(i + 1, start, train_size, test_size) for i, start in enumerate(starts)]
+        if job_id is None:
+            job_id = 'walk_forward-' + self._cache_key(
+                'walk_forward_job', data_digest(price),
+                train_size=train_size, test_size=test_size, step_size=step_size, grid=WALK_FORWARD_GRID,
+                reuse_indicators=reuse_indicators, continuous_history=continuous_history
+            )[:16]
+        context = {'price': price, 'config': self.config,
+                   'reuse_indicators': reuse_indicators, 'continuous_history': continuous_history}
+        if queue.submit(job_id, _walk_forward_job_task, tasks, context=context,
+                        setup=_walk_forward_job_setup, combine=_walk_forward_job_combine):
+            logger.info(f"Walk-forward job {job_id}: {len(tasks)} windows queued")
+        else:
+            logger.info(f"Walk-forward job {job_id} resumed: {queue.progress(job_id)}")
+        return job_id
+    
+    def submit_optimize(
+        self,
+        queue: JobQueue,
+        price: pd.Series,
+        rsi_windows: range = range(7, 21, 2),
+        oversold_range: range = range(20, 36, 5),
+        overbought_range: range = range(65, 81, 5),
+        metric: str = 'sharpe_ratio',
+        atr_multipliers=None,
+        max_hold_range=None,
+        job_id: Optional[str] = None
+    ) -> str:
+        """
+        Queue optimize_parameters as a resumable job, one task per RSI window.
+        
+        queue.collect(job_id) returns the optimize_parameters frame.
+        
+        Returns:
+            job_id
+        """
+        grid = dict(oversold_range=list(oversold_range), overbought_range=list(overbought_range),
+                    atr_multipliers=atr_multipliers, max_hold_range=max_hold_range)
+        if job_id is None:
+            job_id = 'optimize-' + self._cache_key(
+                'optimize_job', data_digest(price), rsi_windows=rsi_windows, metric=metric, **grid
+            )[:16]
+        context = {'price': price, 'config': self.config, 'grid': grid, 'metric': metric}
+        if queue.submit(job_id, _optimize_job_task, list(rsi_windows), context=context,
+                        combine=partial(_optimize_job_combine, metric=metric)):
+            logger.info(f"Optimization job {job_id}: {len(rsi_windows)} tasks queued")
+        else:
+            logger.info(f"Optimization job {job_id} resumed: {queue.progress(job_id)}")
+        return job_id
+    
+    def _run_walk_forward_tasks(
+        self,
+        price: pd.Series,
+        tasks: list,
+        reuse_indicators: bool,
+        continuous_history: bool,
+        n_jobs: Optional[int]
+    ) -> list:
+        """Run walk-forward windows serially or on a process pool, in task order."""
+        windowed = None
+        if reuse_indicators or continuous_history:
+            windowed = WindowedIndicators(
+                price.to_numpy(dtype=np.float64),
+                rsi_periods=WALK_FORWARD_GRID['rsi_windows'],
+                ema_periods=(200,),
+                continuous=continuous_history
             )
-            stats = pf.stats()
-            
-            results.append({
-                'window': window_num,
-                'train_start': str(train_price.index[0]),
-                'train_end': str(train_price.index[-1]),
-                'test_start': str(test_price.index[0]),
-                'test_end': str(test_price.index[-1]),
-                'best_rsi_period': best['rsi_period'],
-                'best_oversold': best['oversold'],
-                'best_overbought': best['overbought'],
-                'train_sharpe': best['sharpe_ratio'],
-                'test_total_return': stats.get('Total Return [%]', 0),
-                'test_sharpe': stats.get('Sharpe Ratio', 0),
-                'test_max_dd': stats.get('Max Drawdown [%]', 0),
-                'test_trades': stats.get('Total Trades', 0)
-            })
+        
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, len(tasks))
+        
+        if n_jobs <= 1:
+            results = [self._walk_forward_window(price, *task, windowed=windowed) for task in tasks]
+        else:
+            # Datetime (ns) or integer index, shipped alongside the prices
+            is_datetime = isinstance(price.index, pd.DatetimeIndex)
+            index = price.index.as_unit('ns').asi8 if is_datetime else price.index.to_numpy(dtype=np.int64)
+            tz = price.index.tz if is_datetime else None
             
-            logger.info(f"Window {window_num}: Train Sharpe={best['sharpe_ratio']:.2f}, "
-                       f"Test Sharpe={stats.get('Sharpe Ratio', 0):.2f}")
+            arrays = {'close': price.to_numpy(dtype=np.float64), 'index': index}
+            if windowed is not None:
+                # Indicator state is published once, next to the prices
+                arrays.update({f'ind_{key}': arr for key, arr in windowed.arrays.items()})
             
-            start += step_size
+            with SharedArrays(arrays) as shared:
+                with ProcessPoolExecutor(
+                    max_workers=n_jobs,
+                    initializer=_init_walk_forward_worker,
+                    initargs=(shared.spec, is_datetime, tz, self.config, continuous_history)
+                ) as pool:
+                    # map() yields in submission order regardless of completion order
+                    results = list(pool.map(_run_walk_forward_window, tasks))
         
-        return pd.DataFrame(results)
+        return results
+    
+    def _walk_forward_window(
+        self,
+        price: pd.Series,
+        window_num: int,
+        start: int,
+        train_size: int,
+        test_size: int,
+        windowed: Optional[WindowedIndicators] = None
+    ) -> Optional[Dict]:
+        """
+        Optimize on one training window and evaluate the best parameters out of sample.
+        
+        With `windowed`, indicators are sliced from the full-series state
+        instead of being recomputed on the window.
+        """
+        train_end = start + train_size
+        test_end = train_end + test_size
+        
+        # Training data
+        train_price = price.iloc[start:train_end]
+        
+        # Test data
+        test_price = price.iloc[train_end:test_end]
+        
+        train_rsi = train_ema = None
+        if windowed is not None:
+            train_rsi = np.column_stack([
+                windowed.rsi(w, start, train_end) for w in WALK_FORWARD_GRID['rsi_windows']
+            ])
+            train_ema = windowed.ema(200, start, train_end)
+        
+        # Optimize on training
+        opt_df = self.optimize_parameters(train_price, **WALK_FORWARD_GRID, rsi=train_rsi, ema=train_ema)
+        
+        if len(opt_df) == 0:
+            return None
+        
+        # Get best params
+        best = opt_df.iloc[0]
+        
+        test_rsi = test_ema = None
+        if windowed is not None:
+            test_rsi = pd.Series(windowed.rsi(int(best['rsi_period']), train_end, test_end), index=test_price.index)
+            test_ema = pd.Series(windowed.ema(200, train_end, test_end), index=test_price.index)
+        
+        # Test on out-of-sample
+        long_entries, long_exits, short_entries, short_exits = self.generate_signals(
+            test_price,
+            rsi_period=int(best['rsi_period']),
+            rsi_oversold=best['oversold'],
+            rsi_overbought=best['overbought'],
+            prevent_lookahead=True,
+            rsi=test_rsi,
+            ema=test_ema
+        )
+        
+        pf = self.run_backtest(
+            test_price, long_entries, long_exits,
+            short_entries, short_exits
+        )
+        stats = self.portfolio_metrics(pf).iloc[0]
+        
+        logger.info(f"Window {window_num}: Train Sharpe={best['sharpe_ratio']:.2f}, "
+                   f"Test Sharpe={stats['sharpe_ratio']:.2f}")
+        
+        return {
+            'window': window_num,
+            'train_start': str(train_price.index[0]),
+            'train_end': str(train_price.index[-1]),
+            'test_start': str(test_price.index[0]),
+            'test_end': str(test_price.index[-1]),
+            'best_rsi_period': best['rsi_period'],
+            'best_oversold': best['oversold'],
+            'best_overbought': best['overbought'],
+            'train_sharpe': best['sharpe_ratio'],
+            'test_total_return': stats['total_return'],
+            'test_sharpe': stats['sharpe_ratio'],
+            'test_max_dd': stats['max_drawdown'],
+            'test_trades': int(stats['trades'])
+        }
     
     def analyze_results(self, portfolio: vbt.Portfolio, name: str = "Backtest"):
         """Print and return key metrics."""
@@ -450,12 +1127,106 @@ class VAYUBacktester:
         return stats
 
 
+class BacktestObjective:
+    """
+    Search objective: one backtest of generate_signals parameters.
+    
+    Fidelity f scores on the most recent f share of the bars (at least
+    min_bars). Parameter sets that never trade score NaN, ranking last,
+    rather than vectorbt's infinite Sharpe of a flat equity curve.
+    """
+    
+    def __init__(self, price: pd.Series, metric: str = 'sharpe_ratio',
+                 config: Optional[Dict] = None, min_bars: int = 300):
+        self.price = price
+        self.metric = metric
+        self.config = config if config is not None else {}
+        self.min_bars = min_bars
+    
+    def __call__(self, params: Dict, fidelity: float) -> float:
+        bars = min(len(self.price), max(self.min_bars, int(round(len(self.price) * fidelity))))
+        price = self.price.iloc[-bars:]
+        bt = VAYUBacktester(config=self.config)
+        pf = bt.run_backtest(price, *bt.generate_signals(price, prevent_lookahead=True, **params))
+        row = bt.portfolio_metrics(pf, (self.metric, 'trades')).iloc[0]
+        return float(row[self.metric]) if row['trades'] > 0 else float('nan')
+
+
+# Per-process state for walk-forward workers (set by the pool initializer)
+_WORKER: Dict = {}
+
+
+def _init_walk_forward_worker(spec: SharedArraysSpec, is_datetime: bool, tz, config: Dict,
+                              continuous_history: bool = False):
+    """Attach to the shared price (and indicator) arrays once per worker process."""
+    shm, arrays = SharedArrays.attach(spec)
+    if is_datetime:
+        index = pd.DatetimeIndex(arrays['index'].view('datetime64[ns]'))
+        index = index.tz_localize('UTC').tz_convert(tz) if tz is not None else index
+    else:
+        index = pd.Index(arrays['index'])
+    
+    indicators = {key[4:]: arr for key, arr in arrays.items() if key.startswith('ind_')}
+    windowed = None
+    if indicators:
+        windowed = WindowedIndicators.from_arrays(arrays['close'], indicators, continuous=continuous_history)
+    
+    _WORKER.update(
+        shm=shm,  # Keeps the mapping alive for the life of the worker
+        backtester=VAYUBacktester(config=config),
+        price=pd.Series(arrays['close'], index=index, copy=False),
+        windowed=windowed
+    )
+
+
+def _run_walk_forward_window(task: Tuple) -> Optional[Dict]:
+    return _WORKER['backtester']._walk_forward_window(_WORKER['price'], *task, windowed=_WORKER['windowed'])
+
+
+def _walk_forward_job_setup(context: Dict) -> Tuple:
+    """Per-worker state for a walk-forward job: backtester, prices, indicators."""
+    price = context['price']
+    windowed = None
+    if context['reuse_indicators'] or context['continuous_history']:
+        windowed = WindowedIndicators(
+            price.to_numpy(dtype=np.float64),
+            rsi_periods=WALK_FORWARD_GRID['rsi_windows'],
+            ema_periods=(200,),
+            continuous=context['continuous_history']
+        )
+    return VAYUBacktester(config=context['config']), price, windowed
+
+
+def _walk_forward_job_task(state: Tuple, task: Tuple) -> Optional[Dict]:
+    backtester, price, windowed = state
+    return backtester._walk_forward_window(price, *task, windowed=windowed)
+
+
+def _walk_forward_job_combine(results: list) -> pd.DataFrame:
+    return pd.DataFrame([r for r in results if r is not None])
+
+
+def _optimize_job_task(context: Dict, rsi_window: int) -> pd.DataFrame:
+    bt = VAYUBacktester(config=context['config'])
+    return bt.optimize_parameters(context['price'], rsi_windows=[rsi_window], metric=context['metric'],
+                                  **context['grid'])
+
+
+def _optimize_job_combine(results: list, metric: str = 'sharpe_ratio') -> pd.DataFrame:
+    # Back in grid order (tasks are RSI windows, the grid's outer level),
+    # so the index and the stable sort match one optimize_parameters call
+    df = pd.concat([r.sort_index() for r in results], ignore_index=True)
+    return _rank_by_metric(df, metric)
+
+
 def main():
     """Example backtest workflow."""
     print("VAYU Backtest Framework")
     print("=" * 60)
     
-    bt = VAYUBacktester()
+    # Unchanged data and parameters are answered from the on-disk cache
+    cache = ResultCache()
+    bt = VAYUBacktester(cache=cache)
     
     # Load data from Kraken (1h candles, 2+ years of history)
     print("\nUsing Kraken data source for 1h candles")
@@ -519,6 +1290,21 @@ def main():
     pf_test = bt.run_backtest(test_price, le_test, lx_test, se_test, sx_test)
     bt.analyze_results(pf_test, "Out-of-Sample")
     
+    # How much of the OOS result depends on the order and draw of its trades
+    print("=" * 60)
+    print("MONTE CARLO (Out-of-Sample trades)")
+    print("=" * 60)
+    
+    trade_returns = pf_test.trades.returns.values
+    if len(trade_returns) > 1:
+        mc = MonteCarloSimulator(trade_returns)
+        for result in (mc.shuffle(10_000), mc.bootstrap(10_000)):
+            print(f"\n{result.method}: P(loss)={result.prob_loss * 100:.1f}%, "
+                  f"95% drawdown-at-risk={result.drawdown_at_risk(0.95) * 100:.1f}%")
+            print((result.summary() * 100).round(2))
+    else:
+        print("Too few trades to resample")
+    
     # Walk-forward analysis
     print("=" * 60)
     print("WALK-FORWARD ANALYSIS")
@@ -528,13 +1314,15 @@ def main():
         price,
         train_size=1000,
         test_size=200,
-        step_size=200
+        step_size=200,
+        n_jobs=-1
     )
     
     print(f"\nWalk-forward results ({len(wfa_results)} windows):")
     print(f"Avg Test Sharpe: {wfa_results['test_sharpe'].mean():.3f}")
     print(f"Sharpe StdDev:   {wfa_results['test_sharpe'].std():.3f}")
     print(f"Consistency:     {(wfa_results['test_sharpe'] > 0).mean()*100:.1f}% positive")
+    print(f"\nResult cache:    {cache}")
     
     print("\n" + "=" * 60)
     print("BACKTEST COMPLETE")
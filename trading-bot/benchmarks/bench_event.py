@@ -0,0 +1,58 @@
+"""
+VAYU Trading Bot - Event-Driven Backtest Benchmark
+==================================================
+EventBacktester: compiled loop throughput vs the live-object replay.
+
+Usage:
+    python benchmarks/bench_event.py [bars] [symbols]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.backtest.event_engine import EventBacktester
+from src.data.price_feed import CandlePanel
+
+
+def synthetic_panel(n_bars: int, n_symbols: int, seed: int = 42) -> CandlePanel:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal((n_bars, n_symbols)) * 0.01, axis=0))
+    return CandlePanel(
+        symbols=[f"SYM{j}" for j in range(n_symbols)],
+        timestamps=1704067200000 + np.arange(n_bars, dtype=np.int64) * 3_600_000,
+        open=close * (1 + rng.standard_normal(close.shape) * 0.001),
+        high=close * (1 + np.abs(rng.standard_normal(close.shape)) * 0.005),
+        low=close * (1 - np.abs(rng.standard_normal(close.shape)) * 0.005),
+        close=close,
+        volume=np.ones_like(close)
+    )
+
+
+def run(n_bars: int = 1_000_000, n_symbols: int = 1):
+    panel = synthetic_panel(n_bars, n_symbols)
+    bt = EventBacktester()
+
+    bt.run(synthetic_panel(300, n_symbols))   # numba compile
+    start = time.perf_counter()
+    result = bt.run(panel)
+    fast_s = time.perf_counter() - start
+    cells = n_bars * n_symbols
+
+    small = synthetic_panel(min(n_bars, 5_000), n_symbols)
+    start = time.perf_counter()
+    bt.replay(small)
+    replay_rate = small.close.size / (time.perf_counter() - start)
+
+    print(f"Event backtest: {n_bars:,} bars x {n_symbols} symbols, {len(result.trades)} trades")
+    print(f"  compiled loop:  {fast_s * 1000:10.1f} ms  ({cells / fast_s:,.0f} bars/s)")
+    print(f"  live replay:    {replay_rate:14,.0f} bars/s  ({cells / fast_s / replay_rate:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1)
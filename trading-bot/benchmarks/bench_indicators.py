@@ -0,0 +1,89 @@
+"""
+VAYU Trading Bot - Indicator Kernel Benchmark
+=============================================
+Compares the shared kernels (numba and pandas backends) with the
+per-call-site implementations they replaced.
+
+Usage:
+    python benchmarks/bench_indicators.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.indicators import kernels
+
+
+def _timeit(func, repeat: int = 5) -> float:
+    """Best wall time in milliseconds."""
+    func()  # Warm-up (numba compile, caches)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _pandas_rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.ewm(com=period - 1, min_periods=period).mean()
+    avg_loss = loss.ewm(com=period - 1, min_periods=period).mean()
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _loop_rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """The former pure-Python loop from kraken_trading_bot.py."""
+    deltas = np.diff(closes)
+    seed = deltas[:period + 1]
+    up = seed[seed >= 0].sum() / period
+    down = -seed[seed < 0].sum() / period
+    rsi = np.zeros_like(closes)
+    for i in range(period, len(closes)):
+        delta = deltas[i - 1]
+        upval, downval = (delta, 0.0) if delta > 0 else (0.0, -delta)
+        up = (up * (period - 1) + upval) / period
+        down = (down * (period - 1) + downval) / period
+        rs = up / down if down != 0 else 0
+        rsi[i] = 100. - 100. / (1. + rs)
+    return rsi
+
+
+def run(n_bars: int = 100_000, n_symbols: int = 500, panel_bars: int = 1_000):
+    rng = np.random.default_rng(42)
+    close_1d = 100 * np.exp(np.cumsum(rng.standard_normal(n_bars) * 0.01))
+    panel = 100 * np.exp(np.cumsum(rng.standard_normal((panel_bars, n_symbols)) * 0.01, axis=0))
+    series = pd.Series(close_1d)
+    frame = pd.DataFrame(panel)
+
+    rows = [
+        ("pandas ewm RSI (1D)", _timeit(lambda: _pandas_rsi(series))),
+        ("python loop RSI (1D)", _timeit(lambda: _loop_rsi(close_1d), repeat=1)),
+        ("pandas RSI per column (2D)", _timeit(lambda: [_pandas_rsi(frame[c]) for c in frame], repeat=1)),
+    ]
+
+    for backend in ([True, False] if kernels.NUMBA_AVAILABLE else [False]):
+        kernels.enable_numba(backend)
+        name = "numba" if backend else "pandas"
+        rows.append((f"kernel RSI (1D, {name})", _timeit(lambda: kernels.rsi(close_1d))))
+        rows.append((f"kernel RSI (2D, {name})", _timeit(lambda: kernels.rsi(panel))))
+        rows.append((f"kernel EMA200 (2D, {name})", _timeit(lambda: kernels.ema(panel, 200))))
+        rows.append((f"kernel rolling max (2D, {name})", _timeit(lambda: kernels.rolling_max(panel, 14))))
+        rows.append((f"kernel rolling std (2D, {name})", _timeit(lambda: kernels.rolling_std(panel, 20))))
+
+    print(f"Indicator benchmark: 1D={n_bars:,} bars, 2D={panel_bars:,} x {n_symbols} symbols")
+    print("-" * 60)
+    for name, ms in rows:
+        print(f"{name:<36} {ms:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    run()
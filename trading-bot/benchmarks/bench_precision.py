@@ -0,0 +1,74 @@
+"""
+VAYU Trading Bot - Reduced-Precision Benchmark
+==============================================
+Memory, throughput and error of the float32 indicator mode against
+float64 on a large universe.
+
+Usage:
+    python benchmarks/bench_precision.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.indicators import kernels
+from src.strategy.rsi_momentum import RSIMomentumStrategy
+
+
+def _timeit(func, repeat: int = 5) -> float:
+    """Best wall time in milliseconds."""
+    func()  # Warm-up (numba compile, caches)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _panels(n_bars: int, n_symbols: int, seed: int = 42):
+    """(close, high, low) with prices spread from cents to tens of thousands."""
+    rng = np.random.default_rng(seed)
+    base = 10 ** rng.uniform(-2, 4.8, n_symbols)
+    close = base * np.exp(np.cumsum(rng.standard_normal((n_bars, n_symbols)) * 0.01, axis=0))
+    high = close * (1 + np.abs(rng.standard_normal((n_bars, n_symbols))) * 0.003)
+    low = close * (1 - np.abs(rng.standard_normal((n_bars, n_symbols))) * 0.003)
+    return close, high, low
+
+
+def run(n_bars: int = 5_000, n_symbols: int = 1_000):
+    p64 = _panels(n_bars, n_symbols)
+    p32 = tuple(kernels.as_precision(a, np.float32) for a in p64)
+    strategy = RSIMomentumStrategy()
+
+    print(f"Precision benchmark: {n_bars:,} bars x {n_symbols:,} symbols "
+          f"({'numba' if kernels.numba_enabled() else 'pandas'} kernels)")
+    print("-" * 60)
+    for name, (close, high, low) in (("float64", p64), ("float32", p32)):
+        mb = sum(a.nbytes for a in (close, high, low)) / 1e6
+        rsi_ms = _timeit(lambda: kernels.rsi(close))
+        ema_ms = _timeit(lambda: kernels.ema(close, 200))
+        atr_ms = _timeit(lambda: kernels.atr(high, low, close))
+        sig_ms = _timeit(lambda: strategy.generate_signals_batch(close, high, low))
+        print(f"{name}: panels {mb:,.0f} MB | RSI {rsi_ms:.1f} ms | EMA {ema_ms:.1f} ms | "
+              f"ATR {atr_ms:.1f} ms | signals {sig_ms:.1f} ms")
+
+    c64, h64, l64 = p64
+    c32, h32, l32 = p32
+    errors = {
+        "rsi": np.nanmax(np.abs(kernels.rsi(c32) - kernels.rsi(c64))),
+        "ema": np.nanmax(np.abs(kernels.ema(c32, 200) / kernels.ema(c64, 200) - 1)),
+        "atr": np.nanmax(np.abs(kernels.atr(h32, l32, c32) - kernels.atr(h64, l64, c64)) / c64),
+    }
+    print("-" * 60)
+    for name, err in errors.items():
+        print(f"max {name} error {err:.2e} (bound {kernels.PRECISION_BOUNDS[name]:.0e})")
+
+
+if __name__ == "__main__":
+    run()
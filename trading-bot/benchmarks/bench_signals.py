@@ -0,0 +1,75 @@
+"""
+VAYU Trading Bot - Signal Evaluation Benchmark
+==============================================
+Per-symbol generate_signal loop vs. one generate_signals_batch pass.
+
+Usage:
+    python benchmarks/bench_signals.py [n_symbols]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.strategy.ensemble import RSIMomentumEnsemble
+from src.strategy.ranking import top_k
+from src.strategy.rsi_momentum import RSIMomentumStrategy
+
+
+def run(n_symbols: int = 500, n_bars: int = 250, repeat: int = 20):
+    rng = np.random.default_rng(42)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal((n_bars, n_symbols)) * 0.01, axis=0))
+    high = close * (1 + np.abs(rng.standard_normal(close.shape)) * 0.005)
+    low = close * (1 - np.abs(rng.standard_normal(close.shape)) * 0.005)
+    strategy = RSIMomentumStrategy()
+
+    strategy.generate_signals_batch(close, high, low)  # Warm-up / numba compile
+    start = time.perf_counter()
+    for _ in range(repeat):
+        strategy.generate_signals_batch(close, high, low)
+    batch_ms = (time.perf_counter() - start) / repeat * 1000
+
+    frames = [pd.DataFrame({"high": high[:, j], "low": low[:, j], "close": close[:, j]})
+              for j in range(n_symbols)]
+    start = time.perf_counter()
+    for df in frames:
+        strategy.generate_signal(df)
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Signal evaluation: {n_symbols} symbols x {n_bars} bars")
+    print(f"  per-symbol loop:  {loop_ms:10.2f} ms")
+    print(f"  batched panel:    {batch_ms:10.2f} ms  ({loop_ms / batch_ms:.0f}x)")
+
+    # Parameter ensemble: 4 RSI periods x 4 oversold x 4 overbought x 4 EMA spans
+    ensemble = RSIMomentumEnsemble.grid(
+        rsi_periods=(7, 10, 14, 21), oversold=(20, 25, 30, 35),
+        overbought=(65, 70, 75, 80), ema_periods=(50, 100, 150, 200)
+    )
+    ensemble.evaluate(close, high, low)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ensemble.evaluate(close, high, low)
+    ensemble_ms = (time.perf_counter() - start) / repeat * 1000
+    print(f"  ensemble ({len(ensemble)} variants): {ensemble_ms:7.2f} ms  "
+          f"({ensemble_ms / batch_ms:.1f}x one strategy)")
+
+    # Cross-sectional selection: argpartition top-k vs a full argsort
+    scores = rng.standard_normal(n_symbols)
+    start = time.perf_counter()
+    for _ in range(repeat * 50):
+        top_k(scores, 3)
+    topk_us = (time.perf_counter() - start) / (repeat * 50) * 1e6
+    start = time.perf_counter()
+    for _ in range(repeat * 50):
+        np.argsort(-scores)[:3]
+    sort_us = (time.perf_counter() - start) / (repeat * 50) * 1e6
+    print(f"  rank top-3 of {n_symbols}: {topk_us:7.1f} us  (full argsort {sort_us:.1f} us)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
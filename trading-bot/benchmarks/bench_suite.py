@@ -0,0 +1,276 @@
+"""
+VAYU Trading Bot - Backtest Throughput Suite
+============================================
+Seeded synthetic benchmarks for the backtest pipeline, with regression
+thresholds:
+
+- signals:      RSIMomentumStrategy.generate_signals_batch over
+                (bars x symbols) panels, in bars/s (bar-symbol cells)
+- optimize:     VAYUBacktester.optimize_parameters on the walk-forward
+                grid, in combinations/s
+- walk_forward: VAYUBacktester.walk_forward_analysis (about 50
+                windows), in windows/s
+
+Sizes are every combination of 10k / 1M / 10M bars and 1 / 50 / 500
+symbols whose array size stays under --max-cells (default 20M cells,
+about 160 MB per float64 panel); larger cases are listed as skipped.
+The default is the CI scope, nine cases: every 10k-bar case, signals
+on 1 symbol at 1M and 10M bars, and walk-forward at every length. The
+50/500-symbol panels above 10k bars and optimize above 10k bars are
+skipped. --full runs all fifteen, including 10M bars x 500 symbols
+(~40 GB per panel), and is meant for a dedicated machine.
+Each case runs in a fresh worker process after a warm-up pass; short
+cases repeat until they have run for a second and report their best
+time. Peak memory is the resident-set growth over the process start.
+
+Results are written as JSON (benchmarks/results.json by default, which
+git ignores). With a baseline file, a case whose
+throughput falls more than the tolerance below its baseline is a
+regression, and the suite exits with status 1.
+
+Usage:
+    python benchmarks/bench_suite.py [--output benchmarks/results.json]
+        [--baseline benchmarks/baseline.json] [--tolerance 0.3]
+        [--max-cells 20000000 | --full] [--stages signals,optimize,walk_forward]
+        [--save-baseline]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backtest"))
+
+BARS = (10_000, 1_000_000, 10_000_000)
+SYMBOLS = (1, 50, 500)
+STAGES = ("signals", "optimize", "walk_forward")
+SEED = 42
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results.json")
+
+
+def synthetic_ohlc(n_bars: int, n_symbols: int, seed: int = SEED):
+    """Seeded random-walk close/high/low panels, (bars, symbols)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.standard_normal((n_bars, n_symbols)) * 0.01, axis=0))
+    high = close * (1 + np.abs(rng.standard_normal(close.shape)) * 0.005)
+    low = close * (1 - np.abs(rng.standard_normal(close.shape)) * 0.005)
+    return close, high, low
+
+
+def synthetic_price(n_bars: int, seed: int = SEED) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(
+        45000 * np.exp(np.cumsum(rng.standard_normal(n_bars) * 0.01)),
+        index=pd.date_range("2020-01-01", periods=n_bars, freq="h")
+    )
+
+
+def plan(stages=STAGES, max_cells: Optional[int] = 20_000_000) -> List[Dict]:
+    """Every benchmark case, with `skip` set for those over max_cells (None: none skipped)."""
+    from vectorbt_backtest import WALK_FORWARD_GRID
+    combos = int(np.prod([len(v) for v in WALK_FORWARD_GRID.values()]))
+
+    cases = []
+    for bars in BARS:
+        if "signals" in stages:
+            for symbols in SYMBOLS:
+                cases.append({"stage": "signals", "bars": bars, "symbols": symbols,
+                              "cells": bars * symbols})
+        if "optimize" in stages:
+            cases.append({"stage": "optimize", "bars": bars, "symbols": 1, "cells": bars * combos})
+        if "walk_forward" in stages:
+            # ~50 windows of a 54-combination grid on 1000 training bars
+            cases.append({"stage": "walk_forward", "bars": bars, "symbols": 1, "cells": 50 * 1000 * combos})
+    for case in cases:
+        case["case"] = f"{case['stage']}/{case['bars']}x{case['symbols']}"
+        case["skip"] = max_cells is not None and case["cells"] > max_cells
+    return cases
+
+
+def _rss_mb() -> Optional[float]:
+    """Peak resident set of this process so far, MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform != "darwin" else peak / 1024 ** 2
+
+
+def _best_time(func, min_time: float = 1.0, max_repeat: int = 20):
+    """(best seconds, last result), repeating func until min_time has elapsed."""
+    best, total, result = float("inf"), 0.0, None
+    for _ in range(max_repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best, total = min(best, elapsed), total + elapsed
+        if total >= min_time:
+            break
+    return best, result
+
+
+def _run_case(case: Dict) -> Dict:
+    """Time one case (after a warm-up) inside a fresh worker process."""
+    logging.disable(logging.INFO)
+    from src.strategy.rsi_momentum import RSIMomentumStrategy
+    from vectorbt_backtest import VAYUBacktester, WALK_FORWARD_GRID
+
+    stage, bars, symbols = case["stage"], case["bars"], case["symbols"]
+    start_mb = _rss_mb()
+
+    if stage == "signals":
+        strategy = RSIMomentumStrategy()
+        strategy.generate_signals_batch(*synthetic_ohlc(500, symbols))   # numba compile
+        panels = synthetic_ohlc(bars, symbols)
+        seconds, _ = _best_time(lambda: strategy.generate_signals_batch(*panels))
+        units, unit = bars * symbols, "bars/s"
+    elif stage == "optimize":
+        bt = VAYUBacktester(config={})
+        bt.optimize_parameters(synthetic_price(500), **WALK_FORWARD_GRID)
+        price = synthetic_price(bars)
+        seconds, result = _best_time(lambda: bt.optimize_parameters(price, **WALK_FORWARD_GRID))
+        units, unit = len(result), "combinations/s"
+    elif stage == "walk_forward":
+        bt = VAYUBacktester(config={})
+        bt.walk_forward_analysis(synthetic_price(1500), train_size=1000, test_size=200, step_size=300)
+        price = synthetic_price(bars)
+        step = max(200, (bars - 1200) // 50)
+        seconds, result = _best_time(
+            lambda: bt.walk_forward_analysis(price, train_size=1000, test_size=200, step_size=step)
+        )
+        units, unit = len(result), "windows/s"
+    else:
+        raise ValueError(f"Unknown stage {stage!r}")
+
+    end_mb = _rss_mb()
+    return {
+        **case,
+        "seconds": seconds,
+        "units": units,
+        "throughput": units / seconds,
+        "unit": unit,
+        "peak_mb": None if end_mb is None else end_mb,
+        "peak_growth_mb": None if end_mb is None else end_mb - start_mb
+    }
+
+
+def run(stages=STAGES, max_cells: Optional[int] = 20_000_000) -> List[Dict]:
+    results = []
+    for case in plan(stages, max_cells):
+        if case["skip"]:
+            print(f"  {case['case']:<28} skipped ({case['cells']:,} cells > --max-cells)")
+            results.append(case)
+            continue
+        # One process per case: isolated peak memory, no cross-case caching
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(_run_case, case).result()
+        mem = f"{result['peak_growth_mb']:8.0f} MB" if result["peak_growth_mb"] is not None else ""
+        print(f"  {result['case']:<28} {result['throughput']:>16,.1f} {result['unit']:<15} "
+              f"{result['seconds']:8.2f} s {mem}")
+        results.append(result)
+    return results
+
+
+def check(results: List[Dict], baseline: Dict[str, float], tolerance: float) -> List[Dict]:
+    """Cases slower than (1 - tolerance) x their baseline throughput."""
+    regressions = []
+    for r in results:
+        ref = baseline.get(r["case"])
+        if r.get("skip") or ref is None:
+            continue
+        if r["throughput"] < ref * (1.0 - tolerance):
+            regressions.append({"case": r["case"], "throughput": r["throughput"], "baseline": ref,
+                                "change": r["throughput"] / ref - 1.0})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON results file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline throughputs (JSON)")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Allowed slowdown as a fraction (default: the baseline's, else 0.3)")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--max-cells", type=int, default=20_000_000, help="Skip cases larger than this")
+    size.add_argument("--full", action="store_true", help="Run every case, however large")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the baseline")
+    args = parser.parse_args(argv)
+
+    stages = tuple(s.strip() for s in args.stages.split(",") if s.strip())
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages {sorted(unknown)} (available: {', '.join(STAGES)})")
+
+    max_cells = None if args.full else args.max_cells
+    scope = "all cases" if max_cells is None else f"max {max_cells:,} cells"
+    print(f"Backtest throughput suite (seed {SEED}, {scope})")
+    results = run(stages, max_cells)
+
+    baseline, tolerance = {}, args.tolerance
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        baseline = saved.get("throughput", {})
+        if tolerance is None:
+            tolerance = saved.get("tolerance", 0.3)
+    tolerance = 0.3 if tolerance is None else tolerance
+    regressions = check(results, baseline, tolerance)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": SEED,
+            "max_cells": max_cells,
+            "tolerance": tolerance,
+            "baseline": args.baseline if baseline else None
+        },
+        "results": results,
+        "regressions": regressions
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "tolerance": tolerance,
+                "meta": report["meta"],
+                "throughput": {r["case"]: round(r["throughput"], 3) for r in results if not r.get("skip")}
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {tolerance:.0%}:")
+        for r in regressions:
+            print(f"  {r['case']:<28} {r['throughput']:,.1f} vs {r['baseline']:,.1f} ({r['change']:+.0%})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+VAYU Trading Bot - Parameter Sweep Benchmark
+============================================
+VAYUBacktester.optimize_parameters: vectorized sweep vs the former
+per-combination loop, on the default 7 x 4 x 4 grid.
+
+Usage:
+    python benchmarks/bench_sweep.py [bars]
+"""
+
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "backtest"))
+
+from vectorbt_backtest import VAYUBacktester
+
+
+def run(n_bars: int = 5_000):
+    logging.disable(logging.INFO)
+    rng = np.random.default_rng(42)
+    price = pd.Series(
+        45000 * np.exp(np.cumsum(rng.standard_normal(n_bars) * 0.01)),
+        index=pd.date_range("2023-01-01", periods=n_bars, freq="h")
+    )
+    bt = VAYUBacktester(config_path="/nonexistent/config.yaml")
+    bt.optimize_parameters(price.iloc[:300], range(7, 9), range(20, 26, 5), range(65, 71, 5))  # Warm-up
+
+    start = time.perf_counter()
+    fast = bt.optimize_parameters(price)
+    sweep_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bt.optimize_parameters(price, vectorized=False)
+    loop_s = time.perf_counter() - start
+
+    print(f"Parameter sweep: {len(fast)} combinations x {n_bars:,} bars")
+    print(f"  per-combination loop: {loop_s:8.2f} s")
+    print(f"  vectorized sweep:     {sweep_s:8.2f} s  ({loop_s / sweep_s:.0f}x)")
+
+    big = dict(rsi_windows=range(5, 21), oversold_range=range(10, 41, 2), overbought_range=range(60, 91, 2))
+    start = time.perf_counter()
+    result = bt.optimize_parameters(price, **big)
+    print(f"  large grid ({len(result):,} combinations): {time.perf_counter() - start:8.2f} s")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
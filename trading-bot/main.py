@@ -12,11 +12,17 @@ import signal
 from datetime import datetime
 from typing import List, Dict, Optional
 
+import numpy as np
+import pandas as pd
+
 # Add src to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.exchange.kraken_client import KrakenClient
 from src.data.price_feed import PriceFeed
+from src.strategy.base import StrategyPlugin
+from src.strategy.engine import StrategyEngine
+from src.strategy.ranking import CrossSectionalRanker
 from src.strategy.rsi_momentum import RSIMomentumStrategy, Signal
 from src.strategy.risk_engine import RiskEngine, RiskLimits
 from src.execution.order_manager import OrderManager
@@ -35,12 +41,18 @@ class TradingBot:
         symbols: List[str] = None,
         timeframe: str = "1h",
         sandbox: bool = True,
-        paper_mode: bool = True
+        paper_mode: bool = True,
+        batch_signals: bool = False,
+        strategies: List[StrategyPlugin] = None,
+        panel_dtype=np.float64,
+        rank_entries: bool = False
     ):
         self.symbols = symbols or ["BTC/USD", "ETH/USD"]
         self.timeframe = timeframe
         self.sandbox = sandbox
         self.paper_mode = paper_mode
+        self.batch_signals = batch_signals  # Evaluate the universe as one panel
+        self.panel_dtype = panel_dtype      # float32 halves panel memory for big universes
         self.running = False
         
         # Paper trading state
@@ -55,13 +67,26 @@ class TradingBot:
         self.client.load_markets()
         print(f"✅ Connected to Kraken ({'sandbox' if sandbox else 'LIVE'})")
         
-        self.feed = PriceFeed(self.client)
-        self.strategy = RSIMomentumStrategy(timeframe=timeframe)
+        # Reuse a symbol's candle download for the rest of a signal pass
+        self.feed = PriceFeed(self.client, cache_ttl=60)
+        # Strategy plugins share one indicator graph; the first is primary
+        strategies = strategies or [RSIMomentumStrategy(timeframe=timeframe)]
+        self.strategy = strategies[0]
+        self.engine = StrategyEngine(strategies)
+        if len(strategies) > 1:
+            self.batch_signals = True  # Multi-strategy runs on the shared panel
+        # Cross-sectional mode: rank all LONG signals and fill free slots best first
+        self.ranker = CrossSectionalRanker(
+            oversold=getattr(self.strategy, "rsi_oversold", 30.0)
+        ) if rank_entries else None
+        if self.ranker is not None:
+            self.batch_signals = True  # Ranking needs the whole universe at once
         self.risk = RiskEngine(RiskLimits())
         self.orders = OrderManager(self.client, self.risk)
         self.paper_report = PaperTradingReport()
         
-        print(f"✅ Strategy: RSI Momentum on {timeframe}")
+        loaded = [f"{name} ({s.timeframe})" for name, s in self.engine.strategies.items()]
+        print(f"✅ Strategies: {', '.join(loaded)}")
         print(f"✅ Trading pairs: {', '.join(self.symbols)}")
         print(f"✅ Mode: {'PAPER TRADING' if paper_mode else 'LIVE EXECUTION'}")
         
@@ -78,10 +103,13 @@ class TradingBot:
         """
         Check for trading signals on all symbols.
         """
+        if self.batch_signals:
+            return self.check_signals_batch()
+        
         for symbol in self.symbols:
             try:
                 # Fetch price data
-                df = self.feed.fetch_candles(symbol, self.timeframe, limit=250)
+                df = self.feed.fetch_candles(symbol, self.strategy.timeframe, limit=self.strategy.warmup_bars())
                 
                 if len(df) < 200:
                     print(f"⚠️ Insufficient data for {symbol}")
@@ -89,11 +117,14 @@ class TradingBot:
                 
                 current_price = df["close"].iloc[-1]
                 
+                # Advance streaming indicators (O(1) per new closed bar)
+                snapshot = self.strategy.update_indicators(symbol, df)
+                
                 # Check for exit signals on open positions
                 if symbol in self.paper_positions:
                     position = self.paper_positions[symbol]
-                    should_exit = self.strategy.check_exit(
-                        df, position["entry_price"], 
+                    should_exit = self.strategy.exit_from_snapshot(
+                        snapshot, position["entry_price"], 
                         Signal.LONG if position["side"] == "buy" else Signal.SHORT
                     )
                     
@@ -103,11 +134,11 @@ class TradingBot:
                     continue
                 
                 # Check for entry signals
-                result = self.strategy.generate_signal(df)
+                result = self.strategy.signal_from_snapshot(snapshot)
                 
                 if result.signal == Signal.LONG:
                     print(f"📈 LONG signal: {symbol} (RSI: {result.rsi:.1f}, Confidence: {result.confidence:.2f})")
-                    self._enter_paper_long(symbol, result, current_price)
+                    self._enter_paper_long(symbol, result, current_price, snapshot.atr)
                     
                 elif result.signal == Signal.SHORT:
                     print(f"📉 SHORT signal: {symbol} (RSI: {result.rsi:.1f}, Confidence: {result.confidence:.2f})")
@@ -117,13 +148,137 @@ class TradingBot:
             except Exception as e:
                 print(f"❌ Error checking {symbol}: {e}")
     
-    def _enter_paper_long(self, symbol: str, signal_result, current_price: float):
+    def check_signals_batch(self):
+        """
+        Check signals for the whole universe in one vectorized pass per
+        timeframe that has strategies loaded.
+        """
+        for timeframe in self.engine.graphs:
+            self._check_timeframe(timeframe)
+    
+    def _check_timeframe(self, timeframe: str):
+        """Exits and entries for every strategy loaded on `timeframe`."""
+        # As much history as the per-symbol path, so both modes see the same indicator values
+        limit = max(s.warmup_bars() for s in self.engine.strategies_for(timeframe))
+        panel = self.feed.fetch_panel(self.symbols, timeframe, limit=limit, dtype=self.panel_dtype)
+        if not panel.symbols:
+            return
+        
+        enough_data = panel.valid_bars() >= 200
+        for symbol in np.array(panel.symbols)[~enough_data]:
+            print(f"⚠️ Insufficient data for {symbol} ({timeframe})")
+        
+        # One indicator graph evaluation shared by every strategy
+        key = (tuple(panel.symbols), int(panel.timestamps[-1]), panel.close[-1].tobytes())
+        results = self.engine.evaluate(
+            timeframe, panel.close, panel.high, panel.low, panel.symbols, key=key
+        )
+        
+        # Exits: each open position is judged by the strategy that opened it
+        for name in results:
+            entry_price = np.full(len(panel.symbols), np.nan)
+            position = np.zeros(len(panel.symbols), dtype=np.int8)
+            for j, symbol in enumerate(panel.symbols):
+                pos = self.paper_positions.get(symbol)
+                if pos and pos.get("strategy", self.strategy.name) == name:
+                    entry_price[j] = pos["entry_price"]
+                    position[j] = 1 if pos["side"] == "buy" else -1
+            
+            if not position.any():
+                continue
+            
+            should_exit = self.engine.exits(
+                name, timeframe, panel.close, panel.high, panel.low,
+                entry_price, position, key=key
+            ) & enough_data
+            for j in np.flatnonzero(should_exit):
+                symbol = panel.symbols[j]
+                print(f"📤 Exit signal for {symbol} ({name})")
+                self._exit_paper_position(symbol, panel.close[-1, j], "RSI mean reversion")
+        
+        if self.ranker is not None:
+            self._enter_ranked(panel, results, enough_data)
+        else:
+            self._enter_batch(panel, results, enough_data)
+        
+        self._publish_triggers(timeframe, panel)
+    
+    def _enter_batch(self, panel, results: dict, enough_data: np.ndarray):
+        """Enter LONG signals in strategy load order."""
+        # Only columns with a signal are touched
+        held = set(self.paper_positions)
+        for name, batch in results.items():
+            for j in batch.active():
+                symbol = panel.symbols[j]
+                if not enough_data[j] or symbol in held:
+                    continue
+                
+                result = batch.result(j)
+                if result.signal == Signal.LONG:
+                    print(f"📈 LONG signal: {symbol} [{name}] (RSI: {result.rsi:.1f}, Confidence: {result.confidence:.2f})")
+                    atr = batch.atr[j] if batch.atr is not None else None
+                    self._enter_paper_long(symbol, result, result.price, atr, strategy=name)
+                    held.add(symbol)
+                elif result.signal == Signal.SHORT:
+                    print(f"📉 SHORT signal: {symbol} [{name}] (RSI: {result.rsi:.1f}, Confidence: {result.confidence:.2f})")
+                    print("   (Short signals ignored - spot trading only)")
+    
+    def _publish_triggers(self, timeframe: str, panel):
+        """
+        Refresh trigger levels for open positions from the panel.
+        
+        Strategies with streaming state (update_indicators) are synced on
+        each held symbol's column, so check_paper_stops can exit on ticks
+        in batch/ranked mode as it does in the per-symbol loop.
+        """
+        for j, symbol in enumerate(panel.symbols):
+            pos = self.paper_positions.get(symbol)
+            strategy = self.engine.strategies.get(pos.get("strategy", self.strategy.name)) if pos else None
+            if strategy is None or strategy.timeframe != timeframe or not hasattr(strategy, "update_indicators"):
+                continue
+            
+            rows = ~np.isnan(panel.close[:, j])
+            strategy.update_indicators(symbol, pd.DataFrame({
+                "timestamp": panel.timestamps[rows],
+                "high": panel.high[rows, j],
+                "low": panel.low[rows, j],
+                "close": panel.close[rows, j]
+            }))
+    
+    def _enter_ranked(self, panel, results: dict, enough_data: np.ndarray):
+        """Enter the top-ranked LONG signals into the free position slots."""
+        free_slots = self.risk.limits.max_positions - len(self.paper_positions)
+        if free_slots <= 0:
+            return
+        
+        held = np.isin(panel.symbols, list(self.paper_positions))
+        entries = self.ranker.select(results, free_slots, eligible=enough_data & ~held)
+        
+        for rank, entry in enumerate(entries, 1):
+            symbol = panel.symbols[entry.index]
+            batch = results[entry.strategy]
+            result = batch.result(entry.index)
+            print(f"📈 LONG #{rank}: {symbol} [{entry.strategy}] (score: {entry.score:.3f}, "
+                  f"RSI: {result.rsi:.1f}, Confidence: {result.confidence:.2f})")
+            atr = batch.atr[entry.index] if batch.atr is not None else None
+            self._enter_paper_long(symbol, result, result.price, atr, strategy=entry.strategy)
+    
+    def _enter_paper_long(
+        self,
+        symbol: str,
+        signal_result,
+        current_price: float,
+        atr: float = None,
+        strategy: str = None
+    ):
         """Execute paper long entry."""
-        # Get ATR for stop calculation
-        df = self.feed.fetch_candles(symbol, self.timeframe, limit=50)
-        high = df["high"].rolling(14).max().iloc[-1]
-        low = df["low"].rolling(14).min().iloc[-1]
-        atr = (high - low) / 14 if high and low else current_price * 0.02
+        if len(self.paper_positions) >= self.risk.limits.max_positions:
+            print(f"   ⏸️ Max positions ({self.risk.limits.max_positions}) reached, skipping {symbol}")
+            return
+        
+        # ATR comes from the strategy's indicator pass (no extra download)
+        if atr is None or not atr > 0:
+            atr = current_price * 0.02
         
         stop_price = current_price - (3 * atr)
         
@@ -146,7 +301,8 @@ class TradingBot:
                 "amount": size,
                 "entry_price": current_price,
                 "stop_price": stop_price,
-                "entry_time": datetime.now()
+                "entry_time": datetime.now(),
+                "strategy": strategy or self.strategy.name
             }
             
             print(f"   📝 PAPER TRADE: {size} {symbol} @ ${current_price:,.2f}")
@@ -177,14 +333,27 @@ class TradingBot:
         print(f"   {emoji} PAPER CLOSE: {symbol} P&L: ${pnl:+.2f} | Balance: ${self.paper_balance:,.2f}")
     
     def check_paper_stops(self):
-        """Check stop losses on paper positions."""
+        """
+        Check stop losses on paper positions.
+        
+        Long positions also exit as soon as the tick reaches the price at
+        which RSI would return to 50 (published after each closed bar),
+        instead of waiting for the next signal pass.
+        """
         for symbol, position in list(self.paper_positions.items()):
             try:
                 current_price = self.feed.get_latest_price(symbol)
+                # Levels from the strategy that opened the position
+                strategy = self.engine.strategies.get(position.get("strategy", self.strategy.name))
+                triggers = getattr(strategy, "triggers", None)
+                levels = triggers.get(symbol) if triggers is not None else None
                 
                 if position["side"] == "buy" and current_price <= position["stop_price"]:
                     print(f"🛑 Stop loss hit for {symbol}")
                     self._exit_paper_position(symbol, current_price, "Stop loss")
+                elif position["side"] == "buy" and levels is not None and current_price >= levels.mid:
+                    print(f"📤 RSI 50 trigger hit for {symbol} @ ${levels.mid:,.2f}")
+                    self._exit_paper_position(symbol, current_price, "RSI mean reversion")
                     
             except Exception as e:
                 print(f"❌ Error checking stops for {symbol}: {e}")
@@ -199,6 +368,8 @@ class TradingBot:
         
         risk_status = self.risk.get_status()
         print(f"   Paper Positions: {len(self.paper_positions)}")
+        print(f"   Cache: {self.feed.cache.stats()}")
+        print(f"   Cache: {self.engine.cache.stats()}")
         
         if self.paper_positions:
             for symbol, pos in self.paper_positions.items():
@@ -298,6 +469,9 @@ def main():
     parser.add_argument("--paper", action="store_true", help="Force paper mode (default)")
     parser.add_argument("--interval", type=int, default=300, help="Check interval in seconds")
     parser.add_argument("--report", action="store_true", help="Generate report from existing trades")
+    parser.add_argument("--batch", action="store_true", help="Evaluate all symbols in one vectorized pass")
+    parser.add_argument("--rank", action="store_true", help="Rank LONG signals across symbols and enter the best first")
+    parser.add_argument("--float32", action="store_true", help="Reduced-precision panels for large universes (with --batch)")
     args = parser.parse_args()
     
     if args.report:
@@ -324,7 +498,10 @@ def main():
         api_key=api_key,
         api_secret=api_secret,
         sandbox=sandbox,
-        paper_mode=paper_mode
+        paper_mode=paper_mode,
+        batch_signals=args.batch,
+        panel_dtype=np.float32 if args.float32 else np.float64,
+        rank_entries=args.rank
     )
     bot.run(check_interval=args.interval)
 
@@ -3,5 +3,25 @@ Backtesting module for VAYU Trading Bot.
 """
 
 from .backtest_engine import BacktestEngine, run_quick_backtest
+from .event_engine import (
+    EventBacktestConfig, EventBacktester, EventBacktestResult, SimulatedBroker
+)
+from .exits import EXIT_NONE, EXIT_SIGNAL, EXIT_STOP, EXIT_TIME, apply_exits
+from .intrabar import SubBars, resolve_fill
+from .metrics import METRICS, compute_metrics, portfolio_metrics
+from .monte_carlo import MonteCarloResult, MonteCarloSimulator, path_stats, trade_returns
+from .pruning import PruningRules
+from .report import downsample, drawdown, lttb_indices, minmax_indices, report_figure, write_report
+from .search import SearchResult, SuccessiveHalving, TPESearch
 
-__all__ = ['BacktestEngine', 'run_quick_backtest']
+__all__ = [
+    'BacktestEngine', 'run_quick_backtest',
+    'EventBacktestConfig', 'EventBacktester', 'EventBacktestResult', 'SimulatedBroker',
+    'EXIT_NONE', 'EXIT_SIGNAL', 'EXIT_STOP', 'EXIT_TIME', 'apply_exits',
+    'SubBars', 'resolve_fill',
+    'METRICS', 'compute_metrics', 'portfolio_metrics',
+    'MonteCarloResult', 'MonteCarloSimulator', 'path_stats', 'trade_returns',
+    'PruningRules',
+    'downsample', 'drawdown', 'lttb_indices', 'minmax_indices', 'report_figure', 'write_report',
+    'SearchResult', 'SuccessiveHalving', 'TPESearch'
+]
@@ -2,6 +2,12 @@
 Backtesting Framework for VAYU Trading Bot
 ==========================================
 VectorBT-style backtesting with historical data.
+
+All symbols trade from one shared cash pool, like the live bot's single
+account: at most `max_positions` are open at a time, each entry takes an
+equal share of the cash left for the free slots, and on every bar exits
+are processed before entries, with entries ranked by signal strength
+(CrossSectionalRanker score) when several symbols compete for slots.
 """
 
 import pandas as pd
@@ -10,13 +16,70 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
 import vectorbt as vbt
 
-from ..strategy.rsi_momentum import RSIMomentumStrategy
-from ..data.price_feed import PriceFeed
+from ..indicators import kernels
+from ..strategy.ranking import CrossSectionalRanker
+from ..strategy.base import BatchSignalResult
+from ..strategy.risk_engine import RiskLimits
+from ..data.historical_store import HistoricalStore
+from ..utils.result_cache import ResultCache, make_key
+from .report import DEFAULT_POINTS, report_figure, write_report
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    NUMBA_AVAILABLE = False
+
+
+def _allocate_slots(entries, exits, call_seq, max_positions):
+    """
+    Apply the position cap in call order.
+    
+    Tracks which symbols are open exactly as the cash-sharing simulation
+    will, keeps only the entries that find a free slot, and sizes each as
+    1 / free slots of the remaining cash (equal weight across slots).
+    
+    Returns:
+        (accepted entries, size as a fraction of available cash)
+    """
+    n_bars, n_sym = entries.shape
+    accepted = np.zeros((n_bars, n_sym), dtype=np.bool_)
+    size = np.zeros((n_bars, n_sym))
+    in_pos = np.zeros(n_sym, dtype=np.bool_)
+    n_open = 0
+    
+    for t in range(n_bars):
+        for k in range(n_sym):
+            j = call_seq[t, k]
+            if in_pos[j]:
+                if exits[t, j]:
+                    in_pos[j] = False
+                    n_open -= 1
+            elif entries[t, j] and n_open < max_positions:
+                size[t, j] = 1.0 / (max_positions - n_open)
+                accepted[t, j] = True
+                in_pos[j] = True
+                n_open += 1
+    
+    return accepted, size
+
+
+if NUMBA_AVAILABLE:
+    _allocate_slots = njit(cache=True, nogil=True)(_allocate_slots)
+
+# Part of every result-cache key: bump when generate_signals / order_entries /
+# simulate change in a way that alters results, so stale entries stop matching
+SIGNAL_VERSION = "1"
 
 
 class BacktestEngine:
     """
     Backtesting engine using VectorBT for fast vectorized testing.
+    
+    Candles come from the local historical store (~/.vayu/backtest_data,
+    filled by backtest/kraken_data_fetcher.py). With a ResultCache, a
+    run whose data slice, signal rules and settings were seen before
+    is answered from the cache without loading candles or simulating.
     """
     
     def __init__(
@@ -25,34 +88,45 @@ class BacktestEngine:
         start_date: datetime,
         end_date: datetime,
         timeframe: str = "1h",
-        initial_capital: float = 10000.0
+        initial_capital: float = 10000.0,
+        max_positions: Optional[int] = None,
+        store: Optional[HistoricalStore] = None,
+        fees: float = 0.001,
+        slippage: float = 0.0005,
+        cache: Optional[ResultCache] = None
     ):
         self.symbols = symbols
         self.start_date = start_date
         self.end_date = end_date
         self.timeframe = timeframe
         self.initial_capital = initial_capital
+        self.max_positions = max_positions or RiskLimits().max_positions
+        self.store = store or HistoricalStore()
+        self.fees = fees
+        self.slippage = slippage
+        self.ranker = CrossSectionalRanker()
+        self.cache = cache
         
         # Results storage
         self.results: Dict[str, any] = {}
         self.portfolio = None
+        self.equity: Optional[pd.Series] = None
+        self.close_prices: Optional[pd.DataFrame] = None
         
-    def fetch_historical_data(self) -> pd.DataFrame:
+    def fetch_historical_data(self) -> Dict[str, pd.DataFrame]:
         """
-        Fetch historical OHLCV data for all symbols.
+        Load historical OHLCV data for all symbols from the local store.
+        
+        Raises:
+            FileNotFoundError: if a symbol has not been downloaded
         """
-        price_feed = PriceFeed()
-        all_data = {}
-        
-        for symbol in self.symbols:
-            df = price_feed.get_historical_ohlcv(
-                symbol=symbol,
-                timeframe=self.timeframe,
-                since=int(self.start_date.timestamp())
-            )
-            all_data[symbol] = df
-            
-        return all_data
+        return self.store.load_many(self.symbols, self.timeframe, self.start_date, self.end_date)
+    
+    def load_close_prices(self) -> pd.DataFrame:
+        """Closes aligned on the union of timestamps (NaN where a symbol has no bar)."""
+        panel = self.store.load_panel(self.symbols, self.timeframe, self.start_date, self.end_date)
+        index = pd.to_datetime(panel.timestamps, unit="ms")
+        return pd.DataFrame(panel.close, index=index, columns=panel.symbols)
     
     def generate_signals(self, close_prices: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -62,45 +136,99 @@ class BacktestEngine:
             entries: Boolean DataFrame of entry signals
             exits: Boolean DataFrame of exit signals
         """
-        entries = pd.DataFrame(False, index=close_prices.index, columns=close_prices.columns)
-        exits = pd.DataFrame(False, index=close_prices.index, columns=close_prices.columns)
+        # All symbols in one pass (columns are independent)
+        close = close_prices.to_numpy(dtype=np.float64)
+        rsi = kernels.rsi(close, 14)
+        ema200 = kernels.ema(close, 200)
+        
+        # Long entry: RSI < 30 and price > EMA200
+        entries = pd.DataFrame(
+            (rsi < 30) & (close > ema200),
+            index=close_prices.index, columns=close_prices.columns
+        )
+        
+        # Exit: RSI returns to 50
+        exits = pd.DataFrame(rsi >= 50, index=close_prices.index, columns=close_prices.columns)
         
-        for symbol in close_prices.columns:
-            rsi = vbt.RSI.run(close_prices[symbol], window=14)
-            ema200 = vbt.MA.run(close_prices[symbol], window=200, ewm=True)
-            
-            # Long entry: RSI < 30 and price > EMA200
-            entries[symbol] = (rsi.rsi < 30) & (close_prices[symbol] > ema200.ma)
-            
-            # Exit: RSI returns to 50
-            exits[symbol] = rsi.rsi >= 50
-            
         return entries, exits
     
-    def run(self) -> Dict:
+    def order_entries(self, close_prices: pd.DataFrame, entries: pd.DataFrame, exits: pd.DataFrame) -> np.ndarray:
         """
-        Execute backtest and return performance metrics.
-        """
-        print(f"🔄 Running backtest: {self.start_date.date()} to {self.end_date.date()}")
-        print(f"📊 Symbols: {', '.join(self.symbols)}")
+        Per-bar processing order of the symbols (vbt call_seq).
         
-        # Fetch data
-        data = self.fetch_historical_data()
-        close_prices = pd.DataFrame({sym: df['close'] for sym, df in data.items()})
+        Exits come first so their cash is available, then entries by
+        descending ranker score, then everything else.
+        """
+        close = close_prices.to_numpy(dtype=np.float64)
+        signal = entries.to_numpy()
+        # score() is element-wise, so the whole (bars, symbols) panel is scored at once
+        score = self.ranker.score(BatchSignalResult(
+            signal=signal.astype(np.int8),
+            confidence=np.zeros_like(close),
+            price=close,
+            rsi=kernels.rsi(close, 14),
+            ema200=kernels.ema(close, 200)
+        ))
+        key = np.where(exits.to_numpy(), -np.inf, np.where(signal, -score, np.inf))
+        return np.argsort(key, axis=1, kind="stable")
+    
+    def simulate(self, close_prices: pd.DataFrame) -> vbt.Portfolio:
+        """
+        Cash-sharing simulation of all symbols as one account.
         
-        # Generate signals
+        Args:
+            close_prices: (bars x symbols) closes, NaN where a symbol has no bar
+        """
         entries, exits = self.generate_signals(close_prices)
         
-        # Run VectorBT portfolio simulation
-        self.portfolio = vbt.Portfolio.from_signals(
-            close=close_prices,
-            entries=entries,
+        # No orders on missing bars; value positions at the last known close
+        has_bar = close_prices.notna()
+        entries &= has_bar
+        exits &= has_bar
+        
+        call_seq = self.order_entries(close_prices, entries, exits)
+        accepted, size = _allocate_slots(
+            entries.to_numpy(), exits.to_numpy(), call_seq, int(self.max_positions)
+        )
+        
+        return vbt.Portfolio.from_signals(
+            close=close_prices.ffill(),
+            entries=pd.DataFrame(accepted, index=close_prices.index, columns=close_prices.columns),
             exits=exits,
+            size=size,
+            size_type='percent',
+            cash_sharing=True,
+            group_by=True,
+            call_seq=call_seq,
             init_cash=self.initial_capital,
-            fees=0.001,  # 0.1% trading fee
-            slippage=0.0005,  # 0.05% slippage
-            freq='1h'
+            fees=self.fees,  # 0.1% trading fee
+            slippage=self.slippage,  # 0.05% slippage
+            freq=self.timeframe
         )
+    
+    def run(self) -> Dict:
+        """
+        Execute backtest and return performance metrics.
+        """
+        print(f"🔄 Running backtest: {self.start_date.date()} to {self.end_date.date()}")
+        print(f"📊 Symbols: {', '.join(self.symbols)} (max {self.max_positions} positions)")
+        
+        key = self.cache_key() if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                print("♻️ Unchanged data and settings: using cached result")
+                self.portfolio = None
+                self.close_prices = None
+                self.results, self.equity = cached["results"], cached["equity"]
+                return self.results
+        
+        # Load data
+        close_prices = self.load_close_prices()
+        self.close_prices = close_prices
+        
+        # Run VectorBT portfolio simulation (one shared cash pool)
+        self.portfolio = self.simulate(close_prices)
         
         # Extract metrics
         self.results = {
@@ -113,9 +241,27 @@ class BacktestEngine:
             'avg_trade_duration': self.portfolio.trades.duration.mean(),
             'final_equity': self.portfolio.value().iloc[-1]
         }
+        self.equity = self.portfolio.value()
+        
+        if key is not None:
+            self.cache.put(key, {"results": self.results, "equity": self.equity})
         
         return self.results
     
+    def cache_key(self) -> str:
+        """Content address of this run: data slice, signal rules and settings."""
+        # Subclasses that override the signal rules get their own entries
+        return make_key(
+            kind="backtest_engine",
+            engine=f"{type(self).__module__}.{type(self).__qualname__}",
+            signal_version=SIGNAL_VERSION,
+            data=self.store.slice_key(self.symbols, self.timeframe, self.start_date, self.end_date),
+            max_positions=self.max_positions,
+            initial_capital=self.initial_capital,
+            fees=self.fees,
+            slippage=self.slippage
+        )
+    
     def print_report(self):
         """
         Print formatted backtest report.
@@ -137,18 +283,44 @@ class BacktestEngine:
         print(f"Final Equity:      ${self.results['final_equity']:,.2f}")
         print("="*50)
     
-    def plot_equity_curve(self, output_path: str = None):
+    def plot_equity_curve(
+        self,
+        output_path: str = None,
+        max_points: int = DEFAULT_POINTS,
+        method: str = "lttb",
+        with_price: bool = True
+    ):
         """
-        Plot equity curve and save to file.
+        Plot price, equity and drawdown, downsampled to max_points per trace.
+        
+        Works from the stored equity curve, so it also plots cached runs
+        (their closes are reloaded from the store when with_price is set).
+        
+        Args:
+            output_path: .html (default choice, plotly.js from CDN) or
+                .png/.svg/.pdf (needs kaleido)
+            max_points: Points per trace; about the chart width in pixels
+            method: "lttb" or "minmax" for equity and price
+            with_price: Add a price panel per symbol
         """
-        if self.portfolio is None:
-            print("❌ No portfolio. Run backtest first.")
+        if self.equity is None:
+            print("❌ No equity curve. Run backtest first.")
             return
-            
-        fig = self.portfolio.plot()
+        
+        price = None
+        if with_price:
+            if self.close_prices is None:
+                self.close_prices = self.load_close_prices()
+            price = self.close_prices
+        
+        fig = report_figure(
+            self.equity, price, n_points=max_points, method=method,
+            title=f"{', '.join(self.symbols)} {self.timeframe}: "
+                  f"{self.start_date.date()} to {self.end_date.date()}"
+        )
         
         if output_path:
-            fig.write_image(output_path)
+            write_report(fig, output_path)
             print(f"📊 Equity curve saved to {output_path}")
         
         return fig
@@ -156,16 +328,19 @@ class BacktestEngine:
 
 def run_quick_backtest():
     """
-    Quick backtest for BTC/USD over last 90 days.
+    Quick backtest for BTC/USD over the 90 days up to today's midnight.
+    
+    The window is day-aligned so reruns on the same day reuse the cached result.
     """
-    end = datetime.now()
+    end = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     start = end - timedelta(days=90)
     
     engine = BacktestEngine(
         symbols=["BTC/USD"],
         start_date=start,
         end_date=end,
-        timeframe="1h"
+        timeframe="1h",
+        cache=ResultCache()
     )
     
     engine.run()
@@ -0,0 +1,610 @@
+"""
+VAYU Trading Bot - Event-Driven Backtester
+==========================================
+Bar-by-bar simulation of the live trading loop.
+
+The vectorbt backtests only model the entry/exit signal columns. This
+engine replays what the bot actually does on every closed bar:
+
+- indicators advance with the StreamingIndicators recursions
+- open longs exit on RSI >= 50 or close below entry - 3x ATR
+  (RSIMomentumStrategy.check_exit), and intrabar when the low touches
+  the stop placed at entry (main.py check_paper_stops); optionally
+  (intrabar_target) also when the high reaches the price at which RSI
+  would return to 50, as check_paper_stops does with trigger levels
+- entries are sized with RiskEngine.calculate_position_size
+  (confidence-scaled 1% risk, leverage cap), limited to
+  RiskLimits.max_positions across all symbols, and blocked while the
+  daily-loss circuit breaker is tripped (reset at each UTC day)
+- orders fill at the bar close (stops at the stop or a worse open) with
+  slippage and fees; shorts are ignored, as in the live bot
+
+When one bar's range holds both the stop and the RSI-50 trigger, the
+bar alone cannot tell which came first and the stop is assumed. Pass a
+SubBars source (src/backtest/intrabar.py) to resolve those bars from
+1m candles instead; see EventBacktester.run.
+
+Two paths produce the same trades:
+- `EventBacktester.run`: one compiled loop over the (bars, symbols)
+  panel (numba when installed); the fast path for research.
+- `EventBacktester.replay`: drives the real RSIMomentumStrategy,
+  RiskEngine and OrderManager objects against a SimulatedBroker. Slow,
+  but it is the live code, so it pins the compiled loop to it.
+"""
+
+import contextlib
+import io
+import itertools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..data.price_feed import CandlePanel, build_panel
+from ..execution.order_manager import OrderManager
+from ..strategy.base import Signal
+from ..strategy.risk_engine import RiskEngine, RiskLimits
+from ..strategy.rsi_momentum import RSIMomentumStrategy
+
+if TYPE_CHECKING:
+    from .intrabar import SubBars
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    NUMBA_AVAILABLE = False
+
+MS_PER_DAY = 86_400_000
+
+# Exit reason codes in the trade log
+EXIT_STOP = 1        # Intrabar stop placed at entry
+EXIT_SIGNAL = 2      # check_exit on the closed bar (RSI >= 50 or 3x ATR)
+EXIT_TARGET = 3      # Intrabar RSI-50 trigger (intrabar_target)
+EXIT_REASONS = {EXIT_STOP: "Stop loss", EXIT_SIGNAL: "Exit signal", EXIT_TARGET: "RSI mean reversion"}
+
+_TRADE_COLUMNS = ["symbol", "entry_bar", "exit_bar", "entry_price", "exit_price",
+                  "size", "pnl", "fees", "reason"]
+
+
+@dataclass
+class EventBacktestConfig:
+    """Simulation settings not owned by the strategy or the risk limits."""
+    initial_capital: float = 10000.0
+    fees: float = 0.001            # Fraction of notional per fill
+    slippage: float = 0.0005       # Fraction of price, against the order
+    min_bars: int = 200            # Bars of history before trading (live loop skips < 200)
+    stop_atr_multiple: float = 3.0
+    fallback_atr_pct: float = 0.02 # Stop distance when ATR is unavailable
+    intrabar_target: bool = False  # Also exit intrabar at the RSI-50 trigger price
+
+
+@dataclass
+class EventBacktestResult:
+    """Outcome of one simulation."""
+    symbols: List[str]
+    timestamps: np.ndarray
+    equity: np.ndarray             # Balance + open P&L at each bar close
+    trades: pd.DataFrame           # One row per closed trade
+    final_balance: float
+    open_positions: int = 0
+    ambiguous_bars: int = 0        # Bars with both stop and trigger in range
+    sub_bar_lookups: int = 0       # Bars resolved from sub-bars
+
+    @property
+    def total_return(self) -> float:
+        return float(self.equity[-1] / self.equity[0] - 1.0) if len(self.equity) else 0.0
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest peak-to-trough fall of the equity curve (fraction)."""
+        if not len(self.equity):
+            return 0.0
+        peak = np.maximum.accumulate(self.equity)
+        return float(np.max(1.0 - self.equity / peak))
+
+
+def _event_loop(
+    open_, high, low, close, day,
+    rsi_period, ema_period, atr_period, oversold,
+    max_risk, max_leverage, max_positions, max_daily_loss,
+    initial_capital, fees, slippage, min_bars, stop_atr_multiple, fallback_atr_pct,
+    intrabar_target, res_key, res_stop, res_target, res_reason, res_price
+):
+    """
+    Path-dependent simulation over a (bars, symbols) panel.
+
+    Arithmetic mirrors StreamingIndicators, RSIMomentumStrategy,
+    RiskEngine and OrderManager operation for operation, so results are
+    identical to `EventBacktester.replay`.
+
+    Bars where both the stop and the RSI-50 trigger are in range use the
+    resolution stored for that bar (sorted keys t * n_sym + j) if it was
+    made for the same levels; otherwise the stop is assumed and the bar
+    is reported back for resolution.
+
+    Returns:
+        (equity, trade rows, number of trades, final balance, open
+        positions, unresolved bars as (t, j, stop, target) rows, number
+        of them, ambiguous bars on the path)
+    """
+    n_bars, n_sym = close.shape
+    rsi_decay = 1.0 - 1.0 / rsi_period
+    ema_alpha = 2.0 / (ema_period + 1)
+    atr_alpha = 2.0 / (atr_period + 1)
+
+    gain_sum = np.zeros(n_sym)
+    loss_sum = np.zeros(n_sym)
+    ema = np.full(n_sym, np.nan)
+    atr = np.full(n_sym, np.nan)
+    prev_close = np.full(n_sym, np.nan)
+    bars = np.zeros(n_sym, dtype=np.int64)
+
+    in_pos = np.zeros(n_sym, dtype=np.bool_)
+    entry_price = np.zeros(n_sym)
+    stop_price = np.zeros(n_sym)
+    size = np.zeros(n_sym)
+    entry_fee = np.zeros(n_sym)
+    entry_bar = np.zeros(n_sym, dtype=np.int64)
+    mark = np.full(n_sym, np.nan)   # Last close, for equity
+
+    equity = np.empty(n_bars)
+    trades = np.empty((64, 9))
+    n_trades = 0
+    needs = np.empty((16, 4))
+    n_needs = 0
+    n_ambiguous = 0
+    balance = initial_capital
+    n_open = 0
+    daily_pnl = 0.0
+    halted = False
+    current_day = day[0] if n_bars > 0 else 0
+
+    for t in range(n_bars):
+        if day[t] != current_day:
+            # RiskEngine.reset_daily at the UTC day boundary
+            current_day = day[t]
+            daily_pnl = 0.0
+            halted = False
+
+        for phase in range(2):
+            for j in range(n_sym):
+                c = close[t, j]
+                if not c == c:
+                    continue   # No bar for this symbol
+
+                exit_px = 0.0
+                reason = 0
+                if phase == 0:
+                    if not in_pos[j]:
+                        continue
+                    # Intrabar stop from the level placed at entry
+                    stop = stop_price[j]
+                    target = np.nan
+                    if intrabar_target and bars[j] + 1 >= rsi_period:
+                        # StreamingIndicators.rsi_trigger_price(symbol, 50)
+                        gain = gain_sum[j] * rsi_decay
+                        loss = loss_sum[j] * rsi_decay
+                        f = 0.5
+                        if gain + loss == 0:
+                            target = prev_close[j]
+                        elif gain / (gain + loss) < f:
+                            target = prev_close[j] + (f * loss - (1.0 - f) * gain) / (1.0 - f)
+                        else:
+                            target = prev_close[j] + -((1.0 - f) * gain - f * loss) / f
+                    o = open_[t, j]
+                    hit_stop = low[t, j] <= stop
+                    hit_target = high[t, j] >= target
+                    if hit_stop and hit_target and stop < o < target:
+                        n_ambiguous += 1
+                        key = t * n_sym + j
+                        k = np.searchsorted(res_key, key)
+                        if k < len(res_key) and res_key[k] == key \
+                                and res_stop[k] == stop and res_target[k] == target:
+                            exit_px = res_price[k]
+                            reason = res_reason[k]
+                        else:
+                            if n_needs == needs.shape[0]:
+                                grown_needs = np.empty((2 * n_needs, 4))
+                                grown_needs[:n_needs] = needs
+                                needs = grown_needs
+                            needs[n_needs, 0] = t
+                            needs[n_needs, 1] = j
+                            needs[n_needs, 2] = stop
+                            needs[n_needs, 3] = target
+                            n_needs += 1
+                            exit_px = stop
+                            reason = EXIT_STOP
+                    elif hit_stop and not o >= target:
+                        exit_px = o if o < stop else stop
+                        reason = EXIT_STOP
+                    elif hit_target:
+                        exit_px = o if o > target else target
+                        reason = EXIT_TARGET
+                else:
+                    # Close of bar: advance the streaming indicators
+                    h = high[t, j]
+                    lo = low[t, j]
+                    if bars[j] == 0:
+                        gain = 0.0
+                        loss = 0.0
+                        true_range = h - lo
+                        ema[j] = c
+                    else:
+                        delta = c - prev_close[j]
+                        gain = delta if delta > 0 else 0.0
+                        loss = -delta if delta < 0 else 0.0
+                        true_range = max(h - lo, abs(h - prev_close[j]), abs(lo - prev_close[j]))
+                        ema[j] += ema_alpha * (c - ema[j])
+                    gain_sum[j] = gain_sum[j] * rsi_decay + gain
+                    loss_sum[j] = loss_sum[j] * rsi_decay + loss
+                    if bars[j] == 0:
+                        atr[j] = true_range
+                    else:
+                        atr[j] += atr_alpha * (true_range - atr[j])
+                    prev_close[j] = c
+                    bars[j] += 1
+                    mark[j] = c
+
+                    if bars[j] < min_bars:
+                        continue
+                    rsi = np.nan
+                    if bars[j] >= rsi_period:
+                        total = gain_sum[j] + loss_sum[j]
+                        if total > 0:
+                            rsi = 100.0 * gain_sum[j] / total
+
+                    if in_pos[j]:
+                        if rsi >= 50 or c < entry_price[j] - 3 * atr[j]:
+                            exit_px = c
+                            reason = EXIT_SIGNAL
+                    elif rsi < oversold and c > ema[j]:
+                        # Entry: can_open_position, then calculate_position_size
+                        if halted or n_open >= max_positions:
+                            continue
+                        confidence = min(1.0, (oversold - rsi) / 20)
+                        a = atr[j]
+                        if not a > 0:
+                            a = c * fallback_atr_pct
+                        stop = c - stop_atr_multiple * a
+                        risk_amount = balance * max_risk
+                        risk_amount *= confidence
+                        stop_distance = abs(c - stop)
+                        if stop_distance == 0:
+                            continue
+                        qty = risk_amount / stop_distance
+                        qty = min(qty, (balance * max_leverage) / c)
+                        if not qty > 0:
+                            continue
+
+                        fill = c * (1 + slippage)
+                        fee = fill * qty * fees
+                        balance -= fee
+                        in_pos[j] = True
+                        entry_price[j] = fill
+                        stop_price[j] = stop
+                        size[j] = qty
+                        entry_fee[j] = fee
+                        entry_bar[j] = t
+                        n_open += 1
+                        continue
+
+                if reason == 0:
+                    continue
+
+                fill = exit_px * (1 - slippage)
+                pnl = (fill - entry_price[j]) * size[j]
+                fee = fill * size[j] * fees
+                balance += pnl - fee
+                # OrderManager.exit_position -> RiskEngine.update_daily_pnl
+                daily_pnl += pnl
+                if daily_pnl < -max_daily_loss:
+                    halted = True
+
+                if n_trades == trades.shape[0]:
+                    grown = np.empty((2 * n_trades, 9))
+                    grown[:n_trades] = trades
+                    trades = grown
+                row = trades[n_trades]
+                row[0] = j
+                row[1] = entry_bar[j]
+                row[2] = t
+                row[3] = entry_price[j]
+                row[4] = fill
+                row[5] = size[j]
+                row[6] = pnl
+                row[7] = entry_fee[j] + fee
+                row[8] = reason
+                n_trades += 1
+                in_pos[j] = False
+                n_open -= 1
+
+        open_pnl = 0.0
+        for j in range(n_sym):
+            if in_pos[j]:
+                open_pnl += (mark[j] - entry_price[j]) * size[j]
+        equity[t] = balance + open_pnl
+
+    return equity, trades, n_trades, balance, n_open, needs, n_needs, n_ambiguous
+
+
+if NUMBA_AVAILABLE:
+    _event_loop_nb = njit(cache=True, nogil=True)(_event_loop)
+
+
+@dataclass
+class SimulatedOrder:
+    """Fill report in the shape OrderManager reads (price, filled)."""
+    id: str
+    symbol: str
+    side: str
+    amount: float
+    price: float
+    filled: float
+    fee: float
+
+
+@dataclass
+class SimulatedBroker:
+    """
+    Exchange client stand-in for OrderManager.
+
+    Market orders fill in full at the current quote moved against the
+    order by `slippage`; fees are charged on the fill notional and
+    accumulated in `fees_paid`.
+    """
+    fees: float = 0.001
+    slippage: float = 0.0005
+    quotes: Dict[str, float] = field(default_factory=dict)
+    fees_paid: float = 0.0
+    orders: List[SimulatedOrder] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._ids = itertools.count(1)
+
+    def create_market_order(self, symbol: str, side: str, amount: float) -> SimulatedOrder:
+        quote = self.quotes[symbol]
+        price = quote * (1 + self.slippage) if side == "buy" else quote * (1 - self.slippage)
+        fee = price * amount * self.fees
+        self.fees_paid += fee
+        order = SimulatedOrder(str(next(self._ids)), symbol, side, amount, price, amount, fee)
+        self.orders.append(order)
+        return order
+
+    def create_limit_order(self, symbol: str, side: str, amount: float, price: float) -> SimulatedOrder:
+        self.quotes[symbol] = price
+        return self.create_market_order(symbol, side, amount)
+
+    def get_open_orders(self) -> list:
+        return []
+
+    def cancel_order(self, order_id: str, symbol: str):
+        pass
+
+
+class EventBacktester:
+    """
+    Event-driven backtest of the live RSI momentum loop.
+
+    Args:
+        strategy: Strategy whose parameters are simulated (default RSIMomentumStrategy())
+        limits: Risk limits (default RiskLimits())
+        config: Fill and warm-up settings
+    """
+
+    def __init__(
+        self,
+        strategy: Optional[RSIMomentumStrategy] = None,
+        limits: Optional[RiskLimits] = None,
+        config: Optional[EventBacktestConfig] = None
+    ):
+        self.strategy = strategy or RSIMomentumStrategy()
+        self.limits = limits or RiskLimits()
+        self.config = config or EventBacktestConfig()
+
+    @staticmethod
+    def _panel(data: Union[CandlePanel, Dict[str, pd.DataFrame], pd.DataFrame]) -> CandlePanel:
+        if isinstance(data, CandlePanel):
+            return data
+        if isinstance(data, pd.DataFrame):
+            data = {"asset": data}
+        return build_panel(data)
+
+    def run(self, data: Union[CandlePanel, Dict[str, pd.DataFrame], pd.DataFrame],
+            sub_bars: Optional["SubBars"] = None) -> EventBacktestResult:
+        """
+        Simulate with the compiled loop.
+
+        With sub_bars, bars where the stop and the RSI-50 trigger are
+        both in range are resolved from the lower timeframe. The loop
+        runs, reports those bars, they are looked up, and it runs again
+        with the answers; a resolution can change the path after it, so
+        this repeats until a pass meets no unresolved bar. Each pass
+        fixes the path at least up to its first unresolved bar. Only
+        the reported bars are read from the sub-bars.
+
+        Args:
+            data: CandlePanel, symbol -> OHLCV frame (timestamps in ms),
+                or a single frame
+            sub_bars: Lower-timeframe candles (needs intrabar_target)
+
+        Returns:
+            EventBacktestResult
+        """
+        panel = self._panel(data)
+        s, lim, cfg = self.strategy, self.limits, self.config
+        arrays = [np.ascontiguousarray(a, dtype=np.float64)
+                  for a in (panel.open, panel.high, panel.low, panel.close)]
+        timestamps = np.asarray(panel.timestamps, dtype=np.int64)
+        day = timestamps // MS_PER_DAY
+        bar_ms = _bar_ms(timestamps)
+        n_sym = len(panel.symbols)
+
+        loop = _event_loop_nb if NUMBA_AVAILABLE else _event_loop
+        resolved = {}     # t * n_sym + j -> (stop, target, reason, fill)
+        lookups = 0
+        while True:
+            keys = np.array(sorted(resolved), dtype=np.int64)
+            table = np.array([resolved[k] for k in keys], dtype=np.float64).reshape(-1, 4)
+            equity, trades, n_trades, balance, n_open, needs, n_needs, n_ambiguous = loop(
+                *arrays, day,
+                int(s.rsi_period), int(s.ema_period), 14, float(s.rsi_oversold),
+                float(lim.max_risk_per_trade), float(lim.max_leverage), int(lim.max_positions),
+                float(lim.max_daily_loss),
+                float(cfg.initial_capital), float(cfg.fees), float(cfg.slippage), int(cfg.min_bars),
+                float(cfg.stop_atr_multiple), float(cfg.fallback_atr_pct),
+                bool(cfg.intrabar_target), keys, table[:, 0].copy(), table[:, 1].copy(),
+                table[:, 2].astype(np.int64), table[:, 3].copy()
+            )
+            if sub_bars is None or n_needs == 0:
+                break
+            for t, j, stop, target in needs[:n_needs]:
+                t, j = int(t), int(j)
+                start = int(timestamps[t])
+                hit = sub_bars.resolve(panel.symbols[j], start, start + bar_ms, stop, target)
+                lookups += 1
+                reason, fill = hit if hit is not None else (EXIT_STOP, stop)
+                resolved[t * n_sym + j] = (stop, target, reason, fill)
+
+        return self._result(panel, equity, trades[:n_trades], balance, n_open,
+                            ambiguous_bars=n_ambiguous, sub_bar_lookups=lookups)
+
+    def _result(self, panel: CandlePanel, equity, trades: np.ndarray, balance: float,
+                n_open: int, **stats) -> EventBacktestResult:
+        log = pd.DataFrame(trades, columns=_TRADE_COLUMNS)
+        for col in ("entry_bar", "exit_bar", "reason"):
+            log[col] = log[col].astype(np.int64)
+        log["symbol"] = [panel.symbols[int(j)] for j in trades[:, 0]] if len(trades) else []
+        log["reason"] = log["reason"].map(EXIT_REASONS)
+        return EventBacktestResult(
+            symbols=list(panel.symbols), timestamps=np.asarray(panel.timestamps),
+            equity=np.asarray(equity), trades=log, final_balance=float(balance),
+            open_positions=int(n_open), **stats
+        )
+
+    def replay(self, data: Union[CandlePanel, Dict[str, pd.DataFrame], pd.DataFrame],
+               sub_bars: Optional["SubBars"] = None) -> EventBacktestResult:
+        """
+        Simulate by driving the live objects bar by bar.
+
+        A fresh strategy (same parameters), RiskEngine and OrderManager
+        are wired to a SimulatedBroker. Orders and the risk checks go
+        through OrderManager exactly as in live trading; its console
+        output is suppressed. Roughly 10^4 bars/s: use for validation.
+        """
+        panel = self._panel(data)
+        s, cfg = self.strategy, self.config
+        strategy = RSIMomentumStrategy(
+            rsi_period=s.rsi_period, rsi_overbought=s.rsi_overbought,
+            rsi_oversold=s.rsi_oversold, ema_period=s.ema_period, timeframe=s.timeframe
+        )
+        risk = RiskEngine(RiskLimits(**vars(self.limits)))
+        broker = SimulatedBroker(fees=cfg.fees, slippage=cfg.slippage)
+        orders = OrderManager(broker, risk)
+
+        n_bars, n_sym = panel.close.shape
+        equity = np.empty(n_bars)
+        trades = []
+        entries = {}     # symbol -> (bar, stop, entry fee)
+        marks = {}
+        bars_seen = dict.fromkeys(panel.symbols, 0)
+        balance = cfg.initial_capital   # Paper balance: realized P&L net of fees
+        current_day = None
+        bar_ms = _bar_ms(np.asarray(panel.timestamps, dtype=np.int64))
+        n_ambiguous = lookups = 0
+
+        def close_trade(symbol: str, j: int, t: int, quote: float, reason: int):
+            nonlocal balance
+            broker.quotes[symbol] = quote
+            trade = orders.open_trades[symbol]
+            pnl = orders.exit_position(symbol)
+            fee = broker.orders[-1].fee
+            balance += pnl - fee
+            bar, _, entry_fee = entries.pop(symbol)
+            trades.append([j, bar, t, trade.entry_price, trade.exit_price, trade.amount, pnl,
+                           entry_fee + fee, reason])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for t in range(n_bars):
+                day = int(panel.timestamps[t]) // MS_PER_DAY
+                if day != current_day:
+                    current_day = day
+                    risk.reset_daily()
+
+                # Intrabar stops and RSI-50 triggers (check_paper_stops)
+                for j, symbol in enumerate(panel.symbols):
+                    if symbol in orders.open_trades and not np.isnan(panel.close[t, j]):
+                        stop = entries[symbol][1]
+                        target = np.nan
+                        if cfg.intrabar_target:
+                            target = strategy.indicators.rsi_trigger_price(symbol, 50.0)
+                        o = panel.open[t, j]
+                        hit_stop = panel.low[t, j] <= stop
+                        hit_target = panel.high[t, j] >= target
+                        if hit_stop and hit_target and stop < o < target:
+                            n_ambiguous += 1
+                            hit = None
+                            if sub_bars is not None:
+                                start = int(panel.timestamps[t])
+                                hit = sub_bars.resolve(symbol, start, start + bar_ms, stop, target)
+                                lookups += 1
+                            reason, fill = hit if hit is not None else (EXIT_STOP, stop)
+                            close_trade(symbol, j, t, fill, reason)
+                        elif hit_stop and not o >= target:
+                            close_trade(symbol, j, t, min(o, stop), EXIT_STOP)
+                        elif hit_target:
+                            close_trade(symbol, j, t, max(o, target), EXIT_TARGET)
+
+                # Closed-bar decisions (check_signals)
+                for j, symbol in enumerate(panel.symbols):
+                    c = float(panel.close[t, j])
+                    if np.isnan(c):
+                        continue
+                    snapshot = strategy.indicators.update(
+                        symbol, panel.high[t, j], panel.low[t, j], c, int(panel.timestamps[t])
+                    )
+                    bars_seen[symbol] += 1
+                    marks[symbol] = c
+                    if bars_seen[symbol] < cfg.min_bars:
+                        continue
+
+                    if symbol in orders.open_trades:
+                        trade = orders.open_trades[symbol]
+                        if strategy.exit_from_snapshot(snapshot, trade.entry_price, Signal.LONG):
+                            close_trade(symbol, j, t, c, EXIT_SIGNAL)
+                        continue
+
+                    result = strategy.signal_from_snapshot(snapshot)
+                    if result.signal != Signal.LONG:
+                        continue
+                    atr = snapshot.atr
+                    if not atr > 0:
+                        atr = c * cfg.fallback_atr_pct
+                    stop = c - cfg.stop_atr_multiple * atr
+                    if not risk.can_open_position(symbol)[0]:
+                        continue
+                    size = risk.calculate_position_size(balance, c, stop, result.confidence)
+                    if not size or not size > 0:
+                        continue
+                    broker.quotes[symbol] = c
+                    if orders.enter_position(symbol, "buy", size) is not None:
+                        fee = broker.orders[-1].fee
+                        balance -= fee
+                        entries[symbol] = (t, stop, fee)
+
+                open_pnl = sum((marks[sym] - tr.entry_price) * tr.amount
+                               for sym, tr in orders.open_trades.items())
+                equity[t] = balance + open_pnl
+
+        rows = np.array(trades, dtype=np.float64).reshape(-1, len(_TRADE_COLUMNS))
+        return self._result(panel, equity, rows, balance, len(orders.open_trades),
+                            ambiguous_bars=n_ambiguous, sub_bar_lookups=lookups)
+
+
+def _bar_ms(timestamps: np.ndarray) -> int:
+    """Bar length in ms: the most common gap between timestamps."""
+    if len(timestamps) < 2:
+        return 3_600_000
+    gaps, counts = np.unique(np.diff(timestamps), return_counts=True)
+    return int(gaps[np.argmax(counts)])
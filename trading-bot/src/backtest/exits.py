@@ -0,0 +1,169 @@
+"""
+VAYU Trading Bot - Path-Dependent Exits
+=======================================
+ATR stop and max-hold time exits for vectorized signal backtests.
+
+Entry/exit signal columns cannot express exits that depend on the open
+position: the live strategy stops out when the close falls below
+entry - atr_multiplier x ATR (above, for shorts) and the config caps
+holding time (max_hold_hours). `apply_exits` runs one compiled scan per
+column (numba when installed) that tracks the position the signals
+imply, adds those exits, and returns clean signal arrays with at most
+one action per bar, which vectorbt then executes along the same path.
+
+Position rules follow vectorbt's from_signals defaults (no
+accumulation): an entry and exit for the same side on one bar cancel,
+as do long and short entries on one bar; an opposite entry reverses
+the position. A stop or time exit closes the position and ignores that
+bar's entries. The entry reference is the close of the entry bar; the
+stop tests the close, as RSIMomentumStrategy.check_exit does, with the
+ATR of the bar being tested.
+
+With `lag`=1 (signals shifted one bar to avoid look-ahead) the stop and
+holding time are evaluated on the previous bar and acted on at the
+next one, like every other signal.
+"""
+
+from typing import Tuple, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Exit reasons reported per bar
+EXIT_NONE = 0
+EXIT_SIGNAL = 1
+EXIT_STOP = 2
+EXIT_TIME = 3
+
+
+def _exit_scan(
+    long_entries, long_exits, short_entries, short_exits,
+    close, atr, multiplier, max_hold, lag,
+    out_le, out_lx, out_se, out_sx, reason
+):
+    n_bars, n_cols = long_entries.shape
+    for j in range(n_cols):
+        position = 0
+        entry_bar = -1
+        entry_price = 0.0
+        for t in range(n_bars):
+            if position != 0:
+                s = t - lag
+                forced = EXIT_NONE
+                if s >= entry_bar:
+                    if max_hold[j] > 0 and s - entry_bar >= max_hold[j]:
+                        forced = EXIT_TIME
+                    stop = multiplier[j] * atr[s]
+                    if position == 1 and close[s] < entry_price - stop:
+                        forced = EXIT_STOP
+                    elif position == -1 and close[s] > entry_price + stop:
+                        forced = EXIT_STOP
+                if forced != EXIT_NONE:
+                    if position == 1:
+                        out_lx[t, j] = True
+                    else:
+                        out_sx[t, j] = True
+                    reason[t, j] = forced
+                    position = 0
+                    continue
+
+            le = long_entries[t, j]
+            lx = long_exits[t, j]
+            se = short_entries[t, j]
+            sx = short_exits[t, j]
+            if le and lx:
+                le = lx = False
+            if se and sx:
+                se = sx = False
+            if le and se:
+                le = se = False
+
+            if position == 0:
+                if le:
+                    position, entry_bar, entry_price = 1, t, close[t]
+                    out_le[t, j] = True
+                elif se:
+                    position, entry_bar, entry_price = -1, t, close[t]
+                    out_se[t, j] = True
+            elif position == 1:
+                if se:
+                    position, entry_bar, entry_price = -1, t, close[t]
+                    out_se[t, j] = True
+                    reason[t, j] = EXIT_SIGNAL
+                elif lx:
+                    position = 0
+                    out_lx[t, j] = True
+                    reason[t, j] = EXIT_SIGNAL
+            else:
+                if le:
+                    position, entry_bar, entry_price = 1, t, close[t]
+                    out_le[t, j] = True
+                    reason[t, j] = EXIT_SIGNAL
+                elif sx:
+                    position = 0
+                    out_sx[t, j] = True
+                    reason[t, j] = EXIT_SIGNAL
+
+
+if NUMBA_AVAILABLE:
+    _exit_scan_nb = njit(cache=True, nogil=True)(_exit_scan)
+
+
+def apply_exits(
+    long_entries: np.ndarray,
+    long_exits: np.ndarray,
+    short_entries: np.ndarray,
+    short_exits: np.ndarray,
+    close: np.ndarray,
+    atr: np.ndarray,
+    atr_multiplier: Union[float, np.ndarray] = np.inf,
+    max_hold: Union[int, np.ndarray] = 0,
+    lag: int = 1
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Add ATR-stop and time exits to signal columns.
+
+    Args:
+        long_entries, long_exits, short_entries, short_exits: (bars,) or
+            (bars, columns) boolean signals, already lagged
+        close: (bars,) close prices
+        atr: (bars,) ATR
+        atr_multiplier: Stop distance in ATRs, scalar or per column
+            (inf disables the stop)
+        max_hold: Bars a position may be held, scalar or per column
+            (0 disables the time exit)
+        lag: Bars between evaluating a stop/time rule and acting on it
+
+    Returns:
+        (long_entries, long_exits, short_entries, short_exits, reason):
+        clean signals in the input shape, and per-bar exit reasons
+        (EXIT_SIGNAL / EXIT_STOP / EXIT_TIME, else EXIT_NONE)
+    """
+    arrays = [np.asarray(a, dtype=np.bool_) for a in (long_entries, long_exits, short_entries, short_exits)]
+    was_1d = arrays[0].ndim == 1
+    if was_1d:
+        arrays = [a[:, None] for a in arrays]
+    arrays = [np.ascontiguousarray(a) for a in arrays]
+    n_bars, n_cols = arrays[0].shape
+
+    multiplier = np.ascontiguousarray(np.broadcast_to(np.asarray(atr_multiplier, dtype=np.float64), (n_cols,)))
+    hold = np.ascontiguousarray(np.broadcast_to(np.asarray(max_hold, dtype=np.int64), (n_cols,)))
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    atr = np.ascontiguousarray(atr, dtype=np.float64)
+    if len(close) != n_bars or len(atr) != n_bars:
+        raise ValueError("close and atr must have one value per bar")
+
+    out = [np.zeros((n_bars, n_cols), dtype=np.bool_) for _ in range(4)]
+    reason = np.zeros((n_bars, n_cols), dtype=np.int8)
+    scan = _exit_scan_nb if NUMBA_AVAILABLE else _exit_scan
+    scan(*arrays, close, atr, multiplier, hold, int(lag), *out, reason)
+
+    if was_1d:
+        out = [a[:, 0] for a in out]
+        reason = reason[:, 0]
+    return out[0], out[1], out[2], out[3], reason
@@ -0,0 +1,114 @@
+"""
+VAYU Trading Bot - Bar Magnifier
+================================
+Lower-timeframe sub-bars for ordering intrabar fills.
+
+A 1h candle whose range contains both the stop and the exit trigger of
+an open position cannot say which was touched first. The event
+backtester treats such bars as stopped out (the pessimistic reading)
+unless it is given a `SubBars` source: then, for those bars only, it
+reads the aligned 1m candles and walks them in time order.
+
+Only ambiguous bars touch the sub-bars. From a HistoricalStore each
+one reads just its own window of the 1m file (HistoricalStore.load_range:
+a binary search over the sorted CSV), so the cost scales with the number
+of ambiguous bars, not with the length of the 1m history. Frames passed
+in directly are sliced in memory.
+"""
+
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..data.historical_store import HistoricalStore
+from .event_engine import EXIT_STOP, EXIT_TARGET
+
+
+def resolve_fill(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    stop: float,
+    target: float
+) -> Optional[Tuple[int, float]]:
+    """
+    First level touched by a long position across sub-bars, in order.
+
+    A sub-bar that opens beyond a level fills there at its open. If one
+    sub-bar reaches both levels, the stop is taken (its own order is
+    unknown too).
+
+    Args:
+        open_, high, low: Sub-bar prices, oldest first
+        stop: Stop price (exit when low <= stop)
+        target: Exit trigger (exit when high >= target)
+
+    Returns:
+        (EXIT_STOP or EXIT_TARGET, fill price before slippage), or None if
+        no sub-bar reaches either level (missing or inconsistent data)
+    """
+    for o, h, lo in zip(open_, high, low):
+        if o <= stop:
+            return EXIT_STOP, o
+        if o >= target:
+            return EXIT_TARGET, o
+        if lo <= stop:
+            return EXIT_STOP, stop
+        if h >= target:
+            return EXIT_TARGET, target
+    return None
+
+
+class SubBars:
+    """
+    Lazily loaded lower-timeframe candles.
+
+    Args:
+        source: HistoricalStore to read `timeframe` files from, or
+            symbol -> candle frame (timestamp in ms, OHLC)
+        timeframe: Sub-bar timeframe in the store
+    """
+
+    def __init__(self, source: Union[HistoricalStore, Dict[str, pd.DataFrame]], timeframe: str = "1m"):
+        self.source = source
+        self.timeframe = timeframe
+        self.lookups = 0
+        self._frames: Dict[str, Optional[tuple]] = {}
+
+    def _arrays(self, symbol: str) -> Optional[tuple]:
+        """In-memory (timestamp, open, high, low) arrays of a dict source."""
+        if symbol not in self._frames:
+            df = self.source.get(symbol)
+            self._frames[symbol] = None if df is None else tuple(
+                df[col].to_numpy(dtype=np.int64 if col == "timestamp" else np.float64)
+                for col in ("timestamp", "open", "high", "low")
+            )
+        return self._frames[symbol]
+
+    def window(self, symbol: str, start_ms: int, end_ms: int) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """(open, high, low) of the sub-bars in [start_ms, end_ms), or None without data."""
+        if isinstance(self.source, HistoricalStore):
+            if not self.source.has(symbol, self.timeframe):
+                return None
+            self.lookups += 1
+            df = self.source.load_range(symbol, self.timeframe, start_ms, end_ms - 1)
+            if df.empty:
+                return None
+            return tuple(df[col].to_numpy(dtype=np.float64) for col in ("open", "high", "low"))
+
+        arrays = self._arrays(symbol)
+        if arrays is None:
+            return None
+        self.lookups += 1
+        ts, open_, high, low = arrays
+        lo, hi = np.searchsorted(ts, [start_ms, end_ms], side="left")
+        if lo == hi:
+            return None
+        return open_[lo:hi], high[lo:hi], low[lo:hi]
+
+    def resolve(self, symbol: str, start_ms: int, end_ms: int, stop: float,
+                target: float) -> Optional[Tuple[int, float]]:
+        """resolve_fill over the sub-bars of one bar, or None if they cannot decide."""
+        window = self.window(symbol, start_ms, end_ms)
+        return resolve_fill(*window, stop, target) if window is not None else None
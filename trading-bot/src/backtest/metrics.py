@@ -0,0 +1,137 @@
+"""
+VAYU Trading Bot - Optimization Metrics
+=======================================
+The handful of metrics the parameter search ranks on, computed straight
+from equity and trade arrays for many columns at once.
+
+`pf.stats()` builds a report of ~25 metrics per column (benchmark,
+exposure, durations, ratios) and the optimizer reads six of them. Here
+each metric is one vectorized numpy expression over a (bars, columns)
+value array and the flat trade records, following vectorbt's
+definitions:
+
+- total_return  [%]  value[-1] / init_cash - 1
+- sharpe_ratio       mean / std (ddof=1) of bar returns x sqrt(ann_factor),
+                     the first return taken against init_cash; inf when
+                     the std is 0
+- max_drawdown  [%]  largest fall of value below its running peak (NaN
+                     when value never falls)
+- trades             all trades, open ones included
+- win_rate      [%]  closed trades with pnl > 0 / closed trades
+- profit_factor      gross profit / gross loss of closed trades (inf
+                     with no losses, NaN with no closed trades)
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+METRICS = ('total_return', 'sharpe_ratio', 'max_drawdown', 'trades', 'win_rate', 'profit_factor')
+
+
+def annualization_factor(freq: Union[str, pd.Timedelta], year_freq: Union[str, pd.Timedelta] = "365 days") -> float:
+    """Bars per year for bar frequency `freq` (vectorbt's ann_factor)."""
+    return pd.Timedelta(year_freq) / pd.Timedelta(freq)
+
+
+def compute_metrics(
+    value: np.ndarray,
+    init_cash: Union[float, np.ndarray],
+    trade_col: np.ndarray,
+    trade_pnl: np.ndarray,
+    trade_closed: np.ndarray,
+    ann_factor: float,
+    metrics: Sequence[str] = METRICS
+) -> Dict[str, np.ndarray]:
+    """
+    Requested metrics for every column.
+
+    Args:
+        value: (bars, columns) portfolio value
+        init_cash: Starting cash, scalar or per column
+        trade_col: Column of each trade record
+        trade_pnl: PnL of each trade record
+        trade_closed: True for closed trades
+        ann_factor: Bars per year, for the Sharpe ratio
+        metrics: Subset of METRICS to compute
+
+    Returns:
+        Dict of metric name -> (columns,) array
+    """
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics {sorted(unknown)} (available: {METRICS})")
+
+    value = np.asarray(value, dtype=np.float64)
+    if value.ndim == 1:
+        value = value[:, None]
+    n_cols = value.shape[1]
+    init_cash = np.broadcast_to(np.asarray(init_cash, dtype=np.float64), (n_cols,))
+    out = {}
+
+    if 'total_return' in metrics:
+        out['total_return'] = (value[-1] / init_cash - 1.0) * 100
+
+    if 'sharpe_ratio' in metrics:
+        prev = np.vstack([init_cash[None, :], value[:-1]])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = (value - prev) / prev
+            std = returns.std(axis=0, ddof=1) if len(value) > 1 else np.full(n_cols, np.nan)
+            sharpe = returns.mean(axis=0) / std * np.sqrt(ann_factor)
+        sharpe[std == 0.0] = np.inf
+        out['sharpe_ratio'] = sharpe
+
+    if 'max_drawdown' in metrics:
+        peak = np.maximum.accumulate(value, axis=0)
+        max_dd = (1.0 - (value / peak).min(axis=0)) * 100
+        max_dd[max_dd == 0.0] = np.nan
+        out['max_drawdown'] = max_dd
+
+    if {'trades', 'win_rate', 'profit_factor'} & set(metrics):
+        trade_col = np.asarray(trade_col, dtype=np.int64)
+        trade_pnl = np.asarray(trade_pnl, dtype=np.float64)
+        closed = np.asarray(trade_closed, dtype=bool)
+
+        if 'trades' in metrics:
+            out['trades'] = np.bincount(trade_col, minlength=n_cols)
+
+        col, pnl = trade_col[closed], trade_pnl[closed]
+        n_closed = np.bincount(col, minlength=n_cols)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if 'win_rate' in metrics:
+                out['win_rate'] = np.bincount(col, pnl > 0, minlength=n_cols) / n_closed * 100
+            if 'profit_factor' in metrics:
+                gross_win = np.bincount(col, np.where(pnl > 0, pnl, 0.0), minlength=n_cols)
+                gross_loss = np.bincount(col, np.where(pnl < 0, -pnl, 0.0), minlength=n_cols)
+                factor = gross_win / gross_loss
+                factor[n_closed == 0] = np.nan
+                out['profit_factor'] = factor
+
+    return {name: out[name] for name in metrics}
+
+
+def portfolio_metrics(portfolio, metrics: Sequence[str] = METRICS,
+                      year_freq: Optional[str] = None) -> pd.DataFrame:
+    """
+    compute_metrics for a vectorbt Portfolio, one row per column.
+
+    Reads only the value array and the raw trade records.
+    """
+    wrapper = portfolio.wrapper
+    if year_freq is None:
+        import vectorbt as vbt
+        year_freq = vbt.settings.returns['year_freq']
+
+    trades = portfolio.trades.records_arr
+    values = compute_metrics(
+        portfolio.value().to_numpy(),
+        np.asarray(portfolio.init_cash),
+        trades['col'],
+        trades['pnl'],
+        trades['status'] == 1,   # TradeStatus.Closed
+        annualization_factor(wrapper.freq, year_freq),
+        metrics
+    )
+    index = wrapper.columns if wrapper.ndim == 2 else pd.RangeIndex(1)
+    return pd.DataFrame(values, index=index)
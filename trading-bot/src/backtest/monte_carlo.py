@@ -0,0 +1,266 @@
+"""
+VAYU Trading Bot - Monte Carlo Robustness
+=========================================
+Resampling tests for a backtest's trade (or bar) return sequence.
+
+One backtest is one path through the returns it produced. Resampling
+that sequence shows how much of the result depends on luck of ordering
+and on the particular trades drawn:
+
+- shuffle: random trade orders. The compounded final return is
+  unchanged; the drawdown distribution shows how deep the same trades
+  could have gone in a worse order.
+- bootstrap: moving-block bootstrap with replacement (block_size=1 is
+  the plain i.i.d. bootstrap; longer blocks keep serial correlation of
+  per-bar returns).
+- perturb: each return plus Gaussian noise scaled to the sample's
+  standard deviation, and optionally dropped (missed fills).
+
+Resamples are built as (chunk, n) arrays and evaluated in one pass per
+row (numba when installed, else cumprod / running-max numpy passes), so
+peak memory is bounded by the chunk size. Chunks draw from
+independent child seeds of one SeedSequence, which makes results
+identical whether they run serially or on worker processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+METHODS = ("shuffle", "bootstrap", "perturb")
+
+
+@dataclass
+class MonteCarloResult:
+    """Distribution of outcomes over the resampled paths (fractions, not %)."""
+    method: str
+    total_returns: np.ndarray      # (n_resamples,) compounded return of each path
+    max_drawdowns: np.ndarray      # (n_resamples,) largest peak-to-trough fall of each path
+    observed_return: float
+    observed_drawdown: float
+
+    @property
+    def n_resamples(self) -> int:
+        return len(self.total_returns)
+
+    @property
+    def prob_loss(self) -> float:
+        """Share of paths ending below the starting equity."""
+        return float(np.mean(self.total_returns < 0.0))
+
+    def drawdown_at_risk(self, confidence: float = 0.95) -> float:
+        """Max drawdown not exceeded in `confidence` of the paths."""
+        return float(np.quantile(self.max_drawdowns, confidence))
+
+    def summary(self, quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> pd.DataFrame:
+        """Quantiles of total return and max drawdown, next to the observed path."""
+        df = pd.DataFrame({
+            "total_return": np.quantile(self.total_returns, quantiles),
+            "max_drawdown": np.quantile(self.max_drawdowns, quantiles)
+        }, index=[f"p{q * 100:g}" for q in quantiles])
+        df.loc["observed"] = [self.observed_return, self.observed_drawdown]
+        return df
+
+
+def path_stats(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Total return and max drawdown of each row of compounded returns.
+
+    Args:
+        returns: (paths, n) simple returns per trade or bar
+
+    Returns:
+        (total_returns, max_drawdowns), each (paths,)
+    """
+    returns = np.atleast_2d(returns)
+    if returns.shape[1] == 0:
+        zeros = np.zeros(returns.shape[0])
+        return zeros, zeros.copy()
+    if NUMBA_AVAILABLE:
+        return _path_stats_nb(np.ascontiguousarray(returns, dtype=np.float64))
+    equity = np.cumprod(1.0 + returns, axis=1)
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, 1.0, out=peak)              # the starting equity is a peak too
+    np.divide(equity, peak, out=peak)
+    return equity[:, -1] - 1.0, 1.0 - peak.min(axis=1)
+
+
+def _path_stats_loop(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """path_stats as a single fused pass per row."""
+    n_paths, n = returns.shape
+    total = np.empty(n_paths)
+    max_dd = np.empty(n_paths)
+    for i in range(n_paths):
+        equity = 1.0
+        peak = 1.0
+        worst = 0.0
+        for t in range(n):
+            equity *= 1.0 + returns[i, t]
+            if equity > peak:
+                peak = equity
+            elif 1.0 - equity / peak > worst:
+                worst = 1.0 - equity / peak
+        total[i] = equity - 1.0
+        max_dd[i] = worst
+    return total, max_dd
+
+
+if NUMBA_AVAILABLE:
+    _path_stats_nb = njit(cache=True, nogil=True)(_path_stats_loop)
+
+
+def trade_returns(trades: Union[pd.DataFrame, pd.Series, np.ndarray],
+                  initial_capital: float) -> np.ndarray:
+    """
+    Trade PnLs as returns on the equity before each trade.
+
+    Trades are taken in list order, one after another, so overlapping
+    positions are treated as sequential.
+
+    Args:
+        trades: Trade PnLs in account currency, or a frame with a `pnl`
+            column (EventBacktestResult.trades)
+        initial_capital: Starting balance
+    """
+    pnl = trades["pnl"] if isinstance(trades, pd.DataFrame) else trades
+    pnl = np.asarray(pnl, dtype=np.float64)
+    equity_before = initial_capital + np.concatenate(([0.0], np.cumsum(pnl)[:-1]))
+    return pnl / equity_before
+
+
+def _resample(returns: np.ndarray, method: str, n_paths: int, rng: np.random.Generator,
+              block_size: int, noise: float, drop: float) -> np.ndarray:
+    """(n_paths, n) resampled return sequences."""
+    n = len(returns)
+    if method == "shuffle":
+        return rng.permuted(np.broadcast_to(returns, (n_paths, n)), axis=1)
+    if method == "bootstrap":
+        block_size = min(block_size, n)
+        n_blocks = -(-n // block_size)
+        starts = rng.integers(0, n - block_size + 1, size=(n_paths, n_blocks))
+        idx = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :n]
+        return returns[idx]
+    if method == "perturb":
+        out = returns + rng.standard_normal((n_paths, n)) * (noise * returns.std())
+        if drop > 0.0:
+            out[rng.random((n_paths, n)) < drop] = 0.0
+        return out
+    raise ValueError(f"Unknown method {method!r} (expected one of {METHODS})")
+
+
+def _run_chunk(task: Tuple) -> Tuple[np.ndarray, np.ndarray]:
+    returns, method, n_paths, seed, block_size, noise, drop = task
+    rng = np.random.default_rng(seed)
+    return path_stats(_resample(returns, method, n_paths, rng, block_size, noise, drop))
+
+
+class MonteCarloSimulator:
+    """
+    Resampling robustness tests over one return sequence.
+
+    Args:
+        returns: Per-trade or per-bar simple returns (fractions of equity)
+        seed: Seed for reproducible resamples
+        chunk_size: Paths per chunk; peak memory is a few
+            chunk_size x len(returns) float64 arrays
+        n_jobs: Worker processes for the chunks; 1 runs serially, None
+            or -1 uses every core
+    """
+
+    def __init__(
+        self,
+        returns: Union[np.ndarray, pd.Series, Sequence[float]],
+        seed: Optional[int] = 42,
+        chunk_size: int = 10_000,
+        n_jobs: int = 1
+    ):
+        self.returns = np.asarray(returns, dtype=np.float64)
+        if self.returns.ndim != 1:
+            raise ValueError("returns must be one-dimensional")
+        if len(self.returns) == 0:
+            raise ValueError("returns are empty (no trades or bars to resample)")
+        if np.isnan(self.returns).any():
+            raise ValueError("returns contain NaN")
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs
+
+    @classmethod
+    def from_trades(cls, trades: Union[pd.DataFrame, pd.Series, np.ndarray],
+                    initial_capital: float, **kwargs) -> "MonteCarloSimulator":
+        """Simulator over a trade list's PnLs (see trade_returns)."""
+        return cls(trade_returns(trades, initial_capital), **kwargs)
+
+    def shuffle(self, n_resamples: int = 10_000) -> MonteCarloResult:
+        """Random reorderings of the returns."""
+        return self.run("shuffle", n_resamples)
+
+    def bootstrap(self, n_resamples: int = 10_000, block_size: int = 1) -> MonteCarloResult:
+        """Draws with replacement in blocks of `block_size` consecutive returns."""
+        return self.run("bootstrap", n_resamples, block_size=block_size)
+
+    def perturb(self, n_resamples: int = 10_000, noise: float = 0.1, drop: float = 0.0) -> MonteCarloResult:
+        """Returns plus N(0, noise x std) noise, each dropped with probability `drop`."""
+        return self.run("perturb", n_resamples, noise=noise, drop=drop)
+
+    def run(
+        self,
+        method: str,
+        n_resamples: int = 10_000,
+        block_size: int = 1,
+        noise: float = 0.1,
+        drop: float = 0.0
+    ) -> MonteCarloResult:
+        """
+        Resample `n_resamples` paths with `method` and collect their stats.
+
+        Args:
+            method: "shuffle", "bootstrap" or "perturb"
+            n_resamples: Number of paths
+            block_size: Bootstrap block length
+            noise: Perturbation scale, in standard deviations of the returns
+            drop: Perturbation probability of zeroing a return
+
+        Returns:
+            MonteCarloResult
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r} (expected one of {METHODS})")
+        if n_resamples < 1:
+            raise ValueError("n_resamples must be >= 1")
+        if block_size < 1:
+            raise ValueError("block_size must be >= 1")
+
+        sizes = [min(self.chunk_size, n_resamples - start) for start in range(0, n_resamples, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+        tasks = [(self.returns, method, size, seed, block_size, noise, drop) for size, seed in zip(sizes, seeds)]
+
+        n_jobs = self.n_jobs
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, len(tasks))
+
+        if n_jobs <= 1:
+            parts = [_run_chunk(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                parts = list(pool.map(_run_chunk, tasks))
+
+        observed_return, observed_drawdown = path_stats(self.returns)
+        return MonteCarloResult(
+            method=method,
+            total_returns=np.concatenate([p[0] for p in parts]) if parts else np.empty(0),
+            max_drawdowns=np.concatenate([p[1] for p in parts]) if parts else np.empty(0),
+            observed_return=float(observed_return[0]),
+            observed_drawdown=float(observed_drawdown[0])
+        )
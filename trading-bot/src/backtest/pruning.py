@@ -0,0 +1,81 @@
+"""
+VAYU Trading Bot - Sweep Pruning Rules
+======================================
+Rules for dropping hopeless parameter sets part-way through a sweep.
+
+A segmented sweep (VAYUBacktester.optimize_parameters(pruning=...))
+simulates the grid up to each checkpoint, scores every column on the
+bars so far, and stops simulating the columns these rules reject:
+
+- max_drawdown: running max drawdown beyond this [%]
+- min_trades:   fewer trades than this by the checkpoint (one value,
+                or one per checkpoint); off by default, since strict
+                thresholds that trade rarely and late can still win
+- sharpe_gap:   running Sharpe more than this below the median
+                running Sharpe of the columns still alive
+
+Rules are heuristics: a pruned column could in principle have
+recovered. The defaults only reject deep drawdowns and columns far
+below the running leaders, so the winner usually matches the full
+sweep; tighter thresholds trade that for speed.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+
+@dataclass
+class PruningRules:
+    """Checkpoints (fractions of the window) and the rules applied at each."""
+    checkpoints: Sequence[float] = (0.25, 0.5)
+    max_drawdown: Optional[float] = 60.0
+    min_trades: Union[int, Sequence[int], None] = None
+    sharpe_gap: Optional[float] = 3.0
+    min_survivors: int = 1
+
+    def __post_init__(self):
+        if any(not 0 < f < 1 for f in self.checkpoints):
+            raise ValueError("checkpoints must be fractions in (0, 1)")
+        self.checkpoints = tuple(sorted(self.checkpoints))
+        if self.min_trades is not None and not np.isscalar(self.min_trades) \
+                and len(self.min_trades) != len(self.checkpoints):
+            raise ValueError("min_trades needs one value per checkpoint")
+
+    def prune(self, metrics: Dict[str, np.ndarray], checkpoint: int) -> np.ndarray:
+        """
+        Columns to drop at a checkpoint.
+
+        Args:
+            metrics: compute_metrics output on the bars so far
+                (max_drawdown, trades and sharpe_ratio are read)
+            checkpoint: Index into self.checkpoints
+
+        Returns:
+            Boolean mask, True for columns to prune
+        """
+        sharpe = np.asarray(metrics['sharpe_ratio'], dtype=np.float64)
+        drop = np.zeros(len(sharpe), dtype=bool)
+
+        if self.max_drawdown is not None:
+            # NaN drawdown: value never fell
+            drop |= np.nan_to_num(metrics['max_drawdown'], nan=0.0) > self.max_drawdown
+
+        if self.min_trades is not None:
+            needed = self.min_trades if np.isscalar(self.min_trades) else self.min_trades[checkpoint]
+            drop |= np.asarray(metrics['trades']) < needed
+
+        if self.sharpe_gap is not None:
+            # Median over columns still alive that have a finite Sharpe
+            alive = sharpe[~drop & np.isfinite(sharpe)]
+            if len(alive):
+                with np.errstate(invalid='ignore'):
+                    drop |= sharpe < np.median(alive) - self.sharpe_gap
+
+        n_keep = min(self.min_survivors, len(drop))
+        if (~drop).sum() < n_keep:
+            # Readmit the best running Sharpe ratios
+            ranked = np.argsort(-np.nan_to_num(sharpe, nan=-np.inf), kind='stable')
+            drop[ranked[:n_keep]] = False
+        return drop
@@ -0,0 +1,233 @@
+"""
+VAYU Trading Bot - Downsampled Backtest Reports
+===============================================
+Equity, drawdown and price charts for long results, rendered from a
+few thousand points instead of every bar.
+
+A chart is a couple of thousand pixels wide, so a 10M-bar 1m backtest
+sends thousands of points per pixel to plotly for nothing. Series are
+reduced before any figure object is built:
+
+- equity and price: largest-triangle-three-buckets (LTTB), which keeps
+  the points that shape the line; the peak and trough of the maximum
+  drawdown are always kept
+- drawdown: min/max decimation, which keeps every bucket's deepest and
+  shallowest value, so the extremes are exact
+
+The reductions are single passes over numpy arrays (numba when
+installed), so memory stays at a few input-length arrays.
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+DEFAULT_POINTS = 2000      # ~one point per pixel of a wide chart
+
+
+def _lttb(x, y, n_out):
+    n = len(x)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket (the last point for the final one)
+        start = int(np.floor((i + 1) * every)) + 1
+        end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for k in range(start, end):
+            avg_x += x[k]
+            avg_y += y[k]
+        avg_x /= end - start
+        avg_y /= end - start
+
+        # Point of this bucket with the largest triangle against a and the average
+        lo = int(np.floor(i * every)) + 1
+        hi = int(np.floor((i + 1) * every)) + 1
+        best = lo
+        best_area = -1.0
+        for k in range(lo, hi):
+            area = abs((x[a] - avg_x) * (y[k] - y[a]) - (x[a] - x[k]) * (avg_y - y[a]))
+            if area > best_area:
+                best_area = area
+                best = k
+        out[i + 1] = best
+        a = best
+    return out
+
+
+def _minmax(y, n_buckets):
+    n = len(y)
+    out = np.empty(2 * n_buckets, dtype=np.int64)
+    for b in range(n_buckets):
+        lo = b * n // n_buckets
+        hi = (b + 1) * n // n_buckets
+        i_min = lo
+        i_max = lo
+        for k in range(lo + 1, hi):
+            if y[k] < y[i_min]:
+                i_min = k
+            if y[k] > y[i_max]:
+                i_max = k
+        out[2 * b] = min(i_min, i_max)
+        out[2 * b + 1] = max(i_min, i_max)
+    return out
+
+
+if NUMBA_AVAILABLE:
+    _lttb_nb = njit(cache=True, nogil=True)(_lttb)
+    _minmax_nb = njit(cache=True, nogil=True)(_minmax)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the n_out points LTTB keeps (first and last included).
+
+    Args:
+        x: Increasing x values (bar numbers or epoch times)
+        y: Values, without NaN
+        n_out: Points to keep
+    """
+    n = len(y)
+    if n_out >= n or n < 3:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("n_out must be >= 3")
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    return (_lttb_nb if NUMBA_AVAILABLE else _lttb)(x, y, int(n_out))
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of each bucket's min and max, about n_out in all, in order."""
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = max(1, n_out // 2)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    idx = (_minmax_nb if NUMBA_AVAILABLE else _minmax)(y, n_buckets)
+    return np.unique(np.concatenate([idx, [0, n - 1]]))
+
+
+def downsample(
+    series: pd.Series,
+    n_out: int = DEFAULT_POINTS,
+    method: str = "lttb",
+    keep: Optional[Sequence[int]] = None
+) -> pd.Series:
+    """
+    A series reduced to about n_out points.
+
+    Args:
+        series: Values over a (datetime) index; NaN rows are dropped
+        n_out: Target number of points
+        method: "lttb" or "minmax"
+        keep: Positions (in the NaN-free series) always kept
+
+    Returns:
+        The kept rows of the series, in order
+    """
+    series = series.dropna()
+    y = series.to_numpy(dtype=np.float64)
+    if method == "lttb":
+        index = series.index
+        x = index.asi8.astype(np.float64) if isinstance(index, pd.DatetimeIndex) else np.arange(len(y), dtype=np.float64)
+        idx = lttb_indices(x, y, n_out)
+    elif method == "minmax":
+        idx = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"Unknown method {method!r} (expected 'lttb' or 'minmax')")
+    if keep is not None and len(keep):
+        idx = np.union1d(idx, np.asarray(keep, dtype=np.int64))
+    return series.iloc[idx]
+
+
+def drawdown(equity: pd.Series) -> pd.Series:
+    """Fall below the running peak as a (negative) fraction."""
+    values = equity.to_numpy(dtype=np.float64)
+    peak = np.fmax.accumulate(values)
+    return pd.Series(values / peak - 1.0, index=equity.index, name="drawdown")
+
+
+def report_figure(
+    equity: pd.Series,
+    price: Optional[Union[pd.Series, pd.DataFrame]] = None,
+    n_points: int = DEFAULT_POINTS,
+    method: str = "lttb",
+    title: str = "Backtest"
+):
+    """
+    Plotly figure of price (optional), equity and drawdown, downsampled.
+
+    Args:
+        equity: Portfolio value per bar
+        price: Close per bar, one column per symbol
+        n_points: Points per trace
+        method: Reduction for equity and price ("lttb" or "minmax");
+            drawdown always uses min/max
+        title: Figure title
+
+    Returns:
+        plotly.graph_objects.Figure
+
+    Raises:
+        ValueError: if equity is empty or all NaN
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    equity = equity.dropna()
+    if equity.empty:
+        raise ValueError("equity has no values to plot (empty or all NaN)")
+    dd = drawdown(equity)
+    trough = int(np.argmin(dd.to_numpy()))
+    peak = int(np.argmax(equity.to_numpy()[:trough + 1]))
+
+    rows = ["Equity", "Drawdown"] if price is None else ["Price", "Equity", "Drawdown"]
+    fig = make_subplots(rows=len(rows), cols=1, shared_xaxes=True, vertical_spacing=0.04,
+                        subplot_titles=rows, row_heights=[1.0] * (len(rows) - 1) + [0.6])
+
+    if price is not None:
+        frame = price.to_frame() if isinstance(price, pd.Series) else price
+        for col in frame.columns:
+            s = downsample(frame[col], n_points, method)
+            fig.add_trace(go.Scatter(x=s.index, y=s.to_numpy(), mode="lines", name=str(col)), row=1, col=1)
+
+    s = downsample(equity, n_points, method, keep=[peak, trough])
+    fig.add_trace(go.Scatter(x=s.index, y=s.to_numpy(), mode="lines", name="Equity"), row=len(rows) - 1, col=1)
+
+    s = downsample(dd, n_points, "minmax")
+    fig.add_trace(go.Scatter(x=s.index, y=s.to_numpy() * 100, mode="lines", name="Drawdown [%]",
+                             fill="tozeroy", line=dict(color="crimson")), row=len(rows), col=1)
+    fig.add_annotation(x=dd.index[trough], y=dd.iloc[trough] * 100, text=f"Max DD {dd.iloc[trough]:.1%}",
+                       row=len(rows), col=1, showarrow=True)
+
+    fig.update_layout(title=title, height=300 * len(rows), showlegend=True)
+    return fig
+
+
+def write_report(fig, output_path: str, include_plotlyjs: Union[bool, str] = "cdn"):
+    """
+    Save a report figure as HTML, or as an image for .png/.svg/.pdf
+    (which needs plotly's kaleido package).
+
+    Args:
+        fig: Figure from report_figure
+        output_path: Destination file
+        include_plotlyjs: For HTML: "cdn" keeps the file small, True
+            embeds plotly.js (~3.5 MB) for offline viewing
+    """
+    if str(output_path).lower().endswith((".html", ".htm")):
+        fig.write_html(output_path, include_plotlyjs=include_plotlyjs)
+    else:
+        fig.write_image(output_path)
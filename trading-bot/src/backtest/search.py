@@ -0,0 +1,272 @@
+"""
+VAYU Trading Bot - Adaptive Parameter Search
+============================================
+Search drivers for parameter spaces too large to grid exhaustively.
+
+A space is a dict of parameter name -> candidate values (ranges or
+lists), e.g. {"rsi_period": range(7, 29), "ema_period": range(50, 301, 25)}.
+An objective is any picklable callable `objective(params, fidelity)`
+returning a score to maximize; `fidelity` in (0, 1] is the share of the
+full evaluation to spend (for backtests: the most recent fraction of
+the history). NaN scores rank last.
+
+- SuccessiveHalving: sample many candidates, score them all at low
+  fidelity, keep the best 1/eta, raise fidelity by eta, repeat until
+  the survivors are scored at full fidelity.
+- TPESearch: Tree-structured Parzen Estimator. After random start-up
+  trials, split the scored trials into good (top gamma) and bad; draw
+  candidates from a kernel density over the good trials and evaluate
+  the one maximizing l(x) / g(x). Each parameter is modelled
+  independently over the index of its candidate values.
+
+Both evaluate in batches, on a process pool when n_jobs > 1; for a
+given seed (and TPE batch_size) results do not depend on n_jobs.
+"""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import math
+import os
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+Objective = Callable[[Dict, float], float]
+
+
+@dataclass
+class SearchResult:
+    """Best parameters found and every evaluation made on the way."""
+    best_params: Dict
+    best_score: float
+    history: pd.DataFrame        # one row per evaluation: params, fidelity, score, round
+
+    @property
+    def n_evaluations(self) -> int:
+        return len(self.history)
+
+    @property
+    def n_full_evaluations(self) -> int:
+        return int((self.history["fidelity"] >= 1.0).sum())
+
+    @property
+    def cost(self) -> float:
+        """Total work in full-evaluation equivalents (sum of fidelities)."""
+        return float(self.history["fidelity"].sum())
+
+
+def _evaluate(task):
+    objective, params, fidelity = task
+    score = float(objective(params, fidelity))
+    return score if not math.isnan(score) else -math.inf
+
+
+class _SearchBase(ABC):
+    def __init__(self, space: Mapping[str, Sequence], objective: Objective,
+                 seed: Optional[int] = 42, n_jobs: int = 1):
+        if not space:
+            raise ValueError("space must define at least one parameter")
+        self.space = {name: list(values) for name, values in space.items()}
+        for name, values in self.space.items():
+            if not values:
+                raise ValueError(f"Parameter {name!r} has no candidate values")
+        self.objective = objective
+        self.rng = np.random.default_rng(seed)
+        self.n_jobs = n_jobs
+        self._records: List[Dict] = []
+        self._best = (-math.inf, None)
+
+    @property
+    def space_size(self) -> int:
+        return int(np.prod([len(v) for v in self.space.values()]))
+
+    def _params(self, indices: Sequence[int]) -> Dict:
+        return {name: self.space[name][i] for name, i in zip(self.space, indices)}
+
+    def _evaluate(self, candidates: List[tuple], fidelity: float, round_num: int,
+                  pool: Optional[ProcessPoolExecutor]) -> List[float]:
+        """Score candidate index tuples at `fidelity`, recording each evaluation."""
+        tasks = [(self.objective, self._params(c), fidelity) for c in candidates]
+        scores = list(pool.map(_evaluate, tasks)) if pool is not None else [_evaluate(t) for t in tasks]
+        for (_, params, _), score in zip(tasks, scores):
+            self._records.append({**params, "fidelity": fidelity, "score": score, "round": round_num})
+            if fidelity >= 1.0 and (self._best[1] is None or score > self._best[0]):
+                self._best = (score, params)
+        return scores
+
+    def _pool(self) -> Optional[ProcessPoolExecutor]:
+        n_jobs = self.n_jobs
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        return ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+
+    def run(self) -> SearchResult:
+        self._records = []
+        self._best = (-math.inf, None)
+        pool = self._pool()
+        try:
+            self._search(pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        score, params = self._best
+        return SearchResult(best_params=params, best_score=score, history=pd.DataFrame(self._records))
+
+    @abstractmethod
+    def _search(self, pool):
+        """Evaluate candidates until the budget is spent."""
+
+
+class SuccessiveHalving(_SearchBase):
+    """
+    Successive halving over randomly sampled candidates.
+
+    Args:
+        space: Parameter name -> candidate values
+        objective: objective(params, fidelity) -> score to maximize
+        n_candidates: Candidates scored in the first round (capped at
+            the size of the space)
+        eta: Keep the best 1/eta per round and multiply fidelity by eta
+        min_fidelity: Fidelity of the first round
+        seed: Sampling seed
+        n_jobs: Worker processes; 1 runs serially, None or -1 uses every core
+    """
+
+    def __init__(
+        self,
+        space: Mapping[str, Sequence],
+        objective: Objective,
+        n_candidates: int = 81,
+        eta: int = 3,
+        min_fidelity: float = 1 / 9,
+        seed: Optional[int] = 42,
+        n_jobs: int = 1
+    ):
+        super().__init__(space, objective, seed, n_jobs)
+        if eta < 2:
+            raise ValueError("eta must be >= 2")
+        if not 0 < min_fidelity <= 1:
+            raise ValueError("min_fidelity must be in (0, 1]")
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_fidelity = min_fidelity
+
+    def _sample(self) -> List[tuple]:
+        """Distinct candidates, drawn uniformly without replacement."""
+        shape = [len(v) for v in self.space.values()]
+        n = min(self.n_candidates, self.space_size)
+        flat = self.rng.choice(self.space_size, size=n, replace=False)
+        return [tuple(int(i) for i in idx) for idx in zip(*np.unravel_index(flat, shape))]
+
+    def _search(self, pool):
+        candidates = self._sample()
+        fidelity = self.min_fidelity
+        round_num = 0
+        while True:
+            scores = self._evaluate(candidates, fidelity, round_num, pool)
+            if fidelity >= 1.0 or len(candidates) == 1:
+                if fidelity < 1.0:
+                    self._evaluate(candidates, 1.0, round_num + 1, pool)
+                return
+            keep = max(1, len(candidates) // self.eta)
+            # Stable sort: ties keep sampling order
+            order = np.argsort(-np.asarray(scores), kind="stable")[:keep]
+            candidates = [candidates[i] for i in order]
+            round_num += 1
+            fidelity = self.min_fidelity * self.eta ** round_num
+            if fidelity > 1.0 - 1e-9:
+                fidelity = 1.0
+
+
+class TPESearch(_SearchBase):
+    """
+    Tree-structured Parzen Estimator search at full fidelity.
+
+    Args:
+        space: Parameter name -> candidate values
+        objective: objective(params, fidelity) -> score to maximize
+        n_trials: Total evaluations
+        n_startup: Random trials before the model is used
+        gamma: Share of trials treated as good
+        n_ei_candidates: Draws from l(x) ranked per proposal
+        batch_size: Proposals per round (defaults to the worker count)
+        seed: Sampling seed
+        n_jobs: Worker processes; 1 runs serially, None or -1 uses every core
+    """
+
+    def __init__(
+        self,
+        space: Mapping[str, Sequence],
+        objective: Objective,
+        n_trials: int = 50,
+        n_startup: int = 10,
+        gamma: float = 0.25,
+        n_ei_candidates: int = 24,
+        batch_size: Optional[int] = None,
+        seed: Optional[int] = 42,
+        n_jobs: int = 1
+    ):
+        super().__init__(space, objective, seed, n_jobs)
+        self.n_trials = min(n_trials, self.space_size)
+        self.n_startup = n_startup
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+        if batch_size is None:
+            batch_size = n_jobs if n_jobs is not None and n_jobs > 0 else (os.cpu_count() or 1)
+        self.batch_size = batch_size
+
+    def _density(self, observed: np.ndarray, n_values: int) -> np.ndarray:
+        """Parzen density over a parameter's value indices (uniform prior + Gaussian kernels)."""
+        grid = np.arange(n_values)
+        bandwidth = max(1.0, n_values / (len(observed) + 1))
+        weights = np.full(n_values, 1.0 / n_values)
+        if len(observed):
+            kernels = np.exp(-0.5 * ((grid[None, :] - observed[:, None]) / bandwidth) ** 2)
+            kernels /= kernels.sum(axis=1, keepdims=True)
+            weights = (weights + kernels.sum(axis=0)) / (len(observed) + 1)
+        return weights / weights.sum()
+
+    def _propose(self, trials: List[tuple], scores: List[float], seen: set) -> tuple:
+        sizes = [len(v) for v in self.space.values()]
+        if len(trials) < self.n_startup:
+            draws = [tuple(int(self.rng.integers(n)) for n in sizes) for _ in range(self.n_ei_candidates)]
+            ratio = np.zeros(len(draws))
+        else:
+            idx = np.asarray(trials)
+            order = np.argsort(-np.asarray(scores), kind="stable")
+            n_good = max(1, int(math.ceil(self.gamma * len(trials))))
+            good, bad = idx[order[:n_good]], idx[order[n_good:]]
+            draws = [[] for _ in range(self.n_ei_candidates)]
+            ratio = np.zeros(self.n_ei_candidates)
+            for d, n in enumerate(sizes):
+                l_good = self._density(good[:, d], n)
+                g_bad = self._density(bad[:, d], n)
+                picks = self.rng.choice(n, size=self.n_ei_candidates, p=l_good)
+                ratio += np.log(l_good[picks]) - np.log(g_bad[picks])
+                for draw, pick in zip(draws, picks):
+                    draw.append(int(pick))
+            draws = [tuple(d) for d in draws]
+
+        for i in np.argsort(-ratio, kind="stable"):
+            if draws[i] not in seen:
+                return draws[i]
+        # Every draw already evaluated: fall back to any unseen point
+        while True:
+            draw = tuple(int(self.rng.integers(n)) for n in sizes)
+            if draw not in seen:
+                return draw
+
+    def _search(self, pool):
+        trials, scores, seen = [], [], set()
+        round_num = 0
+        while len(trials) < self.n_trials:
+            batch = []
+            for _ in range(min(self.batch_size, self.n_trials - len(trials))):
+                proposal = self._propose(trials, scores, seen)
+                seen.add(proposal)
+                batch.append(proposal)
+            scores.extend(self._evaluate(batch, 1.0, round_num, pool))
+            trials.extend(batch)
+            round_num += 1
@@ -0,0 +1,308 @@
+"""
+VAYU Trading Bot - Historical Data Store
+========================================
+Local OHLCV history for backtests: one CSV per (symbol, timeframe) in
+~/.vayu/backtest_data, as written by backtest/kraken_data_fetcher.py.
+
+Files are named like BTC_USD_1h.csv. The timestamp column may be epoch
+milliseconds or a datetime string (UTC); frames are returned in the
+PriceFeed.fetch_candles shape (timestamp in ms, then OHLCV), oldest
+first and de-duplicated.
+
+`content_hash` / `slice_key` fingerprint stored data (file hash, or a
+hash of just the bars a range covers) without parsing the OHLCV
+columns, so result caches can be keyed on the data cheaply. `load_range` reads a
+short window straight from the file's byte range, for callers that need
+a few slices of a long (e.g. 1m) history.
+"""
+
+import hashlib
+import io
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .price_feed import CandlePanel, build_panel
+
+COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+DateLike = Union[datetime, str, int, None]
+
+
+def _to_ms(value: DateLike) -> Optional[int]:
+    """Epoch milliseconds for a datetime, date string or ms integer."""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return int(ts.value // 1_000_000)
+
+
+class HistoricalStore:
+    """
+    Reader/writer for the local candle CSVs.
+
+    Args:
+        data_dir: Directory holding <BASE>_<QUOTE>_<timeframe>.csv files
+    """
+
+    def __init__(self, data_dir: Union[str, Path] = "~/.vayu/backtest_data"):
+        self.data_dir = Path(data_dir).expanduser()
+        self._fingerprints: Dict[Path, tuple] = {}   # path -> (mtime_ns, size, digest, timestamps, offsets)
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.data_dir / f"{symbol.replace('/', '_')}_{timeframe}.csv"
+
+    def has(self, symbol: str, timeframe: str) -> bool:
+        return self.path(symbol, timeframe).exists()
+
+    def symbols(self, timeframe: str = "1h") -> List[str]:
+        """Symbols with a stored file for `timeframe`."""
+        suffix = f"_{timeframe}.csv"
+        return sorted(
+            p.name[:-len(suffix)].replace("_", "/", 1)
+            for p in self.data_dir.glob(f"*{suffix}")
+        )
+
+    def content_hash(self, symbol: str, timeframe: str) -> str:
+        """
+        SHA-256 of the stored file, re-read only when its mtime or size changes.
+
+        Raises:
+            FileNotFoundError: if the symbol has no stored file
+        """
+        return self._fingerprint(symbol, timeframe)[0]
+
+    def _fingerprint(self, symbol: str, timeframe: str) -> tuple:
+        """
+        (digest, sorted unique ms timestamps, row byte offsets), cached
+        until the file changes. Offsets are None unless the file has one
+        line per row in strictly increasing timestamp order (as save()
+        writes it); then row i is bytes offsets[i]:offsets[i + 1].
+        """
+        path = self.path(symbol, timeframe)
+        st = path.stat()
+        cached = self._fingerprints.get(path)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2:]
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        raw = _timestamps_ms(pd.read_csv(io.BytesIO(data), usecols=["timestamp"])["timestamp"])
+
+        offsets = None
+        newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n"))
+        if np.all(np.diff(raw) > 0) and len(newlines) in (len(raw), len(raw) + 1):
+            offsets = np.concatenate([newlines + 1, [len(data)]])[:len(raw) + 1]
+
+        timestamps = np.unique(raw)
+        self._fingerprints[path] = (st.st_mtime_ns, st.st_size, digest, timestamps, offsets)
+        return digest, timestamps, offsets
+
+    def _rows_digest(self, symbol: str, timeframe: str, start: int, stop: int) -> str:
+        """SHA-256 of stored rows start:stop (in timestamp order)."""
+        _, _, offsets = self._fingerprint(symbol, timeframe)
+        if offsets is not None:
+            with open(self.path(symbol, timeframe), "rb") as f:
+                f.seek(offsets[start])
+                return hashlib.sha256(f.read(offsets[stop] - offsets[start])).hexdigest()
+        # Unsorted or irregular file: hash the normalized rows instead
+        rows = self._read(symbol, timeframe).iloc[start:stop]
+        return hashlib.sha256(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes()).hexdigest()
+
+    def slice_key(
+        self,
+        symbols: List[str],
+        timeframe: str = "1h",
+        since: DateLike = None,
+        until: DateLike = None
+    ) -> Dict[str, object]:
+        """
+        Identity of a load_panel() request: per symbol, a hash of the
+        stored bars inside [since, until] plus their first/last timestamp
+        and count.
+
+        Only those bars are hashed, so appending later bars (or changing
+        bars outside the range) keeps the key, and two requests with
+        different bounds but the same covered bars get the same key.
+        """
+        lo, hi = _to_ms(since), _to_ms(until)
+        files = {}
+        for symbol in symbols:
+            _, ts, _ = self._fingerprint(symbol, timeframe)
+            start = np.searchsorted(ts, lo, side="left") if lo is not None else 0
+            stop = np.searchsorted(ts, hi, side="right") if hi is not None else len(ts)
+            if stop > start:
+                covered = (int(ts[start]), int(ts[stop - 1]), int(stop - start))
+                files[symbol] = [self._rows_digest(symbol, timeframe, start, stop), covered]
+            else:
+                files[symbol] = [None, None]
+        return {"files": files, "timeframe": timeframe}
+
+    def save(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Path:
+        """
+        Write candles, merged with any stored rows (new rows win).
+
+        `df` may carry the timestamp as a column or as its index.
+        """
+        df = _normalize(df)
+        if self.has(symbol, timeframe):
+            df = _normalize(pd.concat([self._read(symbol, timeframe), df]))
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(symbol, timeframe)
+        df.to_csv(path, index=False)
+        return path
+
+    def _read(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            raise FileNotFoundError(
+                f"No stored {timeframe} data for {symbol} at {path} "
+                f"(fetch it with backtest/kraken_data_fetcher.py)"
+            )
+        # round_trip: re-saving merged files must not perturb the stored floats
+        return _normalize(pd.read_csv(path, float_precision="round_trip"))
+
+    def load(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        since: DateLike = None,
+        until: DateLike = None
+    ) -> pd.DataFrame:
+        """
+        Stored candles for one symbol, optionally limited to [since, until].
+
+        Raises:
+            FileNotFoundError: if the symbol has no stored file
+        """
+        df = self._read(symbol, timeframe)
+        ts = df["timestamp"].to_numpy()
+        lo, hi = _to_ms(since), _to_ms(until)
+        start = np.searchsorted(ts, lo, side="left") if lo is not None else 0
+        stop = np.searchsorted(ts, hi, side="right") if hi is not None else len(ts)
+        return df.iloc[start:stop].reset_index(drop=True)
+
+    def load_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: DateLike,
+        until: DateLike
+    ) -> pd.DataFrame:
+        """
+        Stored candles in [since, until], read from their byte range only.
+
+        Line offsets are binary-searched on the timestamp column, so a
+        window costs O(log rows) short reads instead of parsing the whole
+        file. Needs rows sorted by timestamp, as save() writes them; a
+        window that reads back unsorted falls back to load().
+
+        Raises:
+            FileNotFoundError: if the symbol has no stored file
+        """
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            return self.load(symbol, timeframe, since, until)   # Raises with the fetch hint
+
+        with open(path, "rb") as f:
+            header = f.readline()
+            names = header.decode().strip().split(",")
+            if "timestamp" not in names:
+                return self.load(symbol, timeframe, since, until)
+            col = names.index("timestamp")
+            end = f.seek(0, io.SEEK_END)
+            start = _seek_line(f, _to_ms(since), len(header), end, col)
+            stop = _seek_line(f, _to_ms(until) + 1, start, end, col)
+            f.seek(start)
+            chunk = f.read(stop - start)
+
+        if not chunk.strip():
+            return pd.DataFrame({c: pd.Series(dtype=np.int64 if c == "timestamp" else np.float64) for c in COLUMNS})
+        raw = pd.read_csv(io.BytesIO(header + chunk), float_precision="round_trip")
+        if not np.all(np.diff(_timestamps_ms(raw["timestamp"])) > 0):
+            return self.load(symbol, timeframe, since, until)
+        return _normalize(raw)
+
+    def load_many(
+        self,
+        symbols: List[str],
+        timeframe: str = "1h",
+        since: DateLike = None,
+        until: DateLike = None
+    ) -> Dict[str, pd.DataFrame]:
+        return {symbol: self.load(symbol, timeframe, since, until) for symbol in symbols}
+
+    def load_panel(
+        self,
+        symbols: List[str],
+        timeframe: str = "1h",
+        since: DateLike = None,
+        until: DateLike = None,
+        dtype=np.float64
+    ) -> CandlePanel:
+        """Stored candles aligned on the union of timestamps (missing bars NaN)."""
+        return build_panel(self.load_many(symbols, timeframe, since, until), dtype=dtype)
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Candle frame with ms timestamps, sorted, one row per timestamp."""
+    if "timestamp" not in df.columns:
+        df = df.reset_index().rename(columns={df.index.name or "index": "timestamp"})
+    out = pd.DataFrame({"timestamp": _timestamps_ms(df["timestamp"])})
+    for col in COLUMNS[1:]:
+        out[col] = df[col].to_numpy(dtype=np.float64)
+    out = out.drop_duplicates("timestamp", keep="last").sort_values("timestamp", kind="stable")
+    return out.reset_index(drop=True)
+
+
+def _timestamps_ms(ts: pd.Series) -> np.ndarray:
+    """Epoch-ms int64 array from ms integers or datetime strings (UTC)."""
+    if pd.api.types.is_numeric_dtype(ts):
+        return ts.to_numpy(dtype=np.int64)
+    parsed = pd.to_datetime(ts, utc=True).dt.tz_localize(None)
+    return parsed.dt.as_unit("ms").astype(np.int64).to_numpy()
+
+
+def _line_ms(line: bytes, col: int) -> int:
+    """Timestamp (epoch ms) in one CSV line."""
+    field = line.split(b",")[col].strip()
+    try:
+        return int(float(field))
+    except ValueError:
+        return _to_ms(field.decode())
+
+
+def _seek_line(f, target_ms: int, lo: int, hi: int, col: int) -> int:
+    """
+    Offset of the first line in [lo, hi) with timestamp >= target_ms
+    (hi if none). lo must be a line start; rows sorted by timestamp.
+    """
+    while lo < hi:
+        mid = (lo + hi) // 2
+        f.seek(mid - 1)
+        f.readline()
+        start = f.tell()   # First line start >= mid
+        if start >= hi:
+            break          # [mid, hi) is inside one line: scan from lo below
+        line = f.readline()
+        if line.strip() and _line_ms(line, col) < target_ms:
+            lo = f.tell()
+        else:
+            hi = start
+
+    # At most a couple of lines left
+    f.seek(lo)
+    pos = lo
+    while pos < hi:
+        line = f.readline()
+        if not line.strip() or _line_ms(line, col) >= target_ms:
+            return pos
+        pos = f.tell()
+    return hi
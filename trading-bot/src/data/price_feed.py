@@ -4,12 +4,16 @@ VAYU Trading Bot - Price Feed
 Real-time and historical price data handler.
 """
 
+import numpy as np
 import pandas as pd
-from typing import List, Callable, Optional
+from typing import Dict, List, Callable, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import time
 
+from ..indicators import kernels
+from ..utils.memo import LRUCache
+
 @dataclass
 class Candle:
     timestamp: int
@@ -23,14 +27,62 @@ class Candle:
     def datetime(self) -> datetime:
         return datetime.fromtimestamp(self.timestamp / 1000)
 
+@dataclass
+class CandlePanel:
+    """Aligned (bars x symbols) OHLCV arrays; missing bars are NaN."""
+    symbols: List[str]
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    
+    def valid_bars(self) -> np.ndarray:
+        """Number of non-missing closes per symbol."""
+        return np.count_nonzero(~np.isnan(self.close), axis=0)
+
+def build_panel(frames: Dict[str, pd.DataFrame], dtype=np.float64) -> CandlePanel:
+    """
+    Align per-symbol candle frames on the union of their timestamps.
+    
+    Args:
+        frames: symbol -> DataFrame with timestamp/open/high/low/close/volume
+        dtype: float64, or float32 to halve panel memory for large universes
+            (see kernels.PRECISION_BOUNDS for the indicator error this costs)
+    """
+    dtype = kernels.as_precision(np.empty(0), dtype).dtype
+    symbols = list(frames)
+    timestamps = np.unique(np.concatenate(
+        [f["timestamp"].to_numpy(dtype=np.int64) for f in frames.values()]
+    )) if frames else np.empty(0, dtype=np.int64)
+    
+    fields = {name: np.full((len(timestamps), len(symbols)), np.nan, dtype=dtype)
+              for name in ("open", "high", "low", "close", "volume")}
+    
+    for j, symbol in enumerate(symbols):
+        df = frames[symbol]
+        rows = np.searchsorted(timestamps, df["timestamp"].to_numpy(dtype=np.int64))
+        for name, arr in fields.items():
+            arr[rows, j] = df[name].to_numpy(dtype=dtype)
+    
+    return CandlePanel(symbols=symbols, timestamps=timestamps, **fields)
+
 class PriceFeed:
     """
     Handles price data fetching and caching.
     """
     
-    def __init__(self, exchange_client):
+    def __init__(self, exchange_client, cache_ttl: float = 0.0, max_cached: int = 64):
+        """
+        Args:
+            exchange_client: KrakenClient (or compatible)
+            cache_ttl: Seconds a candle download is reused (0 = always fetch)
+            max_cached: Max (symbol, timeframe) downloads kept
+        """
         self.client = exchange_client
-        self.cache = {}
+        self.cache_ttl = cache_ttl
+        self.cache = LRUCache(max_entries=max_cached, name="candles")
     
     def fetch_candles(
         self,
@@ -41,6 +93,9 @@ class PriceFeed:
         """
         Fetch OHLCV candles and return as DataFrame.
         
+        Within cache_ttl a previous download of at least `limit` candles
+        is reused (trimmed to the last `limit` rows).
+        
         Args:
             symbol: Trading pair (e.g., "BTC/USD")
             timeframe: Candle timeframe
@@ -49,6 +104,25 @@ class PriceFeed:
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
         """
+        if self.cache_ttl > 0:
+            # Stale or short entries are downloaded again: count them as misses
+            cached = self.cache.peek((symbol, timeframe))
+            if cached is not None:
+                fetched_at, df = cached
+                if time.time() - fetched_at <= self.cache_ttl and len(df) >= limit:
+                    self.cache.get((symbol, timeframe))
+                    return df.iloc[-limit:].reset_index(drop=True)
+            self.cache.misses += 1
+        
+        df = self._download(symbol, timeframe, limit)
+        
+        if self.cache_ttl > 0:
+            self.cache.put((symbol, timeframe), (time.time(), df))
+        
+        return df
+    
+    def _download(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """Fetch candles from the exchange."""
         ohlcv = self.client.get_ohlcv(symbol, timeframe, limit)
         
         df = pd.DataFrame(
@@ -61,6 +135,28 @@ class PriceFeed:
         
         return df
     
+    def fetch_panel(
+        self,
+        symbols: List[str],
+        timeframe: str = "1h",
+        limit: int = 100,
+        dtype=np.float64
+    ) -> CandlePanel:
+        """
+        Fetch candles for several symbols as an aligned panel.
+        
+        Symbols whose download fails are left out of the panel.
+        dtype=np.float32 stores the panel in reduced precision.
+        """
+        frames = {}
+        for symbol in symbols:
+            try:
+                frames[symbol] = self.fetch_candles(symbol, timeframe, limit)
+            except Exception as e:
+                print(f"❌ Error fetching {symbol}: {e}")
+        
+        return build_panel(frames, dtype)
+    
     def get_latest_price(self, symbol: str) -> float:
         """Get current market price."""
         ticker = self.client.get_ticker(symbol)
@@ -0,0 +1,13 @@
+"""
+Indicator computation for VAYU Trading Bot.
+"""
+
+from . import dag, kernels
+from .rolling import RollingMax, RollingMin, RollingMoments, WindowStats
+from .streaming import IndicatorSnapshot, IndicatorState, StreamingIndicators
+from .windowed import WindowedIndicators
+
+__all__ = [
+    'dag', 'kernels', 'IndicatorSnapshot', 'IndicatorState', 'StreamingIndicators',
+    'RollingMax', 'RollingMin', 'RollingMoments', 'WindowStats', 'WindowedIndicators'
+]
@@ -0,0 +1,191 @@
+"""
+VAYU Trading Bot - Indicator Graph
+==================================
+Declarative indicator specs and a deduplicated computation DAG.
+
+Strategies declare what they need, e.g. `rsi(14)`, `ema(200)`, `atr(14)`.
+Specs are hashable values, so identical declarations from different
+strategies collapse into one node, and shared inputs (such as the true
+range behind every ATR period) are computed once.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from . import kernels
+
+SOURCES = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """One indicator node: registered name plus parameters."""
+    name: str
+    params: Tuple = ()
+
+    def __str__(self) -> str:
+        return f"{self.name}({', '.join(str(p) for p in self.params)})"
+
+    @property
+    def is_source(self) -> bool:
+        return self.name in SOURCES
+
+
+@dataclass(frozen=True)
+class IndicatorDef:
+    """How to compute a registered indicator."""
+    inputs: Callable[..., List[IndicatorSpec]]   # params -> dependency specs
+    func: Callable[..., np.ndarray]             # (*input arrays, *params) -> array
+
+
+_REGISTRY: Dict[str, IndicatorDef] = {}
+
+
+def register_indicator(name: str, inputs: Callable[..., List[IndicatorSpec]], func: Callable[..., np.ndarray]):
+    """
+    Register an indicator so strategies can declare it.
+
+    Args:
+        name: Spec name
+        inputs: Function of the spec params returning dependency specs
+        func: Called as func(*dependency_arrays, *params)
+    """
+    if name in SOURCES:
+        raise ValueError(f"'{name}' is a price source")
+    _REGISTRY[name] = IndicatorDef(inputs=inputs, func=func)
+
+
+def source(name: str) -> IndicatorSpec:
+    if name not in SOURCES:
+        raise ValueError(f"Unknown price source '{name}'")
+    return IndicatorSpec(name)
+
+
+def close() -> IndicatorSpec:
+    return IndicatorSpec("close")
+
+
+def high() -> IndicatorSpec:
+    return IndicatorSpec("high")
+
+
+def low() -> IndicatorSpec:
+    return IndicatorSpec("low")
+
+
+def rsi(period: int = 14) -> IndicatorSpec:
+    return IndicatorSpec("rsi", (int(period),))
+
+
+def ema(period: int = 200) -> IndicatorSpec:
+    return IndicatorSpec("ema", (int(period),))
+
+
+def true_range() -> IndicatorSpec:
+    return IndicatorSpec("true_range")
+
+
+def atr(period: int = 14) -> IndicatorSpec:
+    return IndicatorSpec("atr", (int(period),))
+
+
+def rolling_max(field: str = "high", window: int = 14) -> IndicatorSpec:
+    return IndicatorSpec("rolling_max", (field, int(window)))
+
+
+def rolling_min(field: str = "low", window: int = 14) -> IndicatorSpec:
+    return IndicatorSpec("rolling_min", (field, int(window)))
+
+
+def rolling_sum(field: str = "volume", window: int = 20) -> IndicatorSpec:
+    return IndicatorSpec("rolling_sum", (field, int(window)))
+
+
+def rolling_mean(field: str = "close", window: int = 20) -> IndicatorSpec:
+    return IndicatorSpec("rolling_mean", (field, int(window)))
+
+
+def rolling_std(field: str = "close", window: int = 20) -> IndicatorSpec:
+    return IndicatorSpec("rolling_std", (field, int(window)))
+
+
+register_indicator("rsi", lambda period: [close()], kernels.rsi)
+register_indicator("ema", lambda period: [close()], kernels.ema)
+register_indicator("true_range", lambda: [high(), low(), close()], kernels.true_range)
+register_indicator("atr", lambda period: [true_range()], kernels.ema)
+register_indicator("rolling_max", lambda field, window: [source(field)],
+                   lambda x, field, window: kernels.rolling_max(x, window))
+register_indicator("rolling_min", lambda field, window: [source(field)],
+                   lambda x, field, window: kernels.rolling_min(x, window))
+register_indicator("rolling_sum", lambda field, window: [source(field)],
+                   lambda x, field, window: kernels.rolling_sum(x, window))
+register_indicator("rolling_mean", lambda field, window: [source(field)],
+                   lambda x, field, window: kernels.rolling_mean(x, window))
+register_indicator("rolling_std", lambda field, window: [source(field)],
+                   lambda x, field, window: kernels.rolling_std(x, window))
+
+
+def _dependencies(spec: IndicatorSpec) -> List[IndicatorSpec]:
+    if spec.is_source:
+        return []
+    if spec.name not in _REGISTRY:
+        raise KeyError(f"Unknown indicator '{spec.name}'")
+    return _REGISTRY[spec.name].inputs(*spec.params)
+
+
+class IndicatorGraph:
+    """
+    Deduplicated DAG over a set of indicator specs.
+
+    Nodes are evaluated in dependency order, each exactly once per compute.
+    """
+
+    def __init__(self, specs: Iterable[IndicatorSpec] = ()):
+        self.order: List[IndicatorSpec] = []
+        self._seen = set()
+        for spec in specs:
+            self.add(spec)
+
+    def add(self, spec: IndicatorSpec):
+        """Add a spec (and its dependencies) if not already present."""
+        if spec in self._seen:
+            return
+        for dep in _dependencies(spec):
+            self.add(dep)
+        self._seen.add(spec)
+        self.order.append(spec)
+
+    def __contains__(self, spec: IndicatorSpec) -> bool:
+        return spec in self._seen
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @property
+    def computed_nodes(self) -> List[IndicatorSpec]:
+        """Nodes that run a kernel (everything except price sources)."""
+        return [s for s in self.order if not s.is_source]
+
+    def compute(self, sources: Mapping[str, np.ndarray]) -> Dict[IndicatorSpec, np.ndarray]:
+        """
+        Evaluate every node once.
+
+        Args:
+            sources: Price arrays by name ("close", "high", ...), 1D or
+                (bars, symbols); float32 sources give float32 indicators
+
+        Returns:
+            Dict mapping each spec in the graph to its array
+        """
+        values: Dict[IndicatorSpec, np.ndarray] = {}
+        for spec in self.order:
+            if spec.is_source:
+                if spec.name not in sources:
+                    raise KeyError(f"Missing price source '{spec.name}'")
+                values[spec] = kernels.as_precision(sources[spec.name])
+            else:
+                inputs = [values[dep] for dep in _dependencies(spec)]
+                values[spec] = _REGISTRY[spec.name].func(*inputs, *spec.params)
+        return values
@@ -0,0 +1,460 @@
+"""
+VAYU Trading Bot - Indicator Kernels
+====================================
+Array-in/array-out RSI, EMA, ATR and rolling window statistics shared
+by the live strategy and both backtesters.
+
+Inputs may be 1D (bars,) or 2D (bars, symbols); time runs along axis 0
+and columns are computed independently. Definitions follow the live
+strategy (pandas ewm semantics), so every caller gets identical numbers.
+
+numba is used when installed; otherwise the kernels fall back to the
+C-implemented pandas window functions.
+
+Precision: float32 inputs give float32 outputs (half the memory and
+cache traffic for large universes); any other input is computed as
+float64. Recursive state (EWM sums and weights) is always accumulated
+in float64, so float32 error does not compound over long histories.
+Against the float64 reference on the same prices the float32 mode is
+bounded by (see PRECISION_BOUNDS, enforced by the test suite):
+- RSI: absolute error <= 0.01 RSI points
+- EMA: relative error <= 1e-6
+- ATR: absolute error <= 1e-6 x close (true range is a difference of
+  rounded prices, so its error scales with price rather than with ATR)
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    njit = None
+    NUMBA_AVAILABLE = False
+
+_use_numba = NUMBA_AVAILABLE
+
+# Documented float32-vs-float64 error bounds: RSI absolute, EMA relative,
+# ATR relative to the close price
+PRECISION_BOUNDS = {"rsi": 1e-2, "ema": 1e-6, "atr": 1e-6}
+
+
+def enable_numba(enabled: bool = True) -> bool:
+    """
+    Switch between numba and pandas backends.
+
+    Returns:
+        True if numba is active after the call
+    """
+    global _use_numba
+    _use_numba = bool(enabled) and NUMBA_AVAILABLE
+    return _use_numba
+
+
+def numba_enabled() -> bool:
+    """Whether kernels currently run through numba."""
+    return _use_numba
+
+
+def _maybe_njit(func):
+    """Compile with numba when available, else return the Python function."""
+    if NUMBA_AVAILABLE:
+        return njit(cache=True, nogil=True)(func)
+    return func
+
+
+def _ewm_loop(x, alpha, adjust, min_periods):
+    """
+    Column-wise exponentially weighted mean.
+
+    Mirrors pandas' ewma (ignore_na=False) so results match
+    Series.ewm(alpha=alpha, adjust=adjust, min_periods=min_periods).
+    Rows are the outer loop so C-ordered panels are read sequentially.
+    """
+    n_rows, n_cols = x.shape
+    out = np.empty((n_rows, n_cols), dtype=x.dtype)
+    old_wt_factor = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+
+    # State is float64 regardless of the storage dtype
+    weighted = np.empty(n_cols)
+    for j in range(n_cols):
+        weighted[j] = x[0, j]
+    old_wt = np.ones(n_cols)
+    nobs = np.zeros(n_cols, dtype=np.int64)
+    for j in range(n_cols):
+        if weighted[j] == weighted[j]:
+            nobs[j] = 1
+        out[0, j] = weighted[j] if nobs[j] >= min_periods else np.nan
+
+    for i in range(1, n_rows):
+        for j in range(n_cols):
+            cur = float(x[i, j])
+            is_obs = cur == cur
+            if is_obs:
+                nobs[j] += 1
+            w = weighted[j]
+            if w == w:
+                old_wt[j] *= old_wt_factor
+                if is_obs:
+                    if w != cur:
+                        weighted[j] = (old_wt[j] * w + new_wt * cur) / (old_wt[j] + new_wt)
+                    if adjust:
+                        old_wt[j] += new_wt
+                    else:
+                        old_wt[j] = 1.0
+            elif is_obs:
+                weighted[j] = cur
+            out[i, j] = weighted[j] if nobs[j] >= min_periods else np.nan
+
+    return out
+
+
+def _rsi_loop(x, period):
+    """
+    Fused RSI: gains/losses and both adjust=True averages in one scan.
+
+    Same arithmetic as _ewm_loop on the gain and loss series (which never
+    contain NaN), without materialising them.
+    """
+    n_rows, n_cols = x.shape
+    out = np.empty((n_rows, n_cols), dtype=x.dtype)
+    decay = 1.0 - 1.0 / period
+
+    avg_gain = np.zeros(n_cols)
+    avg_loss = np.zeros(n_cols)
+    old_wt = np.ones(n_cols)
+    for j in range(n_cols):
+        out[0, j] = np.nan  # No delta on the first bar
+
+    for i in range(1, n_rows):
+        for j in range(n_cols):
+            delta = float(x[i, j]) - float(x[i - 1, j])
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+
+            wt = old_wt[j] * decay
+            g = avg_gain[j]
+            if g != gain:
+                g = (wt * g + gain) / (wt + 1.0)
+            l = avg_loss[j]
+            if l != loss:
+                l = (wt * l + loss) / (wt + 1.0)
+            avg_gain[j] = g
+            avg_loss[j] = l
+            old_wt[j] = wt + 1.0
+
+            if i + 1 < period:
+                out[i, j] = np.nan
+            elif l == 0.0:
+                out[i, j] = 100.0 if g > 0.0 else np.nan
+            else:
+                out[i, j] = 100.0 - 100.0 / (1.0 + g / l)
+
+    return out
+
+
+def _true_range_loop(high, low, close):
+    """True range with NaN-skipping max (first row: high - low)."""
+    n_rows, n_cols = close.shape
+    out = np.empty((n_rows, n_cols), dtype=close.dtype)
+    for j in range(n_cols):
+        out[0, j] = float(high[0, j]) - float(low[0, j])
+    for i in range(1, n_rows):
+        for j in range(n_cols):
+            h = float(high[i, j])
+            l = float(low[i, j])
+            pc = float(close[i - 1, j])
+            tr = h - l
+            hc = abs(h - pc)
+            lc = abs(l - pc)
+            if tr != tr or hc > tr:
+                tr = hc
+            if tr != tr or lc > tr:
+                tr = lc
+            out[i, j] = tr
+    return out
+
+
+def _rolling_extreme_loop(x, window, want_max):
+    """Monotonic-deque rolling max/min per column (NaNs skipped, min_periods=window)."""
+    n_rows, n_cols = x.shape
+    out = np.empty((n_cols, n_rows), dtype=x.dtype).T
+    idx = np.empty(n_rows, dtype=np.int64)
+
+    for j in range(n_cols):
+        head = 0
+        tail = 0
+        count = 0
+        for i in range(n_rows):
+            v = x[i, j]
+            if v == v:
+                count += 1
+                while tail > head:
+                    last = x[idx[tail - 1], j]
+                    if (want_max and last <= v) or (not want_max and last >= v):
+                        tail -= 1
+                    else:
+                        break
+                idx[tail] = i
+                tail += 1
+            if i >= window:
+                old = x[i - window, j]
+                if old == old:
+                    count -= 1
+            while tail > head and idx[head] <= i - window:
+                head += 1
+            if count >= window and tail > head:
+                out[i, j] = x[idx[head], j]
+            else:
+                out[i, j] = np.nan
+
+    return out
+
+def _rolling_moments_loop(x, window, ddof, mode):
+    """
+    Rolling sum (mode 0), mean (1) or std (2) per column, min_periods=window.
+
+    Running sums of (x - shift) with the shift set to each column's first
+    valid value, rebuilt exactly once per window to bound drift (the
+    same scheme as rolling.RollingMoments).
+    """
+    n_rows, n_cols = x.shape
+    out = np.empty((n_cols, n_rows), dtype=x.dtype).T
+
+    for j in range(n_cols):
+        shift = 0.0
+        for i in range(n_rows):
+            if x[i, j] == x[i, j]:
+                shift = float(x[i, j])
+                break
+        s = 0.0
+        ss = 0.0
+        count = 0
+        for i in range(n_rows):
+            v = float(x[i, j])
+            if v == v:
+                d = v - shift
+                s += d
+                ss += d * d
+                count += 1
+            if i >= window:
+                old = float(x[i - window, j])
+                if old == old:
+                    d = old - shift
+                    s -= d
+                    ss -= d * d
+                    count -= 1
+            if (i + 1) % window == 0:
+                s = 0.0
+                ss = 0.0
+                for k in range(i + 1 - window, i + 1):
+                    v = float(x[k, j])
+                    if v == v:
+                        d = v - shift
+                        s += d
+                        ss += d * d
+
+            if count < window:
+                out[i, j] = np.nan
+            elif mode == 0:
+                out[i, j] = s + count * shift
+            elif mode == 1:
+                out[i, j] = s / count + shift
+            elif count - ddof > 0:
+                var = (ss - s * s / count) / (count - ddof)
+                out[i, j] = np.sqrt(var) if var > 0 else 0.0
+            else:
+                out[i, j] = np.nan
+
+    return out
+
+
+_ewm_nb = _maybe_njit(_ewm_loop)
+_rsi_nb = _maybe_njit(_rsi_loop)
+_true_range_nb = _maybe_njit(_true_range_loop)
+_rolling_extreme_nb = _maybe_njit(_rolling_extreme_loop)
+_rolling_moments_nb = _maybe_njit(_rolling_moments_loop)
+
+
+def _as_2d(x) -> tuple:
+    """Return (2D float32/float64 array, was_1d)."""
+    arr = np.asarray(x)
+    if arr.dtype != np.float32:
+        arr = arr.astype(np.float64, copy=False)
+    if arr.ndim == 1:
+        return arr.reshape(-1, 1), True
+    if arr.ndim != 2:
+        raise ValueError(f"Expected 1D or 2D array, got {arr.ndim}D")
+    return arr, False
+
+
+def _restore(out: np.ndarray, was_1d: bool, dtype=None) -> np.ndarray:
+    if dtype is not None:
+        out = out.astype(dtype, copy=False)
+    return out[:, 0] if was_1d else out
+
+
+def as_precision(x, dtype=None) -> np.ndarray:
+    """
+    Cast a price/indicator buffer to float32 or float64.
+    
+    Args:
+        x: Array-like
+        dtype: float32 or float64; None keeps float32 input as float32
+            and casts anything else to float64
+    """
+    if dtype is None:
+        dtype = np.float32 if np.asarray(x).dtype == np.float32 else np.float64
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"Unsupported precision {dtype}")
+    return np.asarray(x, dtype=dtype)
+
+
+def ewm_mean(x, alpha: float, adjust: bool = False, min_periods: int = 0) -> np.ndarray:
+    """
+    Exponentially weighted mean along axis 0.
+
+    Args:
+        x: 1D or 2D array
+        alpha: Smoothing factor (0, 1]
+        adjust: pandas `adjust` semantics
+        min_periods: Observations required before emitting a value
+
+    Returns:
+        Array with the same shape as x
+    """
+    arr, was_1d = _as_2d(x)
+    if arr.shape[0] == 0:
+        return _restore(arr.copy(), was_1d)
+
+    if _use_numba:
+        out = _ewm_nb(np.ascontiguousarray(arr), float(alpha), bool(adjust), int(min_periods))
+    else:
+        out = pd.DataFrame(arr, dtype=np.float64).ewm(
+            alpha=alpha, adjust=adjust, min_periods=min_periods
+        ).mean().to_numpy()
+
+    return _restore(out, was_1d, arr.dtype)
+
+
+def ema(close, span: int) -> np.ndarray:
+    """EMA with pandas ewm(span=span, adjust=False) semantics."""
+    return ewm_mean(close, 2.0 / (span + 1), adjust=False)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """
+    RSI from exponentially weighted gains and losses.
+
+    Matches ewm(com=period-1, min_periods=period) on gains/losses, the
+    definition used by the live strategy. The first `period - 1` rows
+    are NaN.
+    """
+    arr, was_1d = _as_2d(close)
+    if _use_numba and arr.shape[0] > 0:
+        return _restore(_rsi_nb(np.ascontiguousarray(arr), int(period)), was_1d)
+
+    out_dtype = arr.dtype
+    arr = arr.astype(np.float64, copy=False)
+    delta = np.empty_like(arr)
+    delta[:1] = np.nan
+    delta[1:] = arr[1:] - arr[:-1]
+
+    # NaN deltas count as zero movement (as delta.where(delta > 0, 0) does)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    alpha = 1.0 / period
+    avg_gain = ewm_mean(gain, alpha, adjust=True, min_periods=period)
+    avg_loss = ewm_mean(loss, alpha, adjust=True, min_periods=period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return _restore(out, was_1d, out_dtype)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range; the first row falls back to high - low."""
+    h, was_1d = _as_2d(high)
+    l, _ = _as_2d(low)
+    c, _ = _as_2d(close)
+    if _use_numba and c.shape[0] > 0:
+        tr = _true_range_nb(np.ascontiguousarray(h), np.ascontiguousarray(l), np.ascontiguousarray(c))
+        return _restore(tr, was_1d)
+
+    out_dtype = c.dtype
+    h, l, c = (a.astype(np.float64, copy=False) for a in (h, l, c))
+    prev_close = np.empty_like(c)
+    prev_close[:1] = np.nan
+    prev_close[1:] = c[:-1]
+
+    # fmax skips NaN like DataFrame.max(axis=1)
+    tr = np.fmax(h - l, np.fmax(np.abs(h - prev_close), np.abs(l - prev_close)))
+    return _restore(tr, was_1d, out_dtype)
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """ATR as ewm(span=period, adjust=False) of the true range."""
+    return ema(true_range(high, low, close), period)
+
+
+def _rolling_extreme(x, window: int, want_max: bool) -> np.ndarray:
+    arr, was_1d = _as_2d(x)
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    if arr.shape[0] == 0:
+        return _restore(arr.copy(), was_1d)
+
+    if _use_numba:
+        # Column-major so each column's scan is contiguous
+        out = _rolling_extreme_nb(np.asfortranarray(arr), int(window), want_max)
+    else:
+        roll = pd.DataFrame(arr, dtype=np.float64).rolling(window)
+        out = (roll.max() if want_max else roll.min()).to_numpy()
+
+    return _restore(out, was_1d, arr.dtype)
+
+
+def rolling_max(x, window: int) -> np.ndarray:
+    """Rolling maximum along axis 0 (pandas rolling(window).max())."""
+    return _rolling_extreme(x, window, want_max=True)
+
+
+def rolling_min(x, window: int) -> np.ndarray:
+    """Rolling minimum along axis 0 (pandas rolling(window).min())."""
+    return _rolling_extreme(x, window, want_max=False)
+
+
+def _rolling_moment(x, window: int, mode: int, ddof: int = 1) -> np.ndarray:
+    arr, was_1d = _as_2d(x)
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    if arr.shape[0] == 0:
+        return _restore(arr.copy(), was_1d)
+
+    if _use_numba:
+        out = _rolling_moments_nb(np.asfortranarray(arr), int(window), int(ddof), mode)
+    else:
+        roll = pd.DataFrame(arr, dtype=np.float64).rolling(window)
+        out = (roll.sum() if mode == 0 else roll.mean() if mode == 1 else roll.std(ddof=ddof)).to_numpy()
+
+    return _restore(out, was_1d, arr.dtype)
+
+
+def rolling_sum(x, window: int) -> np.ndarray:
+    """Rolling sum along axis 0 (pandas rolling(window).sum())."""
+    return _rolling_moment(x, window, 0)
+
+
+def rolling_mean(x, window: int) -> np.ndarray:
+    """Rolling mean along axis 0 (pandas rolling(window).mean())."""
+    return _rolling_moment(x, window, 1)
+
+
+def rolling_std(x, window: int, ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviation along axis 0 (pandas rolling(window).std(ddof))."""
+    return _rolling_moment(x, window, 2, ddof)
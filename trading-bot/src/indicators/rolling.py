@@ -0,0 +1,172 @@
+"""
+VAYU Trading Bot - Streaming Rolling Windows
+============================================
+Fixed-window max/min, sum, mean and std that advance in amortized O(1)
+per bar, for live buffers (Donchian channels, range or volume filters).
+
+- RollingMax / RollingMin keep a monotonic deque of candidate extremes;
+  each value is pushed and popped at most once.
+- RollingMoments keeps a running sum and sum of squares over a ring
+  buffer. Values are taken relative to a reference level (so prices in
+  the tens of thousands don't cancel out the variance) and the sums are
+  rebuilt exactly once per window, bounding floating-point drift.
+
+Every primitive has `update` (consume a closed bar) and `peek` (value if
+the next bar were `x`, without mutating). Results match the batch
+kernels: kernels.rolling_max/min/sum/mean/std, i.e. pandas
+rolling(window) with min_periods=window. Inputs must be finite.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass
+
+
+class _RollingExtreme:
+    """Monotonic-deque rolling extreme over the last `window` values."""
+
+    def __init__(self, window: int, want_max: bool):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.want_max = want_max
+        self.count = 0                 # Values consumed so far
+        self._deque = deque()          # (index, value), extremes first
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old if self.want_max else new <= old
+
+    def update(self, x: float) -> float:
+        """Consume one value; return the extreme of the window (NaN until full)."""
+        x = float(x)
+        dq = self._deque
+        while dq and self._dominates(x, dq[-1][1]):
+            dq.pop()
+        dq.append((self.count, x))
+        self.count += 1
+        while dq[0][0] <= self.count - 1 - self.window:
+            dq.popleft()
+        return self.value
+
+    def peek(self, x: float) -> float:
+        """Extreme of the window if the next value were `x`."""
+        x = float(x)
+        if self.count + 1 < self.window:
+            return math.nan
+        expired = self.count - self.window     # Index leaving the window
+        dq = self._deque
+        # The deque is monotonic, so the first live entry is the extreme
+        first = 1 if dq and dq[0][0] <= expired else 0
+        if first < len(dq) and self._dominates(dq[first][1], x):
+            return dq[first][1]
+        return x
+
+    @property
+    def value(self) -> float:
+        if self.count < self.window:
+            return math.nan
+        return self._deque[0][1]
+
+    def reset(self):
+        self.count = 0
+        self._deque.clear()
+
+
+class RollingMax(_RollingExtreme):
+    """Rolling maximum (pandas rolling(window).max())."""
+
+    def __init__(self, window: int):
+        super().__init__(window, want_max=True)
+
+
+class RollingMin(_RollingExtreme):
+    """Rolling minimum (pandas rolling(window).min())."""
+
+    def __init__(self, window: int):
+        super().__init__(window, want_max=False)
+
+
+@dataclass
+class WindowStats:
+    """Moments of one window (NaN until the window is full)."""
+    sum: float
+    mean: float
+    std: float
+
+
+class RollingMoments:
+    """
+    Rolling sum, mean and sample std over the last `window` values.
+
+    Args:
+        window: Number of values
+        ddof: Delta degrees of freedom for std (1 matches pandas)
+    """
+
+    def __init__(self, window: int, ddof: int = 1):
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.window = window
+        self.ddof = ddof
+        self.count = 0
+        self._ring = [0.0] * window
+        self._shift = 0.0        # Reference level the sums are taken around
+        self._sum = 0.0          # sum(x - shift)
+        self._sumsq = 0.0        # sum((x - shift) ** 2)
+
+    def _stats(self, n: int, s: float, ss: float) -> WindowStats:
+        if n < self.window:
+            return WindowStats(math.nan, math.nan, math.nan)
+        mean = s / n
+        if n - self.ddof > 0:
+            var = max((ss - s * mean) / (n - self.ddof), 0.0)
+            std = math.sqrt(var)
+        else:
+            std = math.nan
+        return WindowStats(sum=s + n * self._shift, mean=mean + self._shift, std=std)
+
+    def _rebuild(self):
+        """Recompute the sums exactly, re-centred on the full window's mean."""
+        self._shift = math.fsum(self._ring) / self.window
+        self._sum = math.fsum(v - self._shift for v in self._ring)
+        self._sumsq = math.fsum((v - self._shift) ** 2 for v in self._ring)
+
+    def update(self, x: float) -> WindowStats:
+        """Consume one value; return the window's moments."""
+        x = float(x)
+        if self.count == 0:
+            self._shift = x
+        slot = self.count % self.window
+        if self.count >= self.window:
+            old = self._ring[slot] - self._shift
+            self._sum -= old
+            self._sumsq -= old * old
+        self._ring[slot] = x
+        d = x - self._shift
+        self._sum += d
+        self._sumsq += d * d
+        self.count += 1
+
+        if self.count % self.window == 0:
+            self._rebuild()   # O(window) once per window: amortized O(1)
+        return self.stats
+
+    def peek(self, x: float) -> WindowStats:
+        """Moments if the next value were `x`."""
+        s, ss = self._sum, self._sumsq
+        if self.count >= self.window:
+            old = self._ring[self.count % self.window] - self._shift
+            s -= old
+            ss -= old * old
+        n = min(self.count + 1, self.window)
+        d = float(x) - self._shift
+        return self._stats(n, s + d, ss + d * d)
+
+    @property
+    def stats(self) -> WindowStats:
+        return self._stats(min(self.count, self.window), self._sum, self._sumsq)
+
+    def reset(self):
+        self.count = 0
+        self._ring = [0.0] * self.window
+        self._shift = self._sum = self._sumsq = 0.0
@@ -0,0 +1,289 @@
+"""
+VAYU Trading Bot - Streaming Indicators
+=======================================
+Incremental RSI / EMA / ATR that advance in O(1) per closed bar.
+
+The recurrences reproduce the batch definitions in RSIMomentumStrategy:
+- RSI: pandas ewm(com=period-1, adjust=True) of gains/losses
+- EMA: pandas ewm(span=period, adjust=False) of closes
+- ATR: pandas ewm(span=period, adjust=False) of true range
+
+Each symbol also carries rolling windows (see rolling.py): a Donchian
+channel over highs/lows and the mean/std of closes, so range or band
+filters don't need a pandas rolling pass over a fresh download.
+"""
+
+import math
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .rolling import RollingMax, RollingMin, RollingMoments, WindowStats
+
+
+@dataclass
+class IndicatorState:
+    """Recursive state for one symbol."""
+    gain_sum: float = 0.0     # Decayed sum of gains (adjust=True numerator)
+    loss_sum: float = 0.0     # Decayed sum of losses
+    weight_sum: float = 0.0   # Decayed sum of weights (adjust=True denominator)
+    ema: float = math.nan
+    atr: float = math.nan
+    prev_close: float = math.nan
+    bars: int = 0
+    last_timestamp: Optional[int] = None
+    channel_high: Optional[RollingMax] = None      # Rolling max of highs
+    channel_low: Optional[RollingMin] = None       # Rolling min of lows
+    close_window: Optional[RollingMoments] = None  # Rolling mean/std of closes
+
+    @property
+    def avg_gain(self) -> float:
+        return self.gain_sum / self.weight_sum if self.weight_sum else math.nan
+
+    @property
+    def avg_loss(self) -> float:
+        return self.loss_sum / self.weight_sum if self.weight_sum else math.nan
+
+
+@dataclass
+class IndicatorSnapshot:
+    """Indicator values after a bar."""
+    rsi: float
+    ema: float
+    atr: float
+    close: float
+    timestamp: Optional[int] = None
+    channel_high: float = math.nan
+    channel_low: float = math.nan
+    close_mean: float = math.nan
+    close_std: float = math.nan
+
+
+class StreamingIndicators:
+    """
+    Per-symbol incremental indicator engine.
+
+    `update` advances the state with a closed bar; `peek` evaluates an
+    in-progress bar against the current state without mutating it.
+    """
+
+    def __init__(
+        self,
+        rsi_period: int = 14,
+        ema_period: int = 200,
+        atr_period: int = 14,
+        channel_period: int = 14
+    ):
+        self.rsi_period = rsi_period
+        self.ema_period = ema_period
+        self.atr_period = atr_period
+        self.channel_period = channel_period
+
+        self._rsi_decay = 1.0 - 1.0 / rsi_period        # com = period - 1
+        self._ema_alpha = 2.0 / (ema_period + 1)
+        self._atr_alpha = 2.0 / (atr_period + 1)
+
+        self.states: Dict[str, IndicatorState] = {}
+
+    def _new_state(self) -> IndicatorState:
+        n = self.channel_period
+        return IndicatorState(channel_high=RollingMax(n), channel_low=RollingMin(n),
+                              close_window=RollingMoments(n))
+
+    def _advance(self, state: IndicatorState, high: float, low: float, close: float):
+        """Apply one bar to `state` in place."""
+        prev_close = state.prev_close
+
+        if state.bars == 0:
+            # First bar: diff() is NaN, which the batch code maps to zero gain/loss
+            gain = loss = 0.0
+            true_range = high - low
+            state.ema = close
+        else:
+            delta = close - prev_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            state.ema += self._ema_alpha * (close - state.ema)
+
+        decay = self._rsi_decay
+        state.gain_sum = state.gain_sum * decay + gain
+        state.loss_sum = state.loss_sum * decay + loss
+        state.weight_sum = state.weight_sum * decay + 1.0
+
+        if state.bars == 0:
+            state.atr = true_range
+        else:
+            state.atr += self._atr_alpha * (true_range - state.atr)
+
+        state.prev_close = close
+        state.bars += 1
+
+    def _snapshot(
+        self,
+        state: IndicatorState,
+        close: float,
+        timestamp: Optional[int],
+        channel_high: float = math.nan,
+        channel_low: float = math.nan,
+        window: Optional[WindowStats] = None
+    ) -> IndicatorSnapshot:
+        if state.bars < self.rsi_period:
+            rsi = math.nan
+        else:
+            total = state.gain_sum + state.loss_sum
+            # Same as 100 - 100 / (1 + avg_gain / avg_loss); the weights cancel
+            rsi = 100.0 * state.gain_sum / total if total > 0 else math.nan
+        return IndicatorSnapshot(
+            rsi=rsi, ema=state.ema, atr=state.atr, close=close, timestamp=timestamp,
+            channel_high=channel_high, channel_low=channel_low,
+            close_mean=window.mean if window else math.nan,
+            close_std=window.std if window else math.nan
+        )
+
+    def update(
+        self,
+        symbol: str,
+        high: float,
+        low: float,
+        close: float,
+        timestamp: Optional[int] = None
+    ) -> IndicatorSnapshot:
+        """Advance `symbol` by one closed bar."""
+        state = self.states.get(symbol)
+        if state is None:
+            state = self.states[symbol] = self._new_state()
+
+        self._advance(state, float(high), float(low), float(close))
+        state.last_timestamp = timestamp
+        return self._snapshot(
+            state, float(close), timestamp,
+            state.channel_high.update(high), state.channel_low.update(low), state.close_window.update(close)
+        )
+
+    def peek(
+        self,
+        symbol: str,
+        high: float,
+        low: float,
+        close: float,
+        timestamp: Optional[int] = None
+    ) -> IndicatorSnapshot:
+        """Evaluate an in-progress bar without touching the stored state."""
+        stored = self.states.get(symbol) or self._new_state()
+        state = replace(stored)  # Windows are shared but only peeked
+        self._advance(state, float(high), float(low), float(close))
+        return self._snapshot(
+            state, float(close), timestamp,
+            stored.channel_high.peek(high), stored.channel_low.peek(low), stored.close_window.peek(close)
+        )
+
+    def warm_up(self, symbol: str, df: pd.DataFrame) -> Optional[IndicatorSnapshot]:
+        """
+        Rebuild state for `symbol` from closed bars.
+
+        Args:
+            symbol: Trading pair
+            df: Closed OHLCV bars, oldest first
+
+        Returns:
+            Snapshot after the last bar, or None if df is empty
+        """
+        self.states[symbol] = self._new_state()
+        snapshot = None
+        timestamps = df["timestamp"].tolist() if "timestamp" in df.columns else [None] * len(df)
+
+        for high, low, close, ts in zip(df["high"].tolist(), df["low"].tolist(),
+                                        df["close"].tolist(), timestamps):
+            snapshot = self.update(symbol, high, low, close, ts)
+
+        return snapshot
+
+    def sync(self, symbol: str, df: pd.DataFrame, last_bar_closed: bool = False) -> IndicatorSnapshot:
+        """
+        Bring `symbol` up to date with a candle frame and evaluate its last row.
+
+        Closed bars newer than the stored state are applied with `update`.
+        Unless `last_bar_closed`, the final row is treated as the forming
+        candle and evaluated with `peek`. If the stored state can't be
+        continued from `df` (no state yet, or a gap) it is rebuilt.
+
+        Args:
+            symbol: Trading pair
+            df: OHLCV frame with a `timestamp` column, oldest first
+            last_bar_closed: Treat the final row as closed
+
+        Returns:
+            Snapshot for the final row of df
+        """
+        closed = df if last_bar_closed else df.iloc[:-1]
+        state = self.states.get(symbol)
+        timestamps = closed["timestamp"]
+
+        if state is None or state.last_timestamp is None or not (timestamps == state.last_timestamp).any():
+            snapshot = self.warm_up(symbol, closed)
+        else:
+            fresh = closed[timestamps > state.last_timestamp]
+            snapshot = None
+            for high, low, close, ts in zip(fresh["high"].tolist(), fresh["low"].tolist(),
+                                            fresh["close"].tolist(), fresh["timestamp"].tolist()):
+                snapshot = self.update(symbol, high, low, close, ts)
+
+        if last_bar_closed:
+            if snapshot is None:
+                state = self.states[symbol]
+                snapshot = self._snapshot(
+                    state, state.prev_close, state.last_timestamp,
+                    state.channel_high.value, state.channel_low.value, state.close_window.stats
+                )
+            return snapshot
+
+        last = df.iloc[-1]
+        return self.peek(symbol, last["high"], last["low"], last["close"], last.get("timestamp"))
+
+    def rsi_trigger_price(self, symbol: str, level: float) -> float:
+        """
+        Close of the next bar at which RSI would equal `level`.
+
+        With avg gain/loss fixed by the closed bars, next-bar RSI is a
+        non-decreasing function of the next close alone, so RSI < level
+        exactly when close < trigger (and RSI >= level when close >= it).
+
+        Args:
+            symbol: Trading pair
+            level: RSI level strictly between 0 and 100
+
+        Returns:
+            Trigger price, or NaN if RSI is still warming up
+        """
+        if not 0 < level < 100:
+            raise ValueError("RSI level must be between 0 and 100")
+        state = self.states.get(symbol)
+        if state is None or state.bars == 0 or state.bars + 1 < self.rsi_period:
+            return math.nan
+
+        gain = state.gain_sum * self._rsi_decay
+        loss = state.loss_sum * self._rsi_decay
+        f = level / 100.0
+        if gain + loss == 0:
+            return state.prev_close  # Flat history: any move crosses every level
+
+        if gain / (gain + loss) < f:
+            # Needs an up move x: (gain + x) / (gain + loss + x) = f
+            move = (f * loss - (1.0 - f) * gain) / (1.0 - f)
+        else:
+            # Needs a down move y: gain / (gain + loss + y) = f
+            move = -((1.0 - f) * gain - f * loss) / f
+        return state.prev_close + move
+
+    def get_state(self, symbol: str) -> Optional[IndicatorState]:
+        """Get stored state for a symbol."""
+        return self.states.get(symbol)
+
+    def reset(self, symbol: Optional[str] = None):
+        """Drop state for one symbol, or all symbols."""
+        if symbol is None:
+            self.states.clear()
+        else:
+            self.states.pop(symbol, None)
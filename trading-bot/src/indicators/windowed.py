@@ -0,0 +1,115 @@
+"""
+VAYU Trading Bot - Windowed Indicators
+======================================
+Compute RSI / EMA once over a full series and read them per window.
+
+Walk-forward windows overlap heavily, so recomputing indicators per
+window repeats most of the work. Here each recursion runs once over the
+whole series; a window is then read in one of two ways:
+
+- isolated (default): values equal to running the kernel on the window
+  alone, as if no earlier history existed. Both recursions are linear,
+  so the isolated series is the full-history series minus the decayed
+  contribution of the bars before the window:
+    EMA:  iso[t] = full[t] + (1 - a)^(t - s) * (x[s] - full[s])
+    RSI:  iso_sum[t] = full_sum[t] - d^(t - s + 1) * full_sum[s - 1] - d^(t - s) * move[s]
+  (the last term drops the first in-window move, which an isolated run
+  sees as its undefined first diff). This is a vectorized correction,
+  not a recursion.
+- continuous: the full-history values sliced, so each window's
+  indicators are already warmed up by the bars before it.
+
+Prices must not contain NaN.
+"""
+
+from typing import Dict, Iterable, Mapping
+
+import numpy as np
+
+from . import kernels
+
+
+class WindowedIndicators:
+    """
+    Full-series RSI/EMA state for several periods, sliceable per window.
+
+    Args:
+        close: 1D close prices
+        rsi_periods: RSI lookbacks to prepare
+        ema_periods: EMA spans to prepare
+        continuous: Default window semantics (False = isolated)
+    """
+
+    def __init__(
+        self,
+        close: np.ndarray,
+        rsi_periods: Iterable[int] = (),
+        ema_periods: Iterable[int] = (),
+        continuous: bool = False
+    ):
+        self.close = np.asarray(close, dtype=np.float64)
+        self.continuous = continuous
+        self.arrays: Dict[str, np.ndarray] = {}
+
+        delta = np.diff(self.close, prepend=np.nan)
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+        steps = np.arange(1, len(self.close) + 1)
+
+        for period in sorted(set(rsi_periods)):
+            # Undiscounted adjust=True sums: mean * total weight
+            decay = 1.0 - 1.0 / period
+            weight = (1.0 - decay ** steps) / (1.0 - decay)
+            self.arrays[f"gain_{period}"] = kernels.ewm_mean(gain, 1.0 / period, adjust=True) * weight
+            self.arrays[f"loss_{period}"] = kernels.ewm_mean(loss, 1.0 / period, adjust=True) * weight
+        self.arrays["gain"] = gain
+        self.arrays["loss"] = loss
+
+        for span in sorted(set(ema_periods)):
+            self.arrays[f"ema_{span}"] = kernels.ema(self.close, span)
+
+    @classmethod
+    def from_arrays(cls, close: np.ndarray, arrays: Mapping[str, np.ndarray],
+                    continuous: bool = False) -> "WindowedIndicators":
+        """Rebuild from precomputed `arrays` (e.g. attached shared memory)."""
+        self = cls.__new__(cls)
+        self.close = close
+        self.continuous = continuous
+        self.arrays = dict(arrays)
+        return self
+
+    def _continuous(self, continuous) -> bool:
+        return self.continuous if continuous is None else continuous
+
+    def rsi(self, period: int, start: int, stop: int, continuous: bool = None) -> np.ndarray:
+        """RSI for bars [start, stop)."""
+        gain = self.arrays[f"gain_{period}"][start:stop]
+        loss = self.arrays[f"loss_{period}"][start:stop]
+
+        if self._continuous(continuous):
+            valid = np.arange(start, stop) >= period - 1
+        else:
+            if start > 0:
+                decay = 1.0 - 1.0 / period
+                k = np.arange(stop - start)
+                carry = decay ** (k + 1)
+                first = decay ** k
+                gain = gain - carry * self.arrays[f"gain_{period}"][start - 1] - first * self.arrays["gain"][start]
+                loss = loss - carry * self.arrays[f"loss_{period}"][start - 1] - first * self.arrays["loss"][start]
+                # Cancellation can leave tiny negative residues
+                gain = np.maximum(gain, 0.0)
+                loss = np.maximum(loss, 0.0)
+            valid = np.arange(stop - start) >= period - 1
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = 100.0 - 100.0 / (1.0 + gain / loss)
+        return np.where(valid, out, np.nan)
+
+    def ema(self, span: int, start: int, stop: int, continuous: bool = None) -> np.ndarray:
+        """EMA for bars [start, stop)."""
+        full = self.arrays[f"ema_{span}"][start:stop]
+        if self._continuous(continuous) or start == 0:
+            return full.copy()
+        k = np.arange(stop - start)
+        alpha = 2.0 / (span + 1)
+        return full + (1.0 - alpha) ** k * (self.close[start] - full[0])
@@ -0,0 +1,112 @@
+"""
+VAYU Trading Bot - Strategy Plugin Interface
+============================================
+Strategies declare the indicators they need and only implement decision
+logic; the StrategyEngine computes the shared indicator graph once.
+"""
+
+import numpy as np
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional
+
+from ..indicators.dag import IndicatorSpec
+
+class Signal(Enum):
+    LONG = "long"
+    SHORT = "short"
+    HOLD = "hold"
+
+@dataclass
+class SignalResult:
+    signal: Signal
+    rsi: float
+    price: float
+    ema200: float
+    confidence: float  # 0.0 to 1.0
+
+# Integer codes used by the batched (array) API
+SIGNAL_CODES = {1: Signal.LONG, -1: Signal.SHORT, 0: Signal.HOLD}
+POSITION_CODES = {Signal.LONG: 1, Signal.SHORT: -1}
+
+@dataclass
+class BatchSignalResult:
+    """Signals for a whole universe on the latest bar (one entry per column)."""
+    signal: np.ndarray      # int8 codes: 1 long, -1 short, 0 hold
+    confidence: np.ndarray
+    price: np.ndarray
+    rsi: Optional[np.ndarray] = None
+    ema200: Optional[np.ndarray] = None
+    atr: Optional[np.ndarray] = None   # Used for stop placement when present
+    symbols: Optional[List[str]] = None
+    
+    def __len__(self) -> int:
+        return len(self.signal)
+    
+    def _value(self, arr: Optional[np.ndarray], i: int) -> float:
+        return float(arr[i]) if arr is not None else float("nan")
+    
+    def result(self, i: int) -> SignalResult:
+        """SignalResult for column i."""
+        return SignalResult(
+            signal=SIGNAL_CODES[int(self.signal[i])],
+            rsi=self._value(self.rsi, i),
+            price=float(self.price[i]),
+            ema200=self._value(self.ema200, i),
+            confidence=float(self.confidence[i])
+        )
+    
+    def active(self) -> np.ndarray:
+        """Column indices with a non-HOLD signal."""
+        return np.flatnonzero(self.signal)
+
+# Indicator arrays by spec, each (bars, symbols)
+IndicatorValues = Dict[IndicatorSpec, np.ndarray]
+
+class StrategyPlugin(ABC):
+    """
+    Base class for strategies run by the StrategyEngine.
+    
+    Subclasses set `name`/`timeframe`, declare indicators in
+    `required_indicators`, and turn computed values into signals in
+    `decide`. They never compute indicators themselves. Bump `version`
+    whenever the trading rules change; cached backtest results are keyed
+    on it.
+    
+    The class `name` is a default: instances can take their own, so one
+    plugin can be loaded with several parameter sets.
+    """
+    
+    name: str = "strategy"
+    version: str = "1"
+    timeframe: str = "1h"
+    
+    def warmup_bars(self) -> int:
+        """
+        Bars to fetch per evaluation. Recursive indicators (EMA, RSI)
+        depend on where their window starts; enough history makes the
+        batch values match the streaming state carried across passes.
+        """
+        return 250
+    
+    @abstractmethod
+    def required_indicators(self) -> List[IndicatorSpec]:
+        """Indicators this strategy reads, e.g. [rsi(14), ema(200)]."""
+    
+    @abstractmethod
+    def decide(self, values: IndicatorValues) -> BatchSignalResult:
+        """Entry signals for the last bar of each column."""
+    
+    def decide_exits(
+        self,
+        values: IndicatorValues,
+        entry_price: np.ndarray,
+        position: np.ndarray
+    ) -> np.ndarray:
+        """
+        Exit flags for open positions (position: 1 long, -1 short, 0 flat).
+        
+        Default: never exit on indicator values.
+        """
+        return np.zeros(len(position), dtype=bool)
@@ -0,0 +1,131 @@
+"""
+VAYU Trading Bot - Strategy Engine
+==================================
+Runs any number of StrategyPlugins over one shared indicator graph.
+
+The union of every plugin's declared indicators is deduplicated into one
+DAG per timeframe. For each (symbol or universe, timeframe, bar) the DAG
+is evaluated once and the same arrays are handed to every strategy, so
+adding a strategy costs only its decision logic.
+"""
+
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..indicators import kernels
+from ..indicators.dag import IndicatorGraph
+from ..utils.memo import LRUCache
+from .base import BatchSignalResult, IndicatorValues, StrategyPlugin
+
+
+class StrategyEngine:
+    """
+    Evaluates loaded strategies against shared indicator computations.
+    """
+
+    def __init__(self, strategies: Optional[List[StrategyPlugin]] = None, cache_entries: int = 64):
+        self.strategies: Dict[str, StrategyPlugin] = {}
+        self.graphs: Dict[str, IndicatorGraph] = {}
+        self.cache = LRUCache(max_entries=cache_entries, name="indicator graph")
+        self.graph_evaluations = 0
+
+        for strategy in strategies or []:
+            self.add_strategy(strategy)
+
+    def add_strategy(self, strategy: StrategyPlugin):
+        """Load a strategy and merge its indicators into its timeframe's graph."""
+        if strategy.name in self.strategies:
+            raise ValueError(f"Strategy '{strategy.name}' already loaded")
+        self.strategies[strategy.name] = strategy
+
+        graph = self.graphs.setdefault(strategy.timeframe, IndicatorGraph())
+        for spec in strategy.required_indicators():
+            graph.add(spec)
+        self.cache.clear()  # Graph shape changed
+
+    def strategies_for(self, timeframe: str) -> List[StrategyPlugin]:
+        return [s for s in self.strategies.values() if s.timeframe == timeframe]
+
+    def compute(
+        self,
+        timeframe: str,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        key: Optional[Hashable] = None
+    ) -> IndicatorValues:
+        """
+        Evaluate the timeframe's graph once.
+
+        Args:
+            timeframe: Which graph to run
+            close, high, low: 1D or (bars, symbols) arrays
+            key: Identity of the inputs (e.g. symbol + last bar timestamp);
+                repeated calls with the same key reuse the result
+        """
+        if timeframe not in self.graphs:
+            raise KeyError(f"No strategies loaded for timeframe {timeframe}")
+
+        def run():
+            self.graph_evaluations += 1
+            return self.graphs[timeframe].compute({"close": close, "high": high, "low": low})
+
+        if key is None:
+            return run()
+        return self.cache.get_or_compute((timeframe, key), run)
+
+    def evaluate(
+        self,
+        timeframe: str,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        symbols: Optional[List[str]] = None,
+        key: Optional[Hashable] = None
+    ) -> Dict[str, BatchSignalResult]:
+        """
+        Signals from every strategy on `timeframe` for a (bars, symbols) panel.
+
+        Returns:
+            strategy name -> BatchSignalResult
+        """
+        close = kernels.as_precision(close)
+        if close.ndim == 1:
+            close, high, low = (kernels.as_precision(a).reshape(-1, 1) for a in (close, high, low))
+
+        values = self.compute(timeframe, close, high, low, key)
+        results = {}
+        for strategy in self.strategies_for(timeframe):
+            batch = strategy.decide(values)
+            batch.symbols = list(symbols) if symbols is not None else None
+            results[strategy.name] = batch
+        return results
+
+    def evaluate_frame(self, symbol: str, timeframe: str, df: pd.DataFrame) -> Dict[str, BatchSignalResult]:
+        """Signals for one symbol's candle frame (keyed on its last bar)."""
+        key = (symbol, int(df["timestamp"].iloc[0]), int(df["timestamp"].iloc[-1]),
+               float(df["close"].iloc[-1])) if "timestamp" in df.columns else None
+        return self.evaluate(
+            timeframe, df["close"].to_numpy(), df["high"].to_numpy(), df["low"].to_numpy(),
+            symbols=[symbol], key=key
+        )
+
+    def exits(
+        self,
+        strategy_name: str,
+        timeframe: str,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        entry_price: np.ndarray,
+        position: np.ndarray,
+        key: Optional[Hashable] = None
+    ) -> np.ndarray:
+        """Exit flags from one strategy, reusing the shared graph values."""
+        close = kernels.as_precision(close)
+        if close.ndim == 1:
+            close, high, low = (kernels.as_precision(a).reshape(-1, 1) for a in (close, high, low))
+        values = self.compute(timeframe, close, high, low, key)
+        return self.strategies[strategy_name].decide_exits(values, entry_price, position)
@@ -0,0 +1,199 @@
+"""
+VAYU Trading Bot - RSI Momentum Parameter Ensemble
+==================================================
+Evaluate many (rsi_period, oversold, overbought, ema_period) variants in
+one broadcast pass for live shadow tracking.
+
+RSI is computed once per distinct period and EMA once per distinct span
+(through the shared indicator graph); thresholds are broadcast across
+the grid, so cost grows with the number of distinct windows rather than
+the number of variants.
+"""
+
+import itertools
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ..indicators import dag
+from .base import BatchSignalResult, IndicatorValues, StrategyPlugin
+
+
+@dataclass(frozen=True)
+class ParamSet:
+    """One strategy variant."""
+    rsi_period: int = 14
+    rsi_oversold: float = 30.0
+    rsi_overbought: float = 70.0
+    ema_period: int = 200
+
+
+@dataclass
+class EnsembleSignals:
+    """Per-variant signals; arrays are (variants, symbols)."""
+    params: List[ParamSet]
+    signal: np.ndarray      # int8 codes: 1 long, -1 short, 0 hold
+    confidence: np.ndarray
+    rsi: np.ndarray
+    price: np.ndarray       # (symbols,)
+    atr: np.ndarray         # (symbols,)
+
+    def variant(self, i: int) -> BatchSignalResult:
+        """Signals of variant i in the single-strategy format."""
+        return BatchSignalResult(
+            signal=self.signal[i],
+            confidence=self.confidence[i],
+            price=self.price,
+            rsi=self.rsi[i],
+            atr=self.atr
+        )
+
+    def long_counts(self) -> np.ndarray:
+        """Number of symbols with a LONG signal, per variant."""
+        return np.count_nonzero(self.signal == 1, axis=1)
+
+
+class RSIMomentumEnsemble(StrategyPlugin):
+    """
+    Grid of RSIMomentumStrategy variants evaluated together.
+
+    As a StrategyPlugin it trades `live_variant` (index into params) and
+    exposes every variant through `decide_variants`.
+    """
+
+    name = "rsi_ensemble"
+
+    def __init__(self, params: Sequence[ParamSet], timeframe: str = "1h", live_variant: int = 0,
+                 name: Optional[str] = None):
+        if not params:
+            raise ValueError("Ensemble needs at least one parameter set")
+        self.name = name or type(self).name
+        self.params = list(params)
+        self.timeframe = timeframe
+        self.live_variant = live_variant
+
+        # Distinct windows, and each variant's index into them
+        self.rsi_periods = sorted({p.rsi_period for p in self.params})
+        self.ema_periods = sorted({p.ema_period for p in self.params})
+        self._rsi_idx = np.array([self.rsi_periods.index(p.rsi_period) for p in self.params])
+        self._ema_idx = np.array([self.ema_periods.index(p.ema_period) for p in self.params])
+
+        # Thresholds as (variants, 1) columns for broadcasting over symbols
+        self._oversold = np.array([p.rsi_oversold for p in self.params], dtype=float)[:, None]
+        self._overbought = np.array([p.rsi_overbought for p in self.params], dtype=float)[:, None]
+
+        self._graph = dag.IndicatorGraph(self.required_indicators())
+
+    @classmethod
+    def grid(
+        cls,
+        rsi_periods: Iterable[int] = (14,),
+        oversold: Iterable[float] = (30.0,),
+        overbought: Iterable[float] = (70.0,),
+        ema_periods: Iterable[int] = (200,),
+        **kwargs
+    ) -> "RSIMomentumEnsemble":
+        """Cartesian product of parameter values."""
+        params = [ParamSet(r, lo, hi, e) for r, lo, hi, e in
+                  itertools.product(rsi_periods, oversold, overbought, ema_periods)]
+        return cls(params, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def warmup_bars(self, tolerance: float = 1e-3) -> int:
+        """RSIMomentumStrategy.warmup_bars for the longest EMA in the grid."""
+        decay = 1.0 - 2.0 / (max(self.ema_periods) + 1)
+        return max(250, int(np.ceil(np.log(tolerance) / np.log(decay))))
+
+    def required_indicators(self) -> List[dag.IndicatorSpec]:
+        return ([dag.rsi(p) for p in self.rsi_periods]
+                + [dag.ema(p) for p in self.ema_periods]
+                + [dag.atr(14)])
+
+    def decide_variants(self, values: IndicatorValues) -> EnsembleSignals:
+        """Signals of every variant on the last bar."""
+        price = values[dag.close()][-1]
+        if price.ndim == 0:
+            price = price.reshape(1)
+
+        # (distinct windows, symbols) -> gathered to (variants, symbols)
+        rsi_stack = np.stack([np.atleast_1d(values[dag.rsi(p)][-1]) for p in self.rsi_periods])
+        ema_stack = np.stack([np.atleast_1d(values[dag.ema(p)][-1]) for p in self.ema_periods])
+        rsi = rsi_stack[self._rsi_idx]
+        ema = ema_stack[self._ema_idx]
+
+        with np.errstate(invalid="ignore"):
+            long = (rsi < self._oversold) & (price > ema)
+            short = ~long & (rsi > self._overbought) & (price < ema)
+            confidence = np.where(
+                long, np.minimum(1.0, (self._oversold - rsi) / 20),
+                np.where(short, np.minimum(1.0, (rsi - self._overbought) / 20), 0.0)
+            )
+
+        return EnsembleSignals(
+            params=self.params,
+            signal=long.astype(np.int8) - short.astype(np.int8),
+            confidence=confidence,
+            rsi=rsi,
+            price=price,
+            atr=np.atleast_1d(values[dag.atr(14)][-1])
+        )
+
+    def evaluate(self, close: np.ndarray, high: np.ndarray, low: np.ndarray) -> EnsembleSignals:
+        """Compute indicators for a (bars, symbols) panel and evaluate all variants."""
+        values = self._graph.compute({"close": close, "high": high, "low": low})
+        return self.decide_variants(values)
+
+    def decide(self, values: IndicatorValues) -> BatchSignalResult:
+        return self.decide_variants(values).variant(self.live_variant)
+
+
+class ShadowBook:
+    """
+    Hypothetical long-only positions for every ensemble variant.
+
+    Applies each bar's per-variant signals with the live exit rules of
+    RSIMomentumStrategy.check_exit: RSI >= 50, or a close more than 3x
+    the current bar's ATR below entry. Variants can thus be compared
+    live without placing orders.
+    """
+
+    def __init__(self, ensemble: RSIMomentumEnsemble, n_symbols: int):
+        shape = (len(ensemble), n_symbols)
+        self.ensemble = ensemble
+        self.entry_price = np.full(shape, np.nan)
+        self.realized_return = np.zeros(len(ensemble))
+        self.trades = np.zeros(len(ensemble), dtype=np.int64)
+        self.wins = np.zeros(len(ensemble), dtype=np.int64)
+
+    def update(self, signals: EnsembleSignals):
+        """Apply one closed bar of ensemble signals."""
+        price = signals.price[None, :]
+        is_open = ~np.isnan(self.entry_price)
+
+        with np.errstate(invalid="ignore"):
+            # Stop distance from this bar's ATR, as the live check_exit does
+            stop = self.entry_price - 3 * signals.atr[None, :]
+            exit_now = is_open & ((signals.rsi >= 50) | (price < stop))
+            trade_return = np.where(exit_now, price / self.entry_price - 1.0, 0.0)
+
+        self.realized_return += trade_return.sum(axis=1)
+        self.trades += exit_now.sum(axis=1)
+        self.wins += (exit_now & (trade_return > 0)).sum(axis=1)
+        self.entry_price[exit_now] = np.nan
+
+        enter = (signals.signal == 1) & np.isnan(self.entry_price) & ~exit_now
+        self.entry_price[enter] = np.broadcast_to(price, enter.shape)[enter]
+
+    def leaderboard(self, top: Optional[int] = None) -> List[tuple]:
+        """(params, realized return, trades, win rate) sorted by return."""
+        order = np.argsort(-self.realized_return)
+        if top is not None:
+            order = order[:top]
+        return [
+            (self.ensemble.params[i], float(self.realized_return[i]), int(self.trades[i]),
+             float(self.wins[i] / self.trades[i]) if self.trades[i] else 0.0)
+            for i in order
+        ]
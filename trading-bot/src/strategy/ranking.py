@@ -0,0 +1,104 @@
+"""
+VAYU Trading Bot - Cross-Sectional Ranking
+==========================================
+Score every symbol's entry signal on the same bar and take the best k.
+
+Scores combine how deep RSI sits below the oversold line with how far
+price is above its trend EMA. Selection uses np.argpartition, which is
+O(n) in the universe size; only the k winners are sorted, so ranking
+hundreds of symbols per bar never does a full sort.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .base import BatchSignalResult
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Non-finite scores (NaN, -inf) are never selected, so fewer than k
+    indices may be returned.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    candidates = np.flatnonzero(np.isfinite(scores))
+    k = min(int(k), len(candidates))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    values = scores[candidates]
+    if k < len(candidates):
+        part = np.argpartition(-values, k - 1)[:k]
+        candidates, values = candidates[part], values[part]
+    return candidates[np.argsort(-values, kind="stable")]
+
+
+@dataclass
+class RankedEntry:
+    """One selected entry."""
+    index: int          # Column in the panel
+    strategy: str       # Strategy whose signal was ranked
+    score: float
+
+
+class CrossSectionalRanker:
+    """
+    Ranks LONG signals across the universe.
+
+    score = rsi_weight * (oversold - rsi) / oversold
+          + trend_weight * (price / ema - 1)
+
+    Both terms are fractions: 0.5 means RSI halfway from the oversold
+    line to zero, or price 50% above the EMA.
+    """
+
+    def __init__(self, oversold: float = 30.0, rsi_weight: float = 1.0, trend_weight: float = 1.0):
+        self.oversold = oversold
+        self.rsi_weight = rsi_weight
+        self.trend_weight = trend_weight
+
+    def score(self, batch: BatchSignalResult) -> np.ndarray:
+        """Score per column; -inf where there is no LONG signal."""
+        n = len(batch)
+        depth = (self.oversold - batch.rsi) / self.oversold if batch.rsi is not None else np.zeros(n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trend = batch.price / batch.ema200 - 1.0 if batch.ema200 is not None else np.zeros(n)
+            score = self.rsi_weight * depth + self.trend_weight * trend
+
+        score = np.where(np.isnan(score), 0.0, score)
+        return np.where(batch.signal == 1, score, -np.inf)
+
+    def select(
+        self,
+        results: Dict[str, BatchSignalResult],
+        k: int,
+        eligible: Optional[np.ndarray] = None
+    ) -> List[RankedEntry]:
+        """
+        Best k LONG entries across one or more strategies' signals.
+
+        Args:
+            results: strategy name -> signals on the same panel
+            k: Number of entries wanted (e.g. free position slots)
+            eligible: Optional bool mask of columns that may be entered
+
+        Returns:
+            Entries best first; a symbol signalled by several strategies
+            appears once, under its highest-scoring strategy
+        """
+        if not results or k <= 0:
+            return []
+
+        names = list(results)
+        scores = np.stack([self.score(results[name]) for name in names])
+        owner = np.argmax(scores, axis=0)
+        best = scores[owner, np.arange(scores.shape[1])]
+        if eligible is not None:
+            best = np.where(eligible, best, -np.inf)
+
+        return [RankedEntry(index=int(j), strategy=names[owner[j]], score=float(best[j]))
+                for j in top_k(best, k)]
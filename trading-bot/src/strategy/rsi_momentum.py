@@ -2,29 +2,22 @@
 VAYU Trading Bot - RSI Momentum Strategy
 =========================================
 Signal generation using RSI with trend filter.
-(Manual indicator calculations - no pandas-ta dependency)
+(Indicators from the shared kernel library - no pandas-ta dependency)
 """
 
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass
-from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
-class Signal(Enum):
-    LONG = "long"
-    SHORT = "short"
-    HOLD = "hold"
+from ..indicators import dag, kernels
+from ..indicators.streaming import IndicatorSnapshot, StreamingIndicators
+from .base import (
+    BatchSignalResult, IndicatorValues, POSITION_CODES, SIGNAL_CODES,
+    Signal, SignalResult, StrategyPlugin
+)
+from .triggers import TriggerBook, TriggerLevels
 
-@dataclass
-class SignalResult:
-    signal: Signal
-    rsi: float
-    price: float
-    ema200: float
-    confidence: float  # 0.0 to 1.0
-
-class RSIMomentumStrategy:
+class RSIMomentumStrategy(StrategyPlugin):
     """
     RSI Momentum Strategy with trend filter.
     
@@ -32,52 +25,93 @@ class RSIMomentumStrategy:
     Short: RSI > 70 and price < EMA(200)
     """
     
+    name = "rsi_momentum"
+    
     def __init__(
         self,
         rsi_period: int = 14,
         rsi_overbought: float = 70.0,
         rsi_oversold: float = 30.0,
         ema_period: int = 200,
-        timeframe: str = "1h"
+        timeframe: str = "1h",
+        name: Optional[str] = None
     ):
+        self.name = name or type(self).name   # Distinct names load several parameterizations
         self.rsi_period = rsi_period
         self.rsi_overbought = rsi_overbought
         self.rsi_oversold = rsi_oversold
         self.ema_period = ema_period
         self.timeframe = timeframe
-    
-    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate RSI manually."""
-        delta = prices.diff()
         
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
+        # Per-symbol incremental state for the live loop
+        self.indicators = StreamingIndicators(rsi_period, ema_period, atr_period=14)
+        
+        # Trigger prices for tick-level checks, refreshed by update_indicators
+        self.triggers = TriggerBook()
         
-        avg_gain = gain.ewm(com=period-1, min_periods=period).mean()
-        avg_loss = loss.ewm(com=period-1, min_periods=period).mean()
+        self._graph = dag.IndicatorGraph(self.required_indicators())
+    
+    def warmup_bars(self, tolerance: float = 1e-3) -> int:
+        """
+        Bars after which the EMA's weight on its starting value is below
+        `tolerance` (691 for EMA 200; Kraken serves 720 per request).
+        RSI and ATR decay faster, so this bounds all three.
+        """
+        decay = 1.0 - 2.0 / (self.ema_period + 1)
+        return max(250, int(np.ceil(np.log(tolerance) / np.log(decay))))
+    
+    def required_indicators(self) -> List[dag.IndicatorSpec]:
+        """Indicators declared to the StrategyEngine."""
+        return [dag.rsi(self.rsi_period), dag.ema(self.ema_period), dag.atr(14)]
+    
+    def decide(self, values: IndicatorValues) -> BatchSignalResult:
+        """Entry signals from precomputed (bars, symbols) indicator arrays."""
+        price = values[dag.close()][-1]
+        rsi = values[dag.rsi(self.rsi_period)][-1]
+        ema = values[dag.ema(self.ema_period)][-1]
         
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        codes, confidence = self.evaluate_arrays(price, rsi, ema)
         
-        return rsi
+        return BatchSignalResult(
+            signal=codes,
+            confidence=confidence,
+            price=price,
+            rsi=rsi,
+            ema200=ema,
+            atr=values[dag.atr(14)][-1]
+        )
+    
+    def decide_exits(
+        self,
+        values: IndicatorValues,
+        entry_price: np.ndarray,
+        position: np.ndarray
+    ) -> np.ndarray:
+        """Exit flags from precomputed indicator arrays."""
+        return self._exit_arrays(
+            values[dag.rsi(self.rsi_period)][-1], values[dag.atr(14)][-1],
+            values[dag.close()][-1], np.asarray(entry_price, dtype=float), np.asarray(position)
+        )
+    
+    def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
+        """Calculate RSI (shared kernel, pandas ewm semantics)."""
+        return pd.Series(kernels.rsi(prices.to_numpy(), period), index=prices.index)
     
     def _calculate_ema(self, prices: pd.Series, period: int) -> pd.Series:
-        """Calculate EMA manually."""
-        return prices.ewm(span=period, adjust=False).mean()
+        """Calculate EMA (shared kernel)."""
+        return pd.Series(kernels.ema(prices.to_numpy(), period), index=prices.index)
     
     def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average True Range."""
-        high_low = df["high"] - df["low"]
-        high_close = np.abs(df["high"] - df["close"].shift())
-        low_close = np.abs(df["low"] - df["close"].shift())
-        
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.ewm(span=period, adjust=False).mean()
-        
-        return atr
+        atr = kernels.atr(
+            df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), period
+        )
+        return pd.Series(atr, index=df.index)
     
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add RSI and EMA indicators to dataframe."""
+        """
+        Add RSI and EMA indicators to dataframe.
+        """
         df = df.copy()
         
         # Calculate RSI
@@ -104,36 +138,101 @@ class RSIMomentumStrategy:
         df = self.calculate_indicators(df)
         latest = df.iloc[-1]
         
-        price = latest["close"]
-        rsi = latest["rsi"]
-        ema = latest[f"ema_{self.ema_period}"]
-        
-        # Determine trend
-        in_uptrend = price > ema
-        in_downtrend = price < ema
-        
-        # Generate signal
-        if rsi < self.rsi_oversold and in_uptrend:
-            signal = Signal.LONG
-            # Confidence: deeper oversold = higher confidence
-            confidence = min(1.0, (self.rsi_oversold - rsi) / 20)
-        elif rsi > self.rsi_overbought and in_downtrend:
-            signal = Signal.SHORT
-            # Confidence: higher overbought = higher confidence
-            confidence = min(1.0, (rsi - self.rsi_overbought) / 20)
-        else:
-            signal = Signal.HOLD
-            confidence = 0.0
+        return self._evaluate(latest["close"], latest["rsi"], latest[f"ema_{self.ema_period}"])
+    
+    def _evaluate(self, price: float, rsi: float, ema: float) -> SignalResult:
+        """Apply entry rules to one bar's indicator values."""
+        codes, confidence = self.evaluate_arrays(
+            np.array([price], dtype=float), np.array([rsi], dtype=float), np.array([ema], dtype=float)
+        )
         
         return SignalResult(
-            signal=signal,
+            signal=SIGNAL_CODES[int(codes[0])],
             rsi=rsi,
             price=price,
             ema200=ema,
-            confidence=confidence
+            confidence=float(confidence[0])
         )
     
-    def check_exit(self, df: pd.DataFrame, entry_price: float, position_type: Signal) -> bool:
+    def evaluate_arrays(
+        self,
+        price: np.ndarray,
+        rsi: np.ndarray,
+        ema: np.ndarray
+    ) -> tuple:
+        """
+        Apply entry rules element-wise.
+        
+        Returns:
+            (signal codes as int8, confidence) arrays shaped like price
+        """
+        with np.errstate(invalid="ignore"):
+            # Long: oversold in an uptrend; Short: overbought in a downtrend
+            long = (rsi < self.rsi_oversold) & (price > ema)
+            short = ~long & (rsi > self.rsi_overbought) & (price < ema)
+            
+            # Confidence: deeper oversold / higher overbought = higher confidence
+            confidence = np.where(
+                long, np.minimum(1.0, (self.rsi_oversold - rsi) / 20),
+                np.where(short, np.minimum(1.0, (rsi - self.rsi_overbought) / 20), 0.0)
+            )
+        
+        codes = long.astype(np.int8) - short.astype(np.int8)
+        return codes, confidence
+    
+    def generate_signals_batch(
+        self,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        symbols: Optional[List[str]] = None
+    ) -> BatchSignalResult:
+        """
+        Generate signals for a whole universe in one vectorized pass.
+        
+        Args:
+            close, high, low: (bars, symbols) panels, oldest bar first;
+                missing bars as NaN; float32 panels are evaluated in float32
+            symbols: Optional column labels
+            
+        Returns:
+            BatchSignalResult for the last row of the panel
+        """
+        close = kernels.as_precision(close)
+        if close.ndim != 2:
+            raise ValueError("generate_signals_batch expects (bars, symbols) panels")
+        
+        values = self._graph.compute({"close": close, "high": high, "low": low})
+        batch = self.decide(values)
+        batch.symbols = list(symbols) if symbols is not None else None
+        return batch
+    
+    def check_exits_batch(
+        self,
+        batch: BatchSignalResult,
+        entry_price: np.ndarray,
+        position: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized check_exit over a universe.
+        
+        Args:
+            batch: Result of generate_signals_batch
+            entry_price: Entry price per column (ignored where flat)
+            position: Position codes per column (1 long, -1 short, 0 flat)
+            
+        Returns:
+            Boolean array, True where the open position should exit
+        """
+        return self._exit_arrays(batch.rsi, batch.atr, batch.price,
+                                 np.asarray(entry_price, dtype=float), np.asarray(position))
+    
+    def check_exit(
+        self,
+        df: pd.DataFrame,
+        entry_price: float,
+        position_type: Signal
+    ) -> bool:
         """
         Check if position should be exited.
         
@@ -145,26 +244,109 @@ class RSIMomentumStrategy:
         df = self.calculate_indicators(df)
         latest = df.iloc[-1]
         
-        rsi = latest["rsi"]
-        atr = latest["atr"]
-        current_price = latest["close"]
-        
-        # Mean reversion exit
-        if position_type == Signal.LONG and rsi >= 50:
-            return True
-        if position_type == Signal.SHORT and rsi <= 50:
-            return True
-        
-        # Stop loss (3x ATR)
-        stop_distance = 3 * atr
-        if position_type == Signal.LONG:
-            if current_price < (entry_price - stop_distance):
-                return True
-        else:  # SHORT
-            if current_price > (entry_price + stop_distance):
-                return True
-        
-        return False
+        return self._exit_triggered(
+            latest["rsi"], latest["atr"], latest["close"], entry_price, position_type
+        )
+    
+    def _exit_triggered(
+        self,
+        rsi: float,
+        atr: float,
+        current_price: float,
+        entry_price: float,
+        position_type: Signal
+    ) -> bool:
+        """Apply exit rules to one bar's indicator values."""
+        position = POSITION_CODES.get(position_type, 0)
+        return bool(self._exit_arrays(
+            np.array([rsi], dtype=float), np.array([atr], dtype=float),
+            np.array([current_price], dtype=float), np.array([entry_price], dtype=float),
+            np.array([position])
+        )[0])
+    
+    def _exit_arrays(
+        self,
+        rsi: np.ndarray,
+        atr: np.ndarray,
+        current_price: np.ndarray,
+        entry_price: np.ndarray,
+        position: np.ndarray
+    ) -> np.ndarray:
+        """Apply exit rules element-wise (position: 1 long, -1 short, 0 flat)."""
+        is_long = position == 1
+        is_short = position == -1
+        
+        with np.errstate(invalid="ignore"):
+            # Mean reversion exit
+            mean_reverted = (is_long & (rsi >= 50)) | (is_short & (rsi <= 50))
+            
+            # Stop loss (3x ATR)
+            stop_distance = 3 * atr
+            stopped = (
+                (is_long & (current_price < entry_price - stop_distance))
+                | (is_short & (current_price > entry_price + stop_distance))
+            )
+        
+        return mean_reverted | stopped
+    
+    def update_indicators(self, symbol: str, df: pd.DataFrame) -> IndicatorSnapshot:
+        """
+        Advance streaming indicators for a symbol from a candle frame.
+        
+        Closed bars not yet seen are applied once; the last (forming)
+        candle is evaluated without mutating state. Trigger levels for
+        the forming bar are republished to `self.triggers`.
+        
+        Args:
+            symbol: Trading pair
+            df: DataFrame with OHLCV data and a timestamp column
+            
+        Returns:
+            IndicatorSnapshot for the latest candle
+        """
+        snapshot = self.indicators.sync(symbol, df)
+        levels = self.trigger_levels(symbol)
+        if levels is not None:
+            self.triggers.publish(levels)
+        return snapshot
+    
+    def trigger_levels(self, symbol: str) -> Optional[TriggerLevels]:
+        """
+        Prices at which the rules fire on the bar after the last closed one.
+        
+        Entry and mean-reversion exit decisions on the forming bar match
+        signal_from_snapshot / exit_from_snapshot exactly; the stop uses
+        the last closed ATR rather than the forming bar's.
+        """
+        state = self.indicators.get_state(symbol)
+        if state is None or state.bars == 0:
+            return None
+        
+        trigger = self.indicators.rsi_trigger_price
+        return TriggerLevels(
+            symbol=symbol,
+            long_below=trigger(symbol, self.rsi_oversold),
+            short_above=trigger(symbol, self.rsi_overbought),
+            mid=trigger(symbol, 50.0),
+            ema=state.ema,
+            atr=state.atr,
+            timestamp=state.last_timestamp
+        )
+    
+    def signal_from_snapshot(self, snapshot: IndicatorSnapshot) -> SignalResult:
+        """Generate trading signal from streaming indicator values."""
+        return self._evaluate(snapshot.close, snapshot.rsi, snapshot.ema)
+    
+    def exit_from_snapshot(
+        self,
+        snapshot: IndicatorSnapshot,
+        entry_price: float,
+        position_type: Signal
+    ) -> bool:
+        """Check exit conditions from streaming indicator values."""
+        return self._exit_triggered(
+            snapshot.rsi, snapshot.atr, snapshot.close, entry_price, position_type
+        )
 
 if __name__ == "__main__":
     # Quick test with sample data
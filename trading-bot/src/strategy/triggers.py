@@ -0,0 +1,104 @@
+"""
+VAYU Trading Bot - Trigger Prices
+=================================
+Price levels, published after each closed bar, at which the RSI momentum
+rules would fire on the forming bar.
+
+Next-bar RSI depends only on the next close (given the closed bars), and
+next-bar EMA sits above the close exactly when the close is above the
+current EMA. Entry and mean-reversion exit rules therefore reduce to
+plain price comparisons, so a tick can be checked without rebuilding a
+candle frame or recomputing indicators.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .base import Signal
+
+
+@dataclass
+class TriggerLevels:
+    """Trigger prices for one symbol's forming bar."""
+    symbol: str
+    long_below: float     # RSI < oversold when close < this
+    short_above: float    # RSI > overbought when close > this
+    mid: float            # RSI >= 50 when close >= this
+    ema: float            # Trend filter: close vs the last closed EMA
+    atr: float            # ATR after the last closed bar
+    stop_atr_multiple: float = 3.0
+    timestamp: Optional[int] = None   # Last closed bar
+
+    def entry_signal(self, price: float) -> Signal:
+        """Entry rule for a tick at `price`."""
+        if self.ema < price < self.long_below:
+            return Signal.LONG
+        if self.short_above < price < self.ema:
+            return Signal.SHORT
+        return Signal.HOLD
+
+    def stop_price(self, entry_price: float, position: Signal) -> float:
+        """ATR stop for a position, using the last closed bar's ATR."""
+        distance = self.stop_atr_multiple * self.atr
+        return entry_price - distance if position == Signal.LONG else entry_price + distance
+
+    def exit_hit(self, price: float, entry_price: float, position: Signal) -> bool:
+        """Mean reversion (RSI back to 50) or ATR stop for a tick at `price`."""
+        stop = self.stop_price(entry_price, position)
+        if position == Signal.LONG:
+            return price >= self.mid or price < stop
+        if position == Signal.SHORT:
+            return price <= self.mid or price > stop
+        return False
+
+
+class TriggerBook:
+    """
+    Latest trigger levels for every symbol.
+
+    Single ticks are a dict lookup plus comparisons; `scan` checks a
+    whole ticker snapshot with array comparisons.
+    """
+
+    def __init__(self):
+        self.levels: Dict[str, TriggerLevels] = {}
+
+    def publish(self, levels: TriggerLevels):
+        self.levels[levels.symbol] = levels
+
+    def get(self, symbol: str) -> Optional[TriggerLevels]:
+        return self.levels.get(symbol)
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def entry_signal(self, symbol: str, price: float) -> Signal:
+        """Entry rule for one tick (HOLD if no levels are published)."""
+        levels = self.levels.get(symbol)
+        return levels.entry_signal(price) if levels else Signal.HOLD
+
+    def exit_hit(self, symbol: str, price: float, entry_price: float, position: Signal) -> bool:
+        """Exit rule for one tick (False if no levels are published)."""
+        levels = self.levels.get(symbol)
+        return levels.exit_hit(price, entry_price, position) if levels else False
+
+    def scan(self, symbols: List[str], prices: np.ndarray) -> np.ndarray:
+        """
+        Entry signal codes (1 long, -1 short, 0 hold) for many ticks at once.
+
+        Symbols without published levels get 0.
+        """
+        fields = np.full((3, len(symbols)), np.nan)
+        for j, symbol in enumerate(symbols):
+            levels = self.levels.get(symbol)
+            if levels:
+                fields[:, j] = (levels.long_below, levels.short_above, levels.ema)
+        long_below, short_above, ema = fields
+        prices = np.asarray(prices, dtype=float)
+
+        with np.errstate(invalid="ignore"):
+            long = (prices > ema) & (prices < long_below)
+            short = ~long & (prices > short_above) & (prices < ema)
+        return long.astype(np.int8) - short.astype(np.int8)
@@ -0,0 +1,382 @@
+"""
+VAYU Trading Bot - Sweep Job Queue
+==================================
+Resumable work queue for long sweeps, in one SQLite file.
+
+A job is a list of independent tasks plus the functions that run them:
+
+- setup(context) -> state       once per job in each worker (load data,
+                                build indicators); the context itself
+                                when no setup is given
+- task_fn(state, payload)       one task -> one picklable result
+- combine(results)              task results, in task order -> final result
+
+Functions are pickled by reference, so they must be module-level and
+importable by every worker. Each finished task's result is written to
+the queue as it completes, which is the checkpoint: a driver or worker
+that dies loses only the tasks it was running. Running tasks hold a
+lease that a heartbeat thread renews; a task whose lease expires (its
+worker crashed or lost the file) goes back to pending and is retried,
+up to max_attempts claims.
+
+Workers on any number of machines can serve the same file over a
+shared filesystem: claims are taken inside an exclusive SQLite
+transaction, so each task runs once at a time. The journal stays in
+rollback (DELETE) mode because WAL needs shared memory, which network
+filesystems do not provide; the filesystem must honour POSIX locks
+(NFSv4, SMB; not some FUSE mounts).
+
+Typical use:
+
+    queue = JobQueue("/shared/sweeps.sqlite")
+    queue.submit(job_id, task_fn, payloads, context=..., setup=..., combine=...)
+    run_local_workers(queue.path, n_workers=8)    # and/or on other machines
+    result = queue.collect(job_id)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def _dumps(obj: Any) -> sqlite3.Binary:
+    return sqlite3.Binary(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class JobQueue:
+    """
+    SQLite-backed task queue with checkpointed results.
+
+    Args:
+        path: Database file (on a shared filesystem for multi-machine runs)
+        lease_seconds: How long a claimed task stays reserved without a
+            heartbeat before another worker may take it over
+        max_attempts: Claims per task before it is marked failed
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "~/.vayu/jobs/sweeps.sqlite",
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        # Autocommit; writes that must be atomic open their own transaction
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=DELETE")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " job_id TEXT PRIMARY KEY, spec BLOB NOT NULL, n_tasks INTEGER NOT NULL,"
+            " created REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " job_id TEXT NOT NULL, task_id INTEGER NOT NULL, payload BLOB NOT NULL,"
+            " status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " worker TEXT, lease_until REAL, result BLOB, error TEXT,"
+            " PRIMARY KEY (job_id, task_id));"
+            "CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, job_id);"
+        )
+
+    def _transaction(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run fn inside BEGIN IMMEDIATE ... COMMIT (write lock held throughout)."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            out = fn(self._conn)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return out
+
+    def submit(
+        self,
+        job_id: str,
+        task_fn: Callable[[Any, Any], Any],
+        payloads: Sequence[Any],
+        context: Any = None,
+        setup: Optional[Callable[[Any], Any]] = None,
+        combine: Optional[Callable[[List[Any]], Any]] = None
+    ) -> bool:
+        """
+        Queue a job's tasks. Submitting an existing job_id is a no-op, so a
+        restarted driver resumes the job instead of starting it over.
+
+        Returns:
+            True if the job was created, False if it already existed
+        """
+        spec = _dumps({"task_fn": task_fn, "setup": setup, "combine": combine, "context": context})
+        rows = [(job_id, i, _dumps(p), PENDING) for i, p in enumerate(payloads)]
+
+        def insert(conn):
+            existing = conn.execute("SELECT n_tasks FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if existing is not None:
+                if existing[0] != len(rows):
+                    raise ValueError(f"Job {job_id!r} exists with {existing[0]} tasks, not {len(rows)}")
+                return False
+            conn.execute("INSERT INTO jobs (job_id, spec, n_tasks, created) VALUES (?, ?, ?, ?)",
+                         (job_id, spec, len(rows), time.time()))
+            conn.executemany("INSERT INTO tasks (job_id, task_id, payload, status) VALUES (?, ?, ?, ?)", rows)
+            return True
+
+        return self._transaction(insert)
+
+    def claim(self, worker: str, job_id: Optional[str] = None) -> Optional[tuple]:
+        """
+        Reserve the next runnable task: pending, or running with an expired lease.
+
+        Returns:
+            (job_id, task_id, payload), or None when nothing is runnable
+        """
+        def take(conn):
+            now = time.time()
+            query = ("SELECT job_id, task_id, payload, attempts FROM tasks"
+                     " WHERE (status = ? OR (status = ? AND lease_until < ?))")
+            params = [PENDING, RUNNING, now]
+            if job_id is not None:
+                query += " AND job_id = ?"
+                params.append(job_id)
+            query += " ORDER BY job_id, task_id LIMIT 1"
+            while True:
+                row = conn.execute(query, params).fetchone()
+                if row is None:
+                    return None
+                jid, tid, payload, attempts = row
+                if attempts >= self.max_attempts:
+                    # Expired on its last attempt: the worker died every time
+                    conn.execute("UPDATE tasks SET status = ?, error = COALESCE(error, ?)"
+                                 " WHERE job_id = ? AND task_id = ?",
+                                 (FAILED, "lease expired", jid, tid))
+                    continue
+                conn.execute(
+                    "UPDATE tasks SET status = ?, worker = ?, lease_until = ?, attempts = attempts + 1"
+                    " WHERE job_id = ? AND task_id = ?",
+                    (RUNNING, worker, now + self.lease_seconds, jid, tid)
+                )
+                return jid, tid, pickle.loads(payload)
+
+        return self._transaction(take)
+
+    def heartbeat(self, job_id: str, task_id: int, worker: str) -> bool:
+        """Extend a running task's lease; False if the worker no longer holds it."""
+        cur = self._conn.execute(
+            "UPDATE tasks SET lease_until = ? WHERE job_id = ? AND task_id = ? AND status = ? AND worker = ?",
+            (time.time() + self.lease_seconds, job_id, task_id, RUNNING, worker)
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: str, task_id: int, worker: str, result: Any) -> bool:
+        """
+        Checkpoint a task's result. A worker whose lease was taken over
+        still stores its result if the task is not done yet (same task,
+        same answer); a finished task is never overwritten.
+        """
+        cur = self._conn.execute(
+            "UPDATE tasks SET status = ?, result = ?, worker = ?, error = NULL"
+            " WHERE job_id = ? AND task_id = ? AND status != ?",
+            (DONE, _dumps(result), worker, job_id, task_id, DONE)
+        )
+        return cur.rowcount == 1
+
+    def fail(self, job_id: str, task_id: int, worker: str, error: str):
+        """Record a task error; the task is retried until max_attempts claims."""
+        self._conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, error = ?, lease_until = NULL"
+            " WHERE job_id = ? AND task_id = ? AND status = ? AND worker = ?",
+            (self.max_attempts, FAILED, PENDING, error, job_id, task_id, RUNNING, worker)
+        )
+
+    def retry_failed(self, job_id: str) -> int:
+        """Put a job's failed tasks back in the queue with fresh attempts."""
+        cur = self._transaction(lambda conn: conn.execute(
+            "UPDATE tasks SET status = ?, attempts = 0, lease_until = NULL WHERE job_id = ? AND status = ?",
+            (PENDING, job_id, FAILED)
+        ))
+        return cur.rowcount
+
+    def spec(self, job_id: str) -> Dict:
+        """The job's functions and context."""
+        row = self._conn.execute("SELECT spec FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown job {job_id!r}")
+        return pickle.loads(row[0])
+
+    def jobs(self) -> List[str]:
+        return [r[0] for r in self._conn.execute("SELECT job_id FROM jobs ORDER BY created")]
+
+    def progress(self, job_id: str) -> Dict[str, int]:
+        """Task counts by status."""
+        counts = dict.fromkeys((PENDING, RUNNING, DONE, FAILED), 0)
+        for status, n in self._conn.execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY status", (job_id,)
+        ):
+            counts[status] = n
+        return counts
+
+    def is_finished(self, job_id: str) -> bool:
+        """True once every task is done or failed."""
+        counts = self.progress(job_id)
+        return counts[PENDING] == counts[RUNNING] == 0
+
+    def errors(self, job_id: str) -> Dict[int, str]:
+        """Last error of each failed task."""
+        return dict(self._conn.execute(
+            "SELECT task_id, error FROM tasks WHERE job_id = ? AND status = ? ORDER BY task_id", (job_id, FAILED)
+        ).fetchall())
+
+    def results(self, job_id: str) -> List[Any]:
+        """Checkpointed results in task order (tasks not done are skipped)."""
+        return [pickle.loads(r[0]) for r in self._conn.execute(
+            "SELECT result FROM tasks WHERE job_id = ? AND status = ? ORDER BY task_id", (job_id, DONE)
+        )]
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll_interval: float = 1.0) -> bool:
+        """Block until the job is finished; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_finished(job_id):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def collect(self, job_id: str) -> Any:
+        """
+        combine() of the job's results (the list itself without combine).
+
+        Raises:
+            RuntimeError: If tasks are still pending/running or have failed
+        """
+        counts = self.progress(job_id)
+        if counts[FAILED]:
+            raise RuntimeError(f"Job {job_id!r}: {counts[FAILED]} task(s) failed: {self.errors(job_id)}")
+        if counts[PENDING] or counts[RUNNING]:
+            raise RuntimeError(f"Job {job_id!r} is not finished: {counts}")
+        results = self.results(job_id)
+        combine = self.spec(job_id)["combine"]
+        return combine(results) if combine is not None else results
+
+    def close(self):
+        self._conn.close()
+
+
+class _Heartbeat(threading.Thread):
+    """Renews a task's lease every lease_seconds / 3 while it runs."""
+
+    def __init__(self, path: Path, lease_seconds: float, job_id: str, task_id: int, worker: str):
+        super().__init__(daemon=True)
+        self.args = (path, lease_seconds, job_id, task_id, worker)
+        self.stopped = threading.Event()
+
+    def run(self):
+        path, lease_seconds, job_id, task_id, worker = self.args
+        queue = JobQueue(path, lease_seconds=lease_seconds)
+        try:
+            while not self.stopped.wait(lease_seconds / 3):
+                if not queue.heartbeat(job_id, task_id, worker):
+                    break
+        finally:
+            queue.close()
+
+
+def run_worker(
+    path: Union[str, Path],
+    job_id: Optional[str] = None,
+    worker: Optional[str] = None,
+    lease_seconds: float = 300.0,
+    max_attempts: int = 3,
+    poll_interval: float = 1.0,
+    idle_timeout: float = 0.0,
+    max_tasks: Optional[int] = None
+) -> int:
+    """
+    Pull and run tasks until the queue has nothing runnable.
+
+    Args:
+        path: Queue database
+        job_id: Only serve this job (default: any)
+        worker: Worker name (default host:pid)
+        lease_seconds, max_attempts: See JobQueue
+        poll_interval: Seconds between claims while waiting for work
+        idle_timeout: Keep polling this long for new work (e.g. tasks
+            whose lease may still expire) before exiting
+        max_tasks: Stop after this many tasks
+
+    Returns:
+        Number of tasks completed
+    """
+    queue = JobQueue(path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    states: Dict[str, tuple] = {}
+    done = 0
+    idle_since = None
+    try:
+        while max_tasks is None or done < max_tasks:
+            claimed = queue.claim(worker, job_id)
+            if claimed is None:
+                idle_since = idle_since or time.monotonic()
+                if time.monotonic() - idle_since >= idle_timeout:
+                    break
+                time.sleep(poll_interval)
+                continue
+            idle_since = None
+            jid, tid, payload = claimed
+
+            heartbeat = _Heartbeat(queue.path, lease_seconds, jid, tid, worker)
+            heartbeat.start()
+            try:
+                if jid not in states:
+                    # Setup once per job per worker, not per task
+                    spec = queue.spec(jid)
+                    setup = spec["setup"]
+                    state = setup(spec["context"]) if setup is not None else spec["context"]
+                    states[jid] = (spec["task_fn"], state)
+                task_fn, state = states[jid]
+                result = task_fn(state, payload)
+            except Exception as e:
+                queue.fail(jid, tid, worker, f"{type(e).__name__}: {e}")
+                continue
+            finally:
+                heartbeat.stopped.set()
+                heartbeat.join()
+            queue.complete(jid, tid, worker, result)
+            done += 1
+    finally:
+        queue.close()
+    return done
+
+
+def run_local_workers(path: Union[str, Path], n_workers: Optional[int] = None, **worker_kwargs) -> int:
+    """
+    Serve a queue with worker processes on this machine.
+
+    Args:
+        path: Queue database
+        n_workers: Worker processes; 1 runs in this process, None or -1
+            uses every core
+        **worker_kwargs: run_worker options
+
+    Returns:
+        Number of tasks completed by these workers
+    """
+    if n_workers is None or n_workers < 0:
+        n_workers = os.cpu_count() or 1
+    if n_workers <= 1:
+        return run_worker(path, **worker_kwargs)
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(run_worker, path, **worker_kwargs) for _ in range(n_workers)]
+        return sum(f.result() for f in futures)
@@ -0,0 +1,102 @@
+"""
+VAYU Trading Bot - Memoization
+==============================
+Bounded LRU cache with hit/miss accounting.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+
+@dataclass
+class CacheStats:
+    """Counters for one cache."""
+    name: str
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.name}: {self.hit_rate:.0%} hit rate "
+                f"({self.hits} hits / {self.misses} misses, {self.size}/{self.max_entries} entries)")
+
+
+class LRUCache:
+    """
+    Least-recently-used cache with a fixed number of entries.
+    """
+
+    def __init__(self, max_entries: int = 256, name: str = "cache"):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.name = name
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a key, counting the hit or miss."""
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value: Any):
+        """Insert or refresh a key, evicting the oldest entry if full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss."""
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Look up a key without counting it or refreshing its recency."""
+        return self._data.get(key, default)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove a key without counting a lookup."""
+        return self._data.pop(key, None)
+
+    def clear(self):
+        """Drop all entries (counters are kept)."""
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters."""
+        return CacheStats(
+            name=self.name,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._data),
+            max_entries=self.max_entries
+        )
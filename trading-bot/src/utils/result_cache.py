@@ -0,0 +1,159 @@
+"""
+VAYU Trading Bot - Persistent Result Cache
+==========================================
+Content-addressed, size-bounded store for backtest results.
+
+Keys are hashes of everything a result depends on (input data digest,
+strategy version, parameters, cost settings), built with `make_key`, so
+an unchanged research question is answered from disk without touching
+the simulator, and any change to data or settings is a different key.
+Values are pickled into a single SQLite file; when the total size
+exceeds `max_bytes` the least recently used entries are evicted.
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Union
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+
+def make_key(**parts) -> str:
+    """Stable hex key for keyword parts (ranges, tuples and numpy scalars allowed)."""
+    def default(obj):
+        if isinstance(obj, (range, tuple, set, np.ndarray)):
+            return list(obj)
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return str(obj)
+    payload = json.dumps(parts, sort_keys=True, default=default, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def data_digest(*items: Union[np.ndarray, pd.Series, pd.DataFrame, None]) -> str:
+    """Content hash of arrays / pandas objects (values, shape, dtype and index)."""
+    h = hashlib.sha256()
+    for item in items:
+        if item is None:
+            h.update(b"none")
+            continue
+        if isinstance(item, (pd.Series, pd.DataFrame)):
+            index = item.index
+            if isinstance(index, pd.DatetimeIndex):
+                h.update(index.as_unit("ns").asi8.tobytes())
+            else:
+                h.update(np.asarray(index).tobytes())
+            if isinstance(item, pd.DataFrame):
+                h.update(json.dumps([str(c) for c in item.columns]).encode())
+            item = item.to_numpy()
+        arr = np.ascontiguousarray(item)
+        h.update(f"{arr.dtype.str}{arr.shape}".encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent LRU cache of picklable results in SQLite.
+
+    Args:
+        path: Database file
+        max_bytes: Bound on the total pickled size; least recently used
+            entries are evicted beyond it
+        name: Label for stats
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = "~/.vayu/cache/backtest_results.sqlite",
+        max_bytes: int = 256 * 1024 * 1024,
+        name: str = "backtest results"
+    ):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+                " size INTEGER NOT NULL, accessed INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self._conn.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is not None
+
+    @property
+    def total_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def _next_tick(self) -> int:
+        # Logical clock: strictly increasing, unlike wall time
+        return self._conn.execute("SELECT COALESCE(MAX(accessed), 0) + 1 FROM results").fetchone()[0]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a key, counting the hit or miss and refreshing its recency."""
+        row = self._conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        with self._conn:
+            self._conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (self._next_tick(), key))
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """Store a value, then evict least recently used entries beyond max_bytes."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(blob), len(blob), self._next_tick())
+            )
+            total = self.total_bytes
+            for old_key, size in self._conn.execute(
+                "SELECT key, size FROM results WHERE key != ? ORDER BY accessed", (key,)
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM results WHERE key = ?", (old_key,))
+                total -= size
+                self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the stored value for key, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self):
+        self._conn.close()
+
+    def __str__(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return (f"{self.name}: {rate:.0%} hit rate ({self.hits} hits / {self.misses} misses, "
+                f"{len(self)} entries, {self.total_bytes / 1e6:.1f}/{self.max_bytes / 1e6:.0f} MB)")
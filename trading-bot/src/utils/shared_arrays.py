@@ -0,0 +1,77 @@
+"""
+VAYU Trading Bot - Shared-Memory Arrays
+=======================================
+Publish NumPy arrays once in a shared-memory block so pool workers can
+attach to them by name instead of receiving a pickled copy per task.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Mapping, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedArraysSpec:
+    """Picklable handle: block name plus each array's layout."""
+    name: str
+    layout: Tuple[Tuple[str, int, Tuple[int, ...], str], ...]   # (key, offset, shape, dtype)
+
+
+class SharedArrays:
+    """
+    Owner of a shared-memory block holding named arrays.
+
+    Use as a context manager in the parent; the block is unlinked on exit.
+    Workers call `SharedArrays.attach(spec)`.
+    """
+
+    def __init__(self, arrays: Mapping[str, np.ndarray]):
+        layout = []
+        offset = 0
+        for key, arr in arrays.items():
+            arr = np.asarray(arr)
+            offset = -(-offset // 64) * 64   # Cache-line aligned
+            layout.append((key, offset, arr.shape, arr.dtype.str))
+            offset += arr.nbytes
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.spec = SharedArraysSpec(name=self._shm.name, layout=tuple(layout))
+        self.arrays = _views(self._shm, self.spec)
+        for key, arr in arrays.items():
+            self.arrays[key][...] = arr
+
+    @staticmethod
+    def attach(spec: SharedArraysSpec) -> Tuple[shared_memory.SharedMemory, Dict[str, np.ndarray]]:
+        """
+        Map an existing block (zero-copy, read-only views).
+
+        Returns:
+            (SharedMemory handle, arrays); keep the handle alive while the
+            arrays are in use
+        """
+        shm = shared_memory.SharedMemory(name=spec.name)
+        arrays = _views(shm, spec)
+        for arr in arrays.values():
+            arr.flags.writeable = False
+        return shm, arrays
+
+    def close(self):
+        """Release and unlink the block."""
+        self.arrays = {}
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _views(shm: shared_memory.SharedMemory, spec: SharedArraysSpec) -> Dict[str, np.ndarray]:
+    return {
+        key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+        for key, offset, shape, dtype in spec.layout
+    }
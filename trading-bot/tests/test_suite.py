@@ -7,14 +7,76 @@ Unit tests for core components.
 import unittest
 import sys
 import os
+import tempfile
+from unittest import mock
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+
 # Add src to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.strategy.rsi_momentum import RSIMomentumStrategy, Signal
 from src.strategy.risk_engine import RiskEngine, RiskLimits
 from src.strategy.portfolio import PortfolioManager, PairConfig
+from src.indicators import kernels
+from src.indicators.streaming import StreamingIndicators
+from src.indicators.rolling import RollingMax, RollingMin, RollingMoments
+from src.indicators.windowed import WindowedIndicators
+from src.data.price_feed import PriceFeed, build_panel
+from src.data.historical_store import HistoricalStore
+from src.utils.memo import LRUCache
+from src.utils.result_cache import ResultCache, make_key, data_digest
+from src.utils.job_queue import JobQueue, run_local_workers, run_worker
+from src.utils.shared_arrays import SharedArrays
+from src.indicators import dag
+from src.strategy.base import SIGNAL_CODES, BatchSignalResult, StrategyPlugin
+from src.strategy.engine import StrategyEngine
+from src.strategy.ensemble import RSIMomentumEnsemble, ShadowBook
+from src.strategy.ranking import CrossSectionalRanker, top_k
+
+try:
+    import vectorbt  # noqa: F401
+    HAS_VBT = True
+except ImportError:
+    HAS_VBT = False
+
+
+def make_ohlcv(n: int = 250, seed: int = 42, start_price: float = 45000.0) -> pd.DataFrame:
+    """Synthetic hourly OHLCV frame (same shape as PriceFeed.fetch_candles)."""
+    rng = np.random.default_rng(seed)
+    prices = start_price * np.exp(np.cumsum(rng.standard_normal(n) * 0.02))
+    timestamps = 1704067200000 + np.arange(n, dtype=np.int64) * 3_600_000
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "open": prices * (1 + rng.standard_normal(n) * 0.001),
+        "high": prices * (1 + np.abs(rng.standard_normal(n)) * 0.01),
+        "low": prices * (1 - np.abs(rng.standard_normal(n)) * 0.01),
+        "close": prices,
+        "volume": rng.standard_normal(n) * 100 + 1000,
+    })
+
+
+def make_minute_bars(hours: int, seed: int = 0):
+    """Synthetic 1m candles and the 1h candles aggregated from them."""
+    rng = np.random.default_rng(seed)
+    n = hours * 60
+    close = 100 * np.exp(np.cumsum(rng.standard_normal(n) * 0.002))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    high = np.maximum(open_, close) * (1 + np.abs(rng.standard_normal(n)) * 0.0005)
+    low = np.minimum(open_, close) * (1 - np.abs(rng.standard_normal(n)) * 0.0005)
+    timestamps = 1704067200000 + np.arange(n, dtype=np.int64) * 60_000
+    minute = pd.DataFrame({"timestamp": timestamps, "open": open_, "high": high, "low": low,
+                           "close": close, "volume": 1.0})
+    hour = np.arange(n) // 60
+    hourly = pd.DataFrame({
+        "timestamp": timestamps[::60], "open": open_[::60],
+        "high": minute["high"].groupby(hour).max().to_numpy(),
+        "low": minute["low"].groupby(hour).min().to_numpy(),
+        "close": close[59::60], "volume": 60.0
+    })
+    return minute, hourly
 
 
 class TestRSIStrategy(unittest.TestCase):
@@ -23,15 +85,15 @@ class TestRSIStrategy(unittest.TestCase):
     def setUp(self):
         self.strategy = RSIMomentumStrategy(
             rsi_period=14,
-            overbought=70,
-            oversold=30
+            rsi_overbought=70,
+            rsi_oversold=30
         )
     
     def test_signal_enum(self):
         """Test signal types exist."""
-        self.assertEqual(Signal.HOLD.value, 0)
-        self.assertEqual(Signal.LONG.value, 1)
-        self.assertEqual(Signal.SHORT.value, -1)
+        self.assertEqual(Signal.HOLD.value, "hold")
+        self.assertEqual(Signal.LONG.value, "long")
+        self.assertEqual(Signal.SHORT.value, "short")
 
 
 class TestRiskEngine(unittest.TestCase):
@@ -39,9 +101,10 @@ class TestRiskEngine(unittest.TestCase):
     
     def setUp(self):
         self.limits = RiskLimits(
-            max_position_size=1000.0,
+            max_risk_per_trade=0.01,
             max_daily_loss=500.0,
-            max_trades_per_day=10
+            max_positions=3,
+            max_leverage=1.0
         )
         self.engine = RiskEngine(self.limits)
     
@@ -52,13 +115,23 @@ class TestRiskEngine(unittest.TestCase):
             entry_price=50000,
             stop_price=49000
         )
-        self.assertLessEqual(size * 50000, 1000.0)
+        # 1% risk: $100 over a $1000 stop distance
+        self.assertAlmostEqual(size * 1000, 100.0)
+        
+        # Tight stop: capped at max_leverage x balance
+        size = self.engine.calculate_position_size(10000, 50000, 49990)
+        self.assertAlmostEqual(size * 50000, 10000.0)
     
     def test_circuit_breaker(self):
         """Test daily loss circuit breaker."""
         # Simulate daily P&L exceeding limit
-        self.engine.daily_pnl = -600.0
-        self.assertFalse(self.engine.can_trade())
+        self.engine.update_daily_pnl(-600.0)
+        allowed, reason = self.engine.can_open_position("BTC/USD")
+        self.assertFalse(allowed)
+        self.assertEqual(reason, "Daily loss limit hit")
+        
+        self.engine.reset_daily()
+        self.assertTrue(self.engine.can_open_position("BTC/USD")[0])
 
 
 class TestPortfolio(unittest.TestCase):
@@ -84,6 +157,1298 @@ class TestPortfolio(unittest.TestCase):
         self.assertAlmostEqual(total, 10000.0, places=2)
 
 
+class TestStreamingIndicators(unittest.TestCase):
+    """Test incremental indicators against the batch implementation."""
+    
+    def setUp(self):
+        self.strategy = RSIMomentumStrategy()
+        self.df = make_ohlcv(400)
+        self.batch = self.strategy.calculate_indicators(self.df)
+    
+    def test_update_matches_batch(self):
+        """Advancing bar by bar reproduces RSI, EMA and ATR."""
+        engine = StreamingIndicators(rsi_period=14, ema_period=200, atr_period=14)
+        engine.warm_up("BTC/USD", self.df.iloc[:50])
+        
+        for i in range(50, len(self.df)):
+            row = self.df.iloc[i]
+            snap = engine.update("BTC/USD", row["high"], row["low"], row["close"], row["timestamp"])
+            expected = self.batch.iloc[i]
+            self.assertAlmostEqual(snap.rsi, expected["rsi"], places=8)
+            self.assertAlmostEqual(snap.ema, expected["ema_200"], places=6)
+            self.assertAlmostEqual(snap.atr, expected["atr"], places=6)
+    
+    def test_rsi_warmup_nan(self):
+        """RSI is undefined until rsi_period observations, like min_periods."""
+        engine = StreamingIndicators()
+        snap = engine.warm_up("BTC/USD", self.df.iloc[:13])
+        self.assertTrue(np.isnan(snap.rsi))
+        snap = engine.warm_up("BTC/USD", self.df.iloc[:14])
+        self.assertAlmostEqual(snap.rsi, self.batch["rsi"].iloc[13], places=8)
+    
+    def test_peek_does_not_mutate(self):
+        """What-if evaluation of a forming bar leaves state untouched."""
+        engine = StreamingIndicators()
+        engine.warm_up("BTC/USD", self.df.iloc[:-1])
+        before = engine.get_state("BTC/USD").__dict__.copy()
+        
+        last = self.df.iloc[-1]
+        snap = engine.peek("BTC/USD", last["high"], last["low"], last["close"])
+        
+        self.assertEqual(engine.get_state("BTC/USD").__dict__, before)
+        self.assertAlmostEqual(snap.rsi, self.batch["rsi"].iloc[-1], places=8)
+    
+    def test_sync_matches_generate_signal(self):
+        """Streaming path gives the same decision as generate_signal."""
+        window = self.df.iloc[:250]
+        snap = self.strategy.update_indicators("BTC/USD", window)
+        expected = self.strategy.generate_signal(window)
+        result = self.strategy.signal_from_snapshot(snap)
+        self.assertEqual(result.signal, expected.signal)
+        self.assertAlmostEqual(result.rsi, expected.rsi, places=8)
+        
+        # Next poll: one new candle closes, state advances by one bar only
+        window = self.df.iloc[1:251]
+        snap = self.strategy.update_indicators("BTC/USD", window)
+        self.assertEqual(self.strategy.indicators.get_state("BTC/USD").bars, 250)
+        batch = self.strategy.calculate_indicators(self.df.iloc[:251])
+        self.assertAlmostEqual(snap.rsi, batch["rsi"].iloc[-1], places=8)
+        self.assertEqual(
+            self.strategy.exit_from_snapshot(snap, 45000.0, Signal.LONG),
+            self.strategy.check_exit(self.df.iloc[:251], 45000.0, Signal.LONG)
+        )
+
+
+class TestIndicatorKernels(unittest.TestCase):
+    """Test shared indicator kernels and the call sites that use them."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.close = 100 * np.exp(np.cumsum(rng.standard_normal((600, 4)) * 0.02, axis=0))
+        self.close[:10, 2] = np.nan  # Late listing
+        self.high = self.close * 1.01
+        self.low = self.close * 0.99
+        self._numba = kernels.numba_enabled()
+    
+    def tearDown(self):
+        kernels.enable_numba(self._numba)
+    
+    def _reference_rsi(self, prices: pd.Series, period: int) -> pd.Series:
+        """The original pandas formulation of the live strategy."""
+        delta = prices.diff()
+        gain = delta.where(delta > 0, 0)
+        loss = -delta.where(delta < 0, 0)
+        avg_gain = gain.ewm(com=period - 1, min_periods=period).mean()
+        avg_loss = loss.ewm(com=period - 1, min_periods=period).mean()
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+    
+    def _check_backend(self):
+        rsi = kernels.rsi(self.close, 14)
+        ema = kernels.ema(self.close, 200)
+        atr = kernels.atr(self.high, self.low, self.close, 14)
+        for j in range(self.close.shape[1]):
+            c = pd.Series(self.close[:, j])
+            np.testing.assert_allclose(rsi[:, j], self._reference_rsi(c, 14), rtol=1e-10, equal_nan=True)
+            np.testing.assert_allclose(ema[:, j], c.ewm(span=200, adjust=False).mean(), rtol=1e-12, equal_nan=True)
+            np.testing.assert_allclose(
+                kernels.rolling_max(self.close, 14)[:, j], c.rolling(14).max(), equal_nan=True
+            )
+            np.testing.assert_allclose(
+                kernels.rolling_min(self.close, 14)[:, j], c.rolling(14).min(), equal_nan=True
+            )
+            # 1D input gives the same column as the 2D pass
+            np.testing.assert_allclose(kernels.atr(self.high[:, j], self.low[:, j], self.close[:, j], 14),
+                                       atr[:, j], equal_nan=True)
+    
+    def test_pandas_backend(self):
+        kernels.enable_numba(False)
+        self._check_backend()
+    
+    @unittest.skipUnless(kernels.NUMBA_AVAILABLE, "numba not installed")
+    def test_numba_backend(self):
+        kernels.enable_numba(True)
+        self._check_backend()
+    
+    def test_call_sites_agree(self):
+        """Strategy, backtesters and the MVP bot produce identical RSI."""
+        close = pd.Series(self.close[:, 0])
+        expected = RSIMomentumStrategy()._calculate_rsi(close, 14).to_numpy()
+        
+        bot_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        sys.path.insert(0, os.path.dirname(bot_root))
+        from kraken_trading_bot import KrakenTradingBot
+        mvp = KrakenTradingBot.calculate_rsi(None, close.to_numpy(), 14)
+        np.testing.assert_array_equal(mvp, expected)
+        
+        if HAS_VBT:
+            sys.path.insert(0, os.path.join(bot_root, "backtest"))
+            from vectorbt_backtest import VAYUBacktester
+            from src.backtest.backtest_engine import BacktestEngine
+            
+            np.testing.assert_array_equal(VAYUBacktester().calculate_rsi(close, 14).to_numpy(), expected)
+            
+            panel = pd.DataFrame(self.close, columns=["A", "B", "C", "D"])
+            entries, exits = BacktestEngine(["A"], datetime.now(), datetime.now()).generate_signals(panel)
+            np.testing.assert_array_equal(exits["A"].to_numpy(), expected >= 50)
+
+
+class TestRollingWindows(unittest.TestCase):
+    """Test O(1) streaming windows against pandas rolling and the batch kernels."""
+    
+    def setUp(self):
+        self.df = make_ohlcv(500)
+        self.backends = [True, False] if kernels.NUMBA_AVAILABLE else [False]
+    
+    def tearDown(self):
+        kernels.enable_numba(kernels.NUMBA_AVAILABLE)
+    
+    def test_streaming_matches_pandas(self):
+        close = self.df["close"]
+        for window in (1, 5, 14):
+            roll = close.rolling(window)
+            expected = np.column_stack([roll.max(), roll.min(), roll.sum(), roll.mean(), roll.std()])
+            hi, lo, moments = RollingMax(window), RollingMin(window), RollingMoments(window)
+            for i, value in enumerate(close):
+                peeked = (hi.peek(value), lo.peek(value), moments.peek(value))
+                stats = moments.update(value)
+                got = [hi.update(value), lo.update(value), stats.sum, stats.mean, stats.std]
+                np.testing.assert_allclose(got, expected[i], rtol=1e-9, atol=1e-6)
+                np.testing.assert_allclose(
+                    [peeked[0], peeked[1], peeked[2].sum, peeked[2].std], [got[0], got[1], got[2], got[4]],
+                    rtol=1e-9
+                )
+    
+    def test_batch_kernels(self):
+        panel = build_panel({f"SYM{i}/USD": make_ohlcv(300, seed=i) for i in range(4)})
+        frame = pd.DataFrame(panel.volume)
+        for backend in self.backends:
+            kernels.enable_numba(backend)
+            for window in (3, 20):
+                roll = frame.rolling(window)
+                np.testing.assert_allclose(kernels.rolling_sum(panel.volume, window), roll.sum(), rtol=1e-9)
+                np.testing.assert_allclose(kernels.rolling_mean(panel.volume, window), roll.mean(), rtol=1e-9)
+                np.testing.assert_allclose(kernels.rolling_std(panel.volume, window), roll.std(), rtol=1e-7)
+    
+    def test_streaming_channel(self):
+        engine = StreamingIndicators(channel_period=14)
+        snap = engine.warm_up("BTC/USD", self.df.iloc[:-1])
+        self.assertAlmostEqual(snap.channel_high, self.df["high"].iloc[:-1].tail(14).max())
+        self.assertAlmostEqual(snap.channel_low, self.df["low"].iloc[:-1].tail(14).min())
+        self.assertAlmostEqual(snap.close_std, self.df["close"].iloc[:-1].tail(14).std(), places=6)
+        
+        # Peeking the forming bar leaves the windows untouched
+        state = engine.get_state("BTC/USD")
+        count = state.channel_high.count
+        last = self.df.iloc[-1]
+        peeked = engine.peek("BTC/USD", last["high"], last["low"], last["close"])
+        self.assertEqual(state.channel_high.count, count)
+        self.assertAlmostEqual(peeked.channel_high, self.df["high"].tail(14).max())
+        self.assertAlmostEqual(peeked.close_mean, self.df["close"].tail(14).mean(), places=6)
+
+
+class TestTriggerPrices(unittest.TestCase):
+    """Test precomputed RSI trigger prices against recomputed indicators."""
+    
+    def setUp(self):
+        self.strategy = RSIMomentumStrategy(rsi_oversold=45, rsi_overbought=55, ema_period=50)
+        self.df = make_ohlcv(300)
+    
+    def test_trigger_hits_level(self):
+        engine = StreamingIndicators()
+        engine.warm_up("BTC/USD", self.df)
+        last = self.df.iloc[-1]
+        for level in (20.0, 30.0, 50.0, 70.0, 85.0):
+            price = engine.rsi_trigger_price("BTC/USD", level)
+            snap = engine.peek("BTC/USD", max(price, last["high"]), min(price, last["low"]), price)
+            self.assertAlmostEqual(snap.rsi, level, places=6)
+        with self.assertRaises(ValueError):
+            engine.rsi_trigger_price("BTC/USD", 100)
+    
+    def test_matches_snapshot_rules(self):
+        for t in range(60, 300, 20):
+            window = self.df.iloc[:t]
+            self.strategy.update_indicators("BTC/USD", window)
+            levels = self.strategy.triggers.get("BTC/USD")
+            self.assertEqual(levels.timestamp, window["timestamp"].iloc[-2])
+            
+            last = window.iloc[-1]
+            for price in np.linspace(0.9, 1.1, 21) * last["close"]:
+                snap = self.strategy.indicators.peek(
+                    "BTC/USD", max(price, last["high"]), min(price, last["low"]), price
+                )
+                self.assertEqual(levels.entry_signal(price), self.strategy.signal_from_snapshot(snap).signal)
+                self.assertEqual(price >= levels.mid, snap.rsi >= 50)
+    
+    def test_scan(self):
+        frames = {f"SYM{i}/USD": make_ohlcv(120, seed=i) for i in range(6)}
+        for symbol, df in frames.items():
+            self.strategy.update_indicators(symbol, df)
+        symbols = list(frames) + ["MISSING/USD"]
+        rng = np.random.default_rng(0)
+        prices = np.array([df["close"].iloc[-1] for df in frames.values()] + [1.0])
+        prices = prices * rng.uniform(0.95, 1.05, len(prices))
+        
+        codes = self.strategy.triggers.scan(symbols, prices)
+        expected = [{Signal.LONG: 1, Signal.SHORT: -1, Signal.HOLD: 0}[
+            self.strategy.triggers.entry_signal(sym, p)] for sym, p in zip(symbols, prices)]
+        np.testing.assert_array_equal(codes, expected)
+        self.assertEqual(codes[-1], 0)
+
+
+class TestMemoization(unittest.TestCase):
+    """Test LRU memoization of indicator graphs and candle downloads."""
+    
+    def test_lru_eviction_and_stats(self):
+        cache = LRUCache(max_entries=2, name="test")
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # a is now most recent
+        cache.put("c", 3)                    # evicts b
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get_or_compute("c", lambda: 99), 3)
+        
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (2, 1, 1, 2))
+        self.assertAlmostEqual(stats.hit_rate, 2 / 3)
+    
+    def test_price_feed_reuses_download(self):
+        """A smaller request within the TTL is served from the last download."""
+        class FakeClient:
+            calls = 0
+            
+            def get_ohlcv(self, symbol, timeframe, limit):
+                FakeClient.calls += 1
+                df = make_ohlcv(limit)
+                return df[["timestamp", "open", "high", "low", "close", "volume"]].values.tolist()
+        
+        feed = PriceFeed(FakeClient(), cache_ttl=60)
+        full = feed.fetch_candles("BTC/USD", "1h", limit=250)
+        tail = feed.fetch_candles("BTC/USD", "1h", limit=50)
+        
+        self.assertEqual(FakeClient.calls, 1)
+        self.assertEqual(len(tail), 50)
+        self.assertEqual(tail["timestamp"].iloc[-1], full["timestamp"].iloc[-1])
+        self.assertEqual(feed.cache.stats().hits, 1)
+        
+        # A longer request is downloaded again: a miss, not a hit
+        feed.fetch_candles("BTC/USD", "1h", limit=300)
+        self.assertEqual(FakeClient.calls, 2)
+        self.assertEqual((feed.cache.stats().hits, feed.cache.stats().misses), (1, 2))
+
+
+class TestBatchSignals(unittest.TestCase):
+    """Test batched cross-symbol evaluation against the per-symbol API."""
+    
+    def setUp(self):
+        self.strategy = RSIMomentumStrategy()
+        self.frames = {f"SYM{i}/USD": make_ohlcv(260, seed=i) for i in range(12)}
+        # One symbol listed later (shorter history)
+        self.frames["NEW/USD"] = make_ohlcv(260, seed=99).iloc[40:].reset_index(drop=True)
+        self.panel = build_panel(self.frames)
+    
+    def test_build_panel_alignment(self):
+        self.assertEqual(self.panel.close.shape, (260, 13))
+        self.assertTrue(np.isnan(self.panel.close[:40, -1]).all())
+        self.assertEqual(self.panel.valid_bars()[-1], 220)
+    
+    def test_batch_matches_per_symbol(self):
+        batch = self.strategy.generate_signals_batch(
+            self.panel.close, self.panel.high, self.panel.low, self.panel.symbols
+        )
+        for j, symbol in enumerate(self.panel.symbols):
+            # Feed the same (unpadded) history through the per-symbol API
+            df = self.frames[symbol]
+            expected = self.strategy.generate_signal(df)
+            got = batch.result(j)
+            self.assertEqual(got.signal, expected.signal)
+            self.assertAlmostEqual(got.rsi, expected.rsi, places=8)
+            self.assertAlmostEqual(got.confidence, expected.confidence, places=8)
+            
+            for entry, side in ((got.price * 1.2, Signal.LONG), (got.price * 0.8, Signal.SHORT)):
+                code = 1 if side == Signal.LONG else -1
+                exits = self.strategy.check_exits_batch(batch, np.full(len(batch), entry), np.full(len(batch), code))
+                self.assertEqual(bool(exits[j]), self.strategy.check_exit(df, entry, side))
+    
+    def test_batch_window_matches_streaming_state(self):
+        """A warmup_bars() window reproduces state carried across many passes."""
+        window = self.strategy.warmup_bars()
+        self.assertEqual(window, 691)
+        df = make_ohlcv(2500, seed=21)
+        codes, streamed = [], []
+        for t in range(1500, 2500, 5):
+            snapshot = self.strategy.update_indicators("BTC/USD", df.iloc[:t])   # State since bar 0
+            tail = df.iloc[t - window:t]
+            batch = self.strategy.generate_signals_batch(
+                tail[["close"]].to_numpy(), tail[["high"]].to_numpy(), tail[["low"]].to_numpy()
+            )
+            self.assertAlmostEqual(batch.ema200[0] / snapshot.ema, 1.0, delta=1e-3)
+            self.assertAlmostEqual(batch.rsi[0], snapshot.rsi, delta=1e-6)
+            codes.append(batch.signal[0])
+            streamed.append(self.strategy.signal_from_snapshot(snapshot).signal)
+        self.assertEqual([SIGNAL_CODES[int(c)] for c in codes], streamed)
+        self.assertTrue(any(c != 0 for c in codes))
+    
+    def test_forced_signals(self):
+        """Confidence and codes follow the entry rules element-wise."""
+        price = np.array([110.0, 90.0, 110.0, 90.0])
+        rsi = np.array([10.0, 90.0, 50.0, np.nan])
+        ema = np.full(4, 100.0)
+        codes, confidence = self.strategy.evaluate_arrays(price, rsi, ema)
+        np.testing.assert_array_equal(codes, [1, -1, 0, 0])
+        np.testing.assert_allclose(confidence, [1.0, 1.0, 0.0, 0.0])
+
+
+class _BreakoutStrategy(StrategyPlugin):
+    """Minimal plugin: long on a new 20-bar high above EMA(200)."""
+    
+    name = "breakout"
+    
+    def required_indicators(self):
+        return [dag.ema(200), dag.rolling_max("high", 20), dag.atr(14)]
+    
+    def decide(self, values):
+        price = values[dag.close()][-1]
+        prior_high = values[dag.rolling_max("high", 20)][-2]
+        long = (price > prior_high) & (price > values[dag.ema(200)][-1])
+        return BatchSignalResult(
+            signal=long.astype(np.int8),
+            confidence=long.astype(float),
+            price=price,
+            atr=values[dag.atr(14)][-1]
+        )
+
+
+class TestStrategyEngine(unittest.TestCase):
+    """Test declarative indicators and the shared computation graph."""
+    
+    def setUp(self):
+        self.panel = build_panel({f"SYM{i}/USD": make_ohlcv(260, seed=i) for i in range(6)})
+    
+    def test_graph_deduplicates(self):
+        graph = dag.IndicatorGraph(
+            RSIMomentumStrategy().required_indicators()
+            + RSIMomentumStrategy(rsi_period=7).required_indicators()
+            + _BreakoutStrategy().required_indicators()
+        )
+        names = [str(s) for s in graph.computed_nodes]
+        # rsi(14), rsi(7), ema(200), true_range(), atr(14), rolling_max(high, 20): each once
+        self.assertEqual(sorted(names), sorted(
+            ["rsi(14)", "rsi(7)", "ema(200)", "true_range()", "atr(14)", "rolling_max(high, 20)"]
+        ))
+        # Dependencies precede dependents
+        self.assertLess(graph.order.index(dag.true_range()), graph.order.index(dag.atr(14)))
+    
+    def test_engine_matches_direct_strategy(self):
+        rsi_strategy = RSIMomentumStrategy()
+        engine = StrategyEngine([rsi_strategy, _BreakoutStrategy()])
+        key = ("universe", int(self.panel.timestamps[-1]))
+        
+        results = engine.evaluate("1h", self.panel.close, self.panel.high, self.panel.low, key=key)
+        expected = rsi_strategy.generate_signals_batch(self.panel.close, self.panel.high, self.panel.low)
+        
+        np.testing.assert_array_equal(results["rsi_momentum"].signal, expected.signal)
+        np.testing.assert_allclose(results["rsi_momentum"].rsi, expected.rsi)
+        self.assertEqual(len(results["breakout"]), self.panel.close.shape[1])
+        
+        # Exits reuse the same graph evaluation
+        engine.exits("rsi_momentum", "1h", self.panel.close, self.panel.high, self.panel.low,
+                     expected.price, np.ones(len(expected), dtype=np.int8), key=key)
+        self.assertEqual(engine.graph_evaluations, 1)
+        self.assertEqual((engine.cache.stats().hits, engine.cache.stats().misses), (1, 1))
+    
+    def test_duplicate_strategy_rejected(self):
+        engine = StrategyEngine([RSIMomentumStrategy()])
+        with self.assertRaises(ValueError):
+            engine.add_strategy(RSIMomentumStrategy())
+    
+    def test_parameterizations_load_by_name(self):
+        engine = StrategyEngine([RSIMomentumStrategy(), RSIMomentumStrategy(rsi_period=7, name="rsi_fast")])
+        results = engine.evaluate("1h", self.panel.close, self.panel.high, self.panel.low)
+        self.assertEqual(list(results), ["rsi_momentum", "rsi_fast"])
+        
+        fast = RSIMomentumStrategy(rsi_period=7).generate_signals_batch(
+            self.panel.close, self.panel.high, self.panel.low
+        )
+        np.testing.assert_allclose(results["rsi_fast"].rsi, fast.rsi)
+
+
+class TestEnsemble(unittest.TestCase):
+    """Test broadcast evaluation of parameter variants."""
+    
+    def setUp(self):
+        self.panel = build_panel({f"SYM{i}/USD": make_ohlcv(300, seed=i) for i in range(8)})
+        self.ensemble = RSIMomentumEnsemble.grid(
+            rsi_periods=(7, 14), oversold=(25, 30, 45), overbought=(55, 70), ema_periods=(50, 200)
+        )
+    
+    def test_indicators_once_per_window(self):
+        graph = dag.IndicatorGraph(self.ensemble.required_indicators())
+        self.assertEqual(len(self.ensemble), 24)
+        # 2 RSI + 2 EMA + true range + ATR
+        self.assertEqual(len(graph.computed_nodes), 6)
+    
+    def test_variants_match_single_strategies(self):
+        signals = self.ensemble.evaluate(self.panel.close, self.panel.high, self.panel.low)
+        self.assertEqual(signals.signal.shape, (24, 8))
+        
+        for i, p in enumerate(self.ensemble.params):
+            single = RSIMomentumStrategy(
+                rsi_period=p.rsi_period, rsi_oversold=p.rsi_oversold,
+                rsi_overbought=p.rsi_overbought, ema_period=p.ema_period
+            ).generate_signals_batch(self.panel.close, self.panel.high, self.panel.low)
+            np.testing.assert_array_equal(signals.signal[i], single.signal)
+            np.testing.assert_allclose(signals.confidence[i], single.confidence)
+    
+    def test_shadow_book(self):
+        book = ShadowBook(self.ensemble, n_symbols=8)
+        for t in range(220, 300):
+            signals = self.ensemble.evaluate(
+                self.panel.close[:t], self.panel.high[:t], self.panel.low[:t]
+            )
+            book.update(signals)
+        
+        board = book.leaderboard(top=3)
+        self.assertEqual(len(board), 3)
+        self.assertGreaterEqual(board[0][1], board[-1][1])
+        self.assertTrue((book.trades >= 0).all())
+    
+    def test_shadow_exits_match_live_rule(self):
+        """Shadow exits use the current bar's ATR, as check_exits_batch does."""
+        from src.strategy.ensemble import EnsembleSignals
+        
+        single = RSIMomentumEnsemble.grid()
+        book = ShadowBook(single, n_symbols=3)
+        book.entry_price[0] = [100.0, 100.0, 100.0]
+        # Price 90: inside a 3x ATR stop at ATR 4, beyond it at ATR 3
+        signals = EnsembleSignals(
+            params=single.params, signal=np.zeros((1, 3), dtype=np.int8), confidence=np.zeros((1, 3)),
+            rsi=np.array([[40.0, 40.0, 55.0]]), price=np.array([90.0, 90.0, 101.0]), atr=np.array([4.0, 3.0, 4.0])
+        )
+        live = RSIMomentumStrategy().check_exits_batch(signals.variant(0), np.full(3, 100.0), np.ones(3, dtype=np.int8))
+        book.update(signals)
+        np.testing.assert_array_equal(np.isnan(book.entry_price[0]), live)
+        np.testing.assert_array_equal(live, [False, True, True])
+
+
+class TestWindowedIndicators(unittest.TestCase):
+    """Test full-series indicators sliced per window against per-window kernels."""
+    
+    def setUp(self):
+        self.close = make_ohlcv(1500, seed=9)["close"].to_numpy()
+        self.windowed = WindowedIndicators(self.close, rsi_periods=(10, 14), ema_periods=(50,))
+    
+    def test_isolated_matches_window_kernels(self):
+        for start in (0, 1, 37, 900):
+            stop = start + 400
+            for period in (10, 14):
+                expected = kernels.rsi(self.close[start:stop], period)
+                np.testing.assert_allclose(self.windowed.rsi(period, start, stop), expected,
+                                           rtol=0, atol=1e-9, equal_nan=True)
+            np.testing.assert_allclose(self.windowed.ema(50, start, stop),
+                                       kernels.ema(self.close[start:stop], 50), rtol=1e-12)
+    
+    def test_continuous_slices_full_series(self):
+        np.testing.assert_allclose(self.windowed.rsi(14, 600, 700, continuous=True),
+                                   kernels.rsi(self.close, 14)[600:700], rtol=1e-12)
+        np.testing.assert_array_equal(self.windowed.ema(50, 600, 700, continuous=True),
+                                      kernels.ema(self.close, 50)[600:700])
+    
+    def test_from_arrays_round_trip(self):
+        with SharedArrays(self.windowed.arrays) as shared:
+            rebuilt = WindowedIndicators.from_arrays(self.close, shared.arrays)
+            np.testing.assert_array_equal(rebuilt.rsi(14, 300, 500), self.windowed.rsi(14, 300, 500))
+
+
+class TestPrecision(unittest.TestCase):
+    """Test the float32 indicator mode against its documented bounds."""
+    
+    def setUp(self):
+        frames = {f"SYM{i}/USD": make_ohlcv(600, seed=i, start_price=10.0 ** (i - 2)) for i in range(8)}
+        self.panel64 = build_panel(frames)
+        self.panel32 = build_panel(frames, dtype=np.float32)
+        self.backends = [True, False] if kernels.NUMBA_AVAILABLE else [False]
+    
+    def tearDown(self):
+        kernels.enable_numba(kernels.NUMBA_AVAILABLE)
+    
+    def test_panel_dtype(self):
+        self.assertEqual(self.panel32.close.dtype, np.float32)
+        self.assertEqual(self.panel32.close.nbytes * 2, self.panel64.close.nbytes)
+        with self.assertRaises(ValueError):
+            build_panel({"X/USD": make_ohlcv(10)}, dtype=np.float16)
+    
+    def test_error_bounds(self):
+        p64, p32 = self.panel64, self.panel32
+        bounds = kernels.PRECISION_BOUNDS
+        for backend in self.backends:
+            kernels.enable_numba(backend)
+            rsi32 = kernels.rsi(p32.close)
+            ema32 = kernels.ema(p32.close, 200)
+            atr32 = kernels.atr(p32.high, p32.low, p32.close)
+            for out in (rsi32, ema32, atr32):
+                self.assertEqual(out.dtype, np.float32)
+            
+            rsi_err = np.nanmax(np.abs(rsi32 - kernels.rsi(p64.close)))
+            ema_err = np.nanmax(np.abs(ema32 / kernels.ema(p64.close, 200) - 1))
+            atr_err = np.nanmax(np.abs(atr32 - kernels.atr(p64.high, p64.low, p64.close)) / p64.close)
+            self.assertLessEqual(rsi_err, bounds["rsi"])
+            self.assertLessEqual(ema_err, bounds["ema"])
+            self.assertLessEqual(atr_err, bounds["atr"])
+    
+    def test_signals_agree(self):
+        strategy = RSIMomentumStrategy(rsi_oversold=45, rsi_overbought=55, ema_period=50)
+        for t in range(300, 600, 25):
+            b64 = strategy.generate_signals_batch(
+                self.panel64.close[:t], self.panel64.high[:t], self.panel64.low[:t])
+            b32 = strategy.generate_signals_batch(
+                self.panel32.close[:t], self.panel32.high[:t], self.panel32.low[:t])
+            self.assertEqual(b32.rsi.dtype, np.float32)
+            # Only values within the error bounds of a rule boundary may flip
+            near = ((np.minimum(np.abs(b64.rsi - 45), np.abs(b64.rsi - 55)) <= kernels.PRECISION_BOUNDS["rsi"])
+                    | (np.abs(b64.price / b64.ema200 - 1) <= kernels.PRECISION_BOUNDS["ema"]))
+            np.testing.assert_array_equal(b64.signal[~near], b32.signal[~near])
+
+
+class TestRanking(unittest.TestCase):
+    """Test cross-sectional top-k selection."""
+    
+    def _batch(self, signal, rsi, price, ema):
+        return BatchSignalResult(
+            signal=np.array(signal, dtype=np.int8), confidence=np.zeros(len(signal)),
+            price=np.array(price, dtype=float), rsi=np.array(rsi, dtype=float),
+            ema200=np.array(ema, dtype=float)
+        )
+    
+    def test_top_k_matches_sort(self):
+        rng = np.random.default_rng(3)
+        scores = rng.standard_normal(500)
+        scores[::7] = -np.inf
+        scores[::11] = np.nan
+        valid = np.flatnonzero(np.isfinite(scores))
+        expected = valid[np.argsort(-scores[valid])]
+        for k in (0, 1, 3, 50, 1000):
+            np.testing.assert_array_equal(top_k(scores, k), expected[:k])
+    
+    def test_ranks_by_depth_and_trend(self):
+        batch = self._batch(
+            signal=[1, 1, 0, 1, -1],
+            rsi=[25, 10, 5, 28, 80],
+            price=[100, 100, 100, 130, 90],
+            ema=[100, 100, 100, 100, 100]
+        )
+        ranker = CrossSectionalRanker(oversold=30)
+        scores = ranker.score(batch)
+        self.assertTrue(np.isneginf(scores[[2, 4]]).all())  # Only LONG signals are ranked
+        
+        picks = ranker.select({"rsi_momentum": batch}, k=2)
+        # RSI 28 but 30% above trend outranks RSI 25 at the EMA
+        self.assertEqual([p.index for p in picks], [1, 3])
+        
+        eligible = np.array([True, False, True, True, True])
+        picks = ranker.select({"rsi_momentum": batch}, k=3, eligible=eligible)
+        self.assertEqual([p.index for p in picks], [3, 0])
+    
+    def test_symbol_ranked_once_across_strategies(self):
+        a = self._batch([1, 1, 0], [20, 29, 50], [100, 100, 100], [100, 100, 100])
+        b = self._batch([0, 1, 1], [50, 5, 25], [100, 100, 100], [100, 100, 100])
+        picks = CrossSectionalRanker().select({"a": a, "b": b}, k=3)
+        self.assertEqual([(p.index, p.strategy) for p in picks], [(1, "b"), (0, "a"), (2, "b")])
+
+
+class _FakeExchange:
+    """Offline stand-in for KrakenClient: synthetic candles and tickers."""
+    
+    def __init__(self, *args, **kwargs):
+        self.prices = {}
+        self.frames = {}   # symbol -> candle frame overriding the synthetic one
+    
+    def load_markets(self):
+        pass
+    
+    def get_ohlcv(self, symbol, timeframe, limit):
+        df = self.frames.get(symbol)
+        if df is None:
+            df = make_ohlcv(limit, seed=sum(map(ord, symbol)))
+        return df[["timestamp", "open", "high", "low", "close", "volume"]].values.tolist()
+    
+    def get_ticker(self, symbol):
+        return {"last": self.prices[symbol]}
+
+
+class TestTradingBot(unittest.TestCase):
+    """Test the paper-trading loop against an offline exchange."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def make_bot(self, **kwargs):
+        import main
+        from src.utils.paper_report import PaperTradingReport
+        
+        with mock.patch.object(main, "KrakenClient", _FakeExchange):
+            bot = main.TradingBot(symbols=["BTC/USD", "ETH/USD"], **kwargs)
+        bot.paper_report = PaperTradingReport(os.path.join(self.tmp.name, "trades.json"))
+        return bot
+    
+    def test_batch_evaluates_every_timeframe(self):
+        bot = self.make_bot(strategies=[
+            RSIMomentumStrategy(), _BreakoutStrategy(), RSIMomentumStrategy(timeframe="4h", name="rsi_4h")
+        ])
+        bot.check_signals()
+        self.assertEqual(sorted(bot.engine.graphs), ["1h", "4h"])
+        self.assertEqual(bot.engine.graph_evaluations, 2)   # One pass per timeframe
+        self.assertIn(("BTC/USD", "4h"), bot.feed.cache)
+    
+    def test_ranked_mode_exits_on_trigger_tick(self):
+        bot = self.make_bot(rank_entries=True)
+        # Falling into the last bar: RSI well below 50, so the bar-level exit holds
+        df = make_ohlcv(250, seed=5)
+        df.loc[df.index[-15:], ["open", "high", "low", "close"]] *= np.linspace(1.0, 0.85, 15)[:, None]
+        bot.client.frames["BTC/USD"] = df
+        entry = float(df["close"].iloc[-1])
+        bot.paper_positions["BTC/USD"] = {
+            "trade_index": bot.paper_report.record_entry("BTC/USD", "buy", entry, 0.1),
+            "side": "buy", "amount": 0.1, "entry_price": entry, "stop_price": entry * 0.5,
+            "entry_time": datetime.now(), "strategy": "rsi_momentum"
+        }
+        
+        bot.check_signals()
+        self.assertIn("BTC/USD", bot.paper_positions)
+        levels = bot.strategy.triggers.get("BTC/USD")
+        self.assertIsNotNone(levels)
+        
+        bot.client.prices["BTC/USD"] = levels.mid * 0.999
+        bot.check_paper_stops()
+        self.assertIn("BTC/USD", bot.paper_positions)
+        
+        bot.client.prices["BTC/USD"] = levels.mid
+        bot.check_paper_stops()
+        self.assertNotIn("BTC/USD", bot.paper_positions)
+
+
+class TestExits(unittest.TestCase):
+    """Test ATR-stop and max-hold exits added to signal columns."""
+    
+    def setUp(self):
+        self.close = np.array([100.0, 100, 99, 97, 94, 95, 96, 97, 98, 99])
+        self.atr = np.full(10, 1.0)
+        self.none = np.zeros(10, dtype=bool)
+        self.entry = self.none.copy()
+        self.entry[1] = True
+    
+    def test_stop_exit(self):
+        from src.backtest.exits import apply_exits, EXIT_STOP
+        # Long at 100, stop at 100 - 2 x 1 = 98: close 97 on bar 3, acted on at bar 4
+        le, lx, se, sx, reason = apply_exits(self.entry, self.none, self.none, self.none,
+                                             self.close, self.atr, atr_multiplier=2.0, lag=1)
+        self.assertEqual(np.flatnonzero(le).tolist(), [1])
+        self.assertEqual(np.flatnonzero(lx).tolist(), [4])
+        self.assertEqual(reason[4], EXIT_STOP)
+        # Without lag the exit is on the bar that broke the stop
+        _, lx, _, _, _ = apply_exits(self.entry, self.none, self.none, self.none,
+                                     self.close, self.atr, atr_multiplier=2.0, lag=0)
+        self.assertEqual(np.flatnonzero(lx).tolist(), [3])
+    
+    def test_time_exit_and_reentry(self):
+        from src.backtest.exits import apply_exits, EXIT_TIME
+        entries = np.ones(10, dtype=bool)
+        le, lx, _, _, reason = apply_exits(entries, self.none, self.none, self.none,
+                                           self.close, self.atr, max_hold=3, lag=0)
+        # Held 3 bars, closed, and the entry on the exit bar is ignored
+        self.assertEqual(np.flatnonzero(le).tolist(), [0, 4, 8])
+        self.assertEqual(np.flatnonzero(lx).tolist(), [3, 7])
+        self.assertTrue((reason[[3, 7]] == EXIT_TIME).all())
+    
+    def test_per_column_parameters_and_numba_parity(self):
+        from src.backtest import exits
+        rng = np.random.default_rng(3)
+        n = 400
+        close = 100 * np.exp(np.cumsum(rng.standard_normal(n) * 0.01))
+        atr = np.abs(rng.standard_normal(n)) + 0.5
+        signals = [rng.random((n, 4)) < 0.05 for _ in range(4)]
+        mult = np.array([np.inf, 1.0, 2.0, 3.0])
+        hold = np.array([0, 10, 0, 24])
+        out = exits.apply_exits(*signals, close, atr, atr_multiplier=mult, max_hold=hold)
+        for j in range(4):
+            single = exits.apply_exits(*(s[:, j] for s in signals), close, atr,
+                                       atr_multiplier=mult[j], max_hold=hold[j])
+            for a, b in zip(out, single):
+                np.testing.assert_array_equal(a[:, j], b)
+        if exits.NUMBA_AVAILABLE:
+            ref = [np.zeros((n, 4), dtype=bool) for _ in range(4)] + [np.zeros((n, 4), dtype=np.int8)]
+            exits._exit_scan(*signals, close, atr, mult, hold, 1, *ref)
+            for a, b in zip(out, ref):
+                np.testing.assert_array_equal(a, b)
+        # At most one action per bar and column
+        self.assertLessEqual(sum(a.astype(int) for a in out[:4]).max(), 1)
+
+
+@unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+class TestParameterSweep(unittest.TestCase):
+    """Test the vectorized optimize_parameters path against the per-combination loop."""
+    
+    def setUp(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backtest"))
+        from vectorbt_backtest import VAYUBacktester
+        df = make_ohlcv(1500, seed=11)
+        self.price = pd.Series(df["close"].to_numpy(),
+                               index=pd.to_datetime(df["timestamp"], unit="ms"))
+        self.bt = VAYUBacktester(config_path="/nonexistent/config.yaml")
+        self.grid = dict(rsi_windows=range(7, 15, 3), oversold_range=range(25, 41, 5),
+                         overbought_range=range(60, 76, 5))
+    
+    def test_sweep_signals_match_generate_signals(self):
+        wide = self.bt.sweep_signals(self.price, **self.grid)
+        self.assertEqual(wide[0].shape, (len(self.price), 3 * 4 * 4))
+        for rsi_p, lo, hi in [(7, 25, 60), (10, 35, 70), (13, 40, 75)]:
+            single = self.bt.generate_signals(self.price, rsi_p, lo, hi)
+            for w, s in zip(wide, single):
+                np.testing.assert_array_equal(w[(rsi_p, lo, hi)].to_numpy(), s.to_numpy())
+    
+    def test_matches_loop(self):
+        key = ["rsi_period", "oversold", "overbought"]
+        grid = dict(rsi_windows=[7, 13], oversold_range=[30, 40], overbought_range=[60, 75])
+        fast = self.bt.optimize_parameters(self.price, **grid, max_columns=3)
+        slow = self.bt.optimize_parameters(self.price, **grid, vectorized=False)
+        fast = fast.set_index(key).sort_index().astype(float)
+        slow = slow.set_index(key).sort_index().astype(float)
+        pd.testing.assert_frame_equal(fast, slow[fast.columns], check_exact=False, rtol=1e-9)
+    
+    def test_exit_rules_without_stops_match_raw_signals(self):
+        """Clean signals with disabled exits replay the same vectorbt path."""
+        from src.backtest.exits import apply_exits
+        raw = self.bt.sweep_signals(self.price, **self.grid)
+        clean = apply_exits(*(f.to_numpy() for f in raw), self.price.to_numpy(),
+                            np.ones(len(self.price)))[:4]
+        clean = [pd.DataFrame(a, index=f.index, columns=f.columns) for a, f in zip(clean, raw)]
+        a = self.bt.portfolio_metrics(self.bt.run_backtest(self.price, *raw))
+        b = self.bt.portfolio_metrics(self.bt.run_backtest(self.price, *clean))
+        pd.testing.assert_frame_equal(a, b)
+    
+    def test_exit_grid_matches_loop(self):
+        key = ["rsi_period", "oversold", "overbought", "atr_multiplier", "max_hold_bars"]
+        grid = dict(rsi_windows=[7, 13], oversold_range=[35], overbought_range=[65],
+                    atr_multipliers=[1.0, 3.0], max_hold_range=[5, 48])
+        fast = self.bt.optimize_parameters(self.price, **grid, max_columns=3)
+        slow = self.bt.optimize_parameters(self.price, **grid, vectorized=False)
+        self.assertEqual(len(fast), 8)
+        fast = fast.set_index(key).sort_index().astype(float)
+        slow = slow.set_index(key).sort_index().astype(float)
+        pd.testing.assert_frame_equal(fast, slow[fast.columns], check_exact=False, rtol=1e-9)
+        # The exits change the results
+        self.assertGreater(fast['trades'].nunique(), 1)
+    
+    def test_segmented_sweep_matches_full_sweep(self):
+        from src.backtest.pruning import PruningRules
+        key = ["rsi_period", "oversold", "overbought", "atr_multiplier"]
+        grid = dict(self.grid, atr_multipliers=[1.0, 3.0])
+        full = self.bt.optimize_parameters(self.price, **grid).set_index(key).sort_index()
+        
+        # No rules: resumed segments reproduce the one-pass simulation
+        keep_all = PruningRules(checkpoints=(0.3, 0.6), max_drawdown=None, min_trades=None, sharpe_gap=None)
+        resumed = self.bt.optimize_parameters(self.price, **grid, pruning=keep_all, max_columns=7)
+        self.assertTrue(resumed['pruned_at'].isna().all())
+        resumed = resumed.set_index(key).sort_index()
+        pd.testing.assert_frame_equal(resumed[full.columns].astype(float), full.astype(float),
+                                      check_exact=False, rtol=1e-9)
+        
+        # Default rules: columns dropped, same winner; never-trading
+        # columns (infinite Sharpe) do not top the ranking
+        ranked = self.bt.optimize_parameters(self.price, **grid)
+        self.assertGreater(ranked.iloc[0]['trades'], 0)
+        pruned = self.bt.optimize_parameters(self.price, **grid, pruning=PruningRules())
+        self.assertGreater(pruned['pruned_at'].notna().sum(), 0)
+        self.assertTrue(pruned.loc[pruned['pruned_at'].notna(), 'sharpe_ratio'].isna().all())
+        self.assertGreater(pruned.iloc[0]['trades'], 0)
+        self.assertEqual(tuple(pruned.iloc[0][key]), tuple(ranked.iloc[0][key]))
+    
+    def test_fast_metrics_match_vectorbt(self):
+        """The lean metrics kernel agrees with vectorbt's own definitions."""
+        le, lx, se, sx = self.bt.sweep_signals(self.price, **self.grid)
+        le[(0, 0, 0)] = False                 # A column that never trades
+        for frame in (lx, se, sx):
+            frame[(0, 0, 0)] = False
+        pf = self.bt.run_backtest(self.price, le, lx, se, sx)
+        
+        fast = self.bt.portfolio_metrics(pf)
+        closed = pf.trades.closed
+        expected = pd.DataFrame({
+            'total_return': pf.total_return() * 100,
+            'sharpe_ratio': pf.sharpe_ratio(),
+            'max_drawdown': -pf.drawdowns.max_drawdown() * 100,
+            'trades': pf.trades.count(),
+            'win_rate': closed.win_rate() * 100,
+            'profit_factor': closed.profit_factor()
+        })
+        pd.testing.assert_frame_equal(fast, expected, check_exact=False, rtol=1e-9, check_dtype=False)
+        self.assertTrue(np.isinf(fast.loc[(0, 0, 0), 'sharpe_ratio']))
+        self.assertGreater(fast['trades'].min(), -1)
+        
+        # Same numbers pf.stats() reports for a single column
+        column = fast.index[5]
+        stats = pf[column].stats()
+        for name, label in [('total_return', 'Total Return [%]'), ('sharpe_ratio', 'Sharpe Ratio'),
+                            ('max_drawdown', 'Max Drawdown [%]'), ('trades', 'Total Trades'),
+                            ('win_rate', 'Win Rate [%]'), ('profit_factor', 'Profit Factor')]:
+            self.assertAlmostEqual(fast.loc[column, name], stats[label], places=9)
+
+
+def _bowl_objective(params, fidelity):
+    """Peak at a=31, b=7, c=0.5; low fidelity adds deterministic noise."""
+    score = -((params["a"] - 31) ** 2 / 100 + (params["b"] - 7) ** 2 / 50 + abs(params["c"] - 0.5))
+    noise = np.random.default_rng(params["a"] * 1000 + params["b"] * 10 + int(fidelity * 100)).normal()
+    return score + 0.3 * (1 - fidelity) * noise
+
+
+class TestAdaptiveSearch(unittest.TestCase):
+    """Test successive halving and TPE against a known optimum."""
+    
+    space = {"a": range(50), "b": range(40), "c": [0.1, 0.2, 0.5, 1.0]}   # 8000 points
+    
+    def test_successive_halving(self):
+        from src.backtest.search import SuccessiveHalving
+        
+        result = SuccessiveHalving(self.space, _bowl_objective, n_candidates=243, min_fidelity=1 / 27).run()
+        self.assertEqual(result.n_full_evaluations, 9)
+        self.assertEqual(result.cost, 36.0)       # vs 8000 for the grid
+        self.assertEqual(sorted(result.history["fidelity"].unique())[0], 1 / 27)
+        self.assertGreater(result.best_score, -0.3)
+    
+    def test_tpe_parallel_matches_serial(self):
+        from src.backtest.search import TPESearch
+        
+        serial = TPESearch(self.space, _bowl_objective, n_trials=60, batch_size=2).run()
+        self.assertGreater(serial.best_score, -0.2)
+        self.assertEqual(serial.n_evaluations, 60)
+        self.assertFalse(serial.history.duplicated(["a", "b", "c"]).any())
+        
+        parallel = TPESearch(self.space, _bowl_objective, n_trials=60, batch_size=2, n_jobs=2).run()
+        self.assertEqual(parallel.best_params, serial.best_params)
+    
+    @unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+    def test_backtester_search(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backtest"))
+        from vectorbt_backtest import SEARCH_SPACE, VAYUBacktester
+        
+        df = make_ohlcv(2000, seed=5)
+        price = pd.Series(df["close"].to_numpy(), index=pd.to_datetime(df["timestamp"], unit="ms"))
+        result = VAYUBacktester(config={}).search_parameters(price, n_candidates=9, min_fidelity=1 / 3)
+        self.assertEqual(set(result.best_params), set(SEARCH_SPACE))
+        self.assertEqual(result.n_full_evaluations, 3)
+
+
+class TestSharedArrays(unittest.TestCase):
+    """Test the shared-memory array block used by pool workers."""
+    
+    def test_attach_round_trip(self):
+        close = np.linspace(1.0, 2.0, 101)
+        index = np.arange(7, dtype=np.int64)
+        with SharedArrays({"close": close, "index": index}) as shared:
+            shm, arrays = SharedArrays.attach(shared.spec)
+            np.testing.assert_array_equal(arrays["close"], close)
+            np.testing.assert_array_equal(arrays["index"], index)
+            self.assertFalse(arrays["close"].flags.writeable)
+            
+            # Writes by the owner are visible through the attached view
+            shared.arrays["close"][0] = -1.0
+            self.assertEqual(arrays["close"][0], -1.0)
+            del arrays
+            shm.close()
+
+
+@unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+class TestParallelWalkForward(unittest.TestCase):
+    """Test process-pool walk-forward against the serial run."""
+    
+    def test_matches_serial(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backtest"))
+        from vectorbt_backtest import VAYUBacktester
+        df = make_ohlcv(1200, seed=5)
+        price = pd.Series(df["close"].to_numpy(), index=pd.to_datetime(df["timestamp"], unit="ms"))
+        bt = VAYUBacktester(config={})
+        
+        serial = bt.walk_forward_analysis(price, train_size=600, test_size=150, step_size=150)
+        parallel = bt.walk_forward_analysis(price, train_size=600, test_size=150, step_size=150, n_jobs=2)
+        self.assertEqual(list(parallel["window"]), [1, 2, 3, 4])
+        pd.testing.assert_frame_equal(serial, parallel)
+    
+    def test_indicator_reuse_matches_recompute(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backtest"))
+        from vectorbt_backtest import VAYUBacktester
+        df = make_ohlcv(1200, seed=5)
+        price = pd.Series(df["close"].to_numpy(), index=pd.to_datetime(df["timestamp"], unit="ms"))
+        bt = VAYUBacktester(config={})
+        
+        kwargs = dict(train_size=600, test_size=150, step_size=150)
+        reused = bt.walk_forward_analysis(price, **kwargs)
+        recomputed = bt.walk_forward_analysis(price, reuse_indicators=False, **kwargs)
+        pd.testing.assert_frame_equal(reused, recomputed)
+
+
+class TestEventBacktester(unittest.TestCase):
+    """Test the compiled event loop against a replay through the live objects."""
+    
+    def setUp(self):
+        from src.backtest.event_engine import EventBacktester
+        self.frames = {f"S{i}": make_ohlcv(1500, seed=i) for i in range(3)}
+        # Short windows so the random walks trade often
+        strategy = RSIMomentumStrategy(rsi_period=5, rsi_oversold=40, ema_period=20)
+        self.make = lambda **limits: EventBacktester(strategy, RiskLimits(**limits))
+    
+    def test_compiled_loop_matches_live_replay(self):
+        for limits in ({}, {"max_positions": 2, "max_daily_loss": 1e9}):
+            bt = self.make(**limits)
+            fast, live = bt.run(self.frames), bt.replay(self.frames)
+            self.assertGreater(len(fast.trades), 0)
+            pd.testing.assert_frame_equal(fast.trades, live.trades)
+            np.testing.assert_array_equal(fast.equity, live.equity)
+            self.assertEqual(fast.final_balance, live.final_balance)
+    
+    def test_max_positions_cap(self):
+        trades = self.make(max_positions=1, max_daily_loss=1e9).run(self.frames).trades
+        self.assertLess(len(trades), len(self.make(max_positions=3, max_daily_loss=1e9).run(self.frames).trades))
+        for _, a in trades.iterrows():
+            overlap = trades[(trades.entry_bar < a.exit_bar) & (trades.exit_bar > a.entry_bar)]
+            self.assertEqual(len(overlap), 1)
+    
+    def test_bar_magnifier(self):
+        from src.backtest.event_engine import EventBacktester, EventBacktestConfig
+        from src.backtest.intrabar import SubBars
+        minutes, hours = {}, {}
+        for i in range(2):
+            minutes[f"S{i}/USD"], hours[f"S{i}/USD"] = make_minute_bars(3000, seed=i)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HistoricalStore(tmp)
+            for symbol, df in minutes.items():
+                store.save(df, symbol, "1m")
+            
+            # Tight stops so both levels often fall inside one hourly range
+            bt = EventBacktester(RSIMomentumStrategy(rsi_period=5, rsi_oversold=40, ema_period=20),
+                                 RiskLimits(max_daily_loss=1e9),
+                                 EventBacktestConfig(intrabar_target=True, stop_atr_multiple=0.3))
+            coarse = bt.run(hours)
+            sub_bars = SubBars(store)
+            fine = bt.run(hours, sub_bars=sub_bars)
+            live = bt.replay(hours, sub_bars=SubBars(store))
+        
+        self.assertEqual(coarse.sub_bar_lookups, 0)
+        self.assertGreater(fine.ambiguous_bars, 0)
+        # Only the ambiguous bars are looked up, a small share of all bars
+        self.assertLess(fine.sub_bar_lookups, 0.02 * 2 * 3000)
+        self.assertEqual(sub_bars.lookups, fine.sub_bar_lookups)
+        self.assertIn("RSI mean reversion", set(fine.trades["reason"]))
+        # Some ambiguous bars reached the trigger first
+        self.assertGreater((fine.trades["reason"] == "RSI mean reversion").sum(),
+                           (coarse.trades["reason"] == "RSI mean reversion").sum())
+        pd.testing.assert_frame_equal(fine.trades, live.trades)
+        np.testing.assert_array_equal(fine.equity, live.equity)
+    
+    def test_resolve_fill_order(self):
+        from src.backtest.event_engine import EXIT_STOP, EXIT_TARGET
+        from src.backtest.intrabar import resolve_fill
+        o, h, l = np.array([100.0, 101, 99]), np.array([100.5, 103, 99.5]), np.array([99.5, 100.5, 95])
+        self.assertEqual(resolve_fill(o, h, l, stop=97, target=102), (EXIT_TARGET, 102))
+        self.assertEqual(resolve_fill(o, h, l, stop=99.6, target=102), (EXIT_STOP, 99.6))
+        self.assertEqual(resolve_fill(o, h, l, stop=90, target=100.8), (EXIT_TARGET, 101.0))  # Opens above
+        self.assertIsNone(resolve_fill(o, h, l, stop=90, target=110))
+    
+    def test_circuit_breaker_blocks_same_day_entries(self):
+        trades = self.make(max_daily_loss=0.0, max_positions=10).run(self.frames).trades
+        day = lambda bar: (1704067200000 + bar * 3_600_000) // 86_400_000
+        for _, loser in trades[trades.pnl < 0].iterrows():
+            later = trades[(trades.entry_bar > loser.exit_bar)
+                           & (day(trades.entry_bar) == day(loser.exit_bar))]
+            self.assertTrue(later.empty)
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """Test resampling robustness of return sequences."""
+    
+    def setUp(self):
+        self.returns = np.random.default_rng(3).normal(0.002, 0.02, 300)
+    
+    def test_path_stats_matches_equity_curve(self):
+        from src.backtest import monte_carlo
+        
+        paths = np.random.default_rng(4).normal(0.0, 0.03, (50, 200))
+        total, max_dd = monte_carlo.path_stats(paths)
+        equity = np.hstack([np.ones((50, 1)), np.cumprod(1 + paths, axis=1)])
+        expected = (1 - equity / np.maximum.accumulate(equity, axis=1)).max(axis=1)
+        np.testing.assert_allclose(total, equity[:, -1] - 1)
+        np.testing.assert_allclose(max_dd, expected)
+        
+        fused = monte_carlo.NUMBA_AVAILABLE
+        monte_carlo.NUMBA_AVAILABLE = False
+        try:
+            np.testing.assert_allclose(monte_carlo.path_stats(paths)[1], max_dd)
+        finally:
+            monte_carlo.NUMBA_AVAILABLE = fused
+    
+    def test_resampling_methods(self):
+        from src.backtest.monte_carlo import MonteCarloSimulator
+        
+        mc = MonteCarloSimulator(self.returns, chunk_size=700)
+        shuffled = mc.shuffle(2000)
+        self.assertEqual(shuffled.n_resamples, 2000)
+        # Order does not change the compounded return, only the path
+        np.testing.assert_allclose(shuffled.total_returns, shuffled.observed_return)
+        self.assertGreater(shuffled.max_drawdowns.std(), 0)
+        
+        # One block covering the whole history reproduces it
+        whole = mc.bootstrap(100, block_size=len(self.returns))
+        np.testing.assert_allclose(whole.max_drawdowns, whole.observed_drawdown)
+        
+        noisy = mc.perturb(1000, noise=0.5, drop=0.1)
+        self.assertGreater(noisy.total_returns.std(), 0)
+        self.assertEqual(list(noisy.summary().index[-1:]), ["observed"])
+        with self.assertRaises(ValueError):
+            mc.run("jackknife", 10)
+        with self.assertRaises(ValueError):
+            mc.bootstrap(10, block_size=0)
+        with self.assertRaises(ValueError):
+            mc.shuffle(0)
+        with self.assertRaises(ValueError):
+            MonteCarloSimulator([]).bootstrap()
+        with self.assertRaises(ValueError):
+            MonteCarloSimulator.from_trades(pd.DataFrame({"pnl": []}), 1000.0)
+    
+    def test_parallel_matches_serial(self):
+        from src.backtest.monte_carlo import MonteCarloSimulator
+        
+        serial = MonteCarloSimulator(self.returns, chunk_size=500).bootstrap(2000, block_size=5)
+        parallel = MonteCarloSimulator(self.returns, chunk_size=500, n_jobs=2).bootstrap(2000, block_size=5)
+        np.testing.assert_array_equal(serial.max_drawdowns, parallel.max_drawdowns)
+    
+    def test_trade_returns(self):
+        from src.backtest.monte_carlo import trade_returns
+        
+        trades = pd.DataFrame({"pnl": [100.0, -55.0, 20.9]})
+        np.testing.assert_allclose(trade_returns(trades, 1000.0), [0.1, -0.05, 0.02])
+
+
+class TestHistoricalStore(unittest.TestCase):
+    """Test the local candle store."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = HistoricalStore(self.tmp.name)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_round_trip_and_range(self):
+        df = make_ohlcv(48)
+        # Fetcher-style frame: datetime index instead of a ms column
+        indexed = df.set_index(pd.to_datetime(df.pop("timestamp"), unit="ms").rename("timestamp"))
+        self.store.save(indexed, "BTC/USD", "1h")
+        self.assertEqual(self.store.symbols("1h"), ["BTC/USD"])
+        
+        loaded = self.store.load("BTC/USD", "1h", since="2024-01-01 05:00", until=datetime(2024, 1, 1, 10))
+        self.assertEqual(len(loaded), 6)
+        self.assertEqual(loaded["timestamp"].iloc[0], 1704067200000 + 5 * 3_600_000)
+        np.testing.assert_allclose(loaded["close"], df["close"].iloc[5:11])
+    
+    def test_save_merges_and_missing_raises(self):
+        df = make_ohlcv(30)
+        self.store.save(df.iloc[:20], "ETH/USD", "1h")
+        self.store.save(df.iloc[10:], "ETH/USD", "1h")
+        self.assertEqual(len(self.store.load("ETH/USD", "1h")), 30)
+        with self.assertRaises(FileNotFoundError):
+            self.store.load("SOL/USD", "1h")
+    
+    def test_slice_key_tracks_covered_bars(self):
+        df = make_ohlcv(48)
+        self.store.save(df.iloc[:40], "BTC/USD", "1h")
+        key = self.store.slice_key(["BTC/USD"], "1h", since="2024-01-01 05:00")
+        # Bounds past the last stored bar cover the same data
+        self.assertEqual(key, self.store.slice_key(["BTC/USD"], "1h", since="2024-01-01 04:30", until="2030-01-01"))
+        self.assertEqual(key["files"]["BTC/USD"][1][2], 35)
+        
+        bounded = self.store.slice_key(["BTC/USD"], "1h", until="2024-01-01 20:00")
+        
+        self.store.save(df.iloc[40:], "BTC/USD", "1h")
+        self.assertNotEqual(key, self.store.slice_key(["BTC/USD"], "1h", since="2024-01-01 05:00"))
+        # Appending later bars keeps the key of a range they don't touch
+        self.assertEqual(bounded, self.store.slice_key(["BTC/USD"], "1h", until="2024-01-01 20:00"))
+        
+        # Changing a bar inside the range changes it
+        changed = df.iloc[3:4].copy()
+        changed["close"] *= 1.01
+        self.store.save(changed, "BTC/USD", "1h")
+        self.assertNotEqual(bounded, self.store.slice_key(["BTC/USD"], "1h", until="2024-01-01 20:00"))
+        
+        # Unsorted fetcher-style files are hashed by their normalized rows
+        path = self.store.path("ETH/USD", "1h")
+        df.iloc[::-1].to_csv(path, index=False)
+        eth = self.store.slice_key(["ETH/USD"], "1h", until="2024-01-01 20:00")["files"]["ETH/USD"]
+        self.assertEqual(eth[1], (int(df["timestamp"].iloc[0]), int(df["timestamp"].iloc[20]), 21))
+    
+    def test_load_range_matches_load(self):
+        df = make_ohlcv(500)
+        self.store.save(df.iloc[::2], "BTC/USD", "1h")    # Gaps: every other hour stored
+        ts = df["timestamp"].to_numpy()
+        rng = np.random.default_rng(0)
+        bounds = [(ts[0] - 1, ts[0]), (ts[-1], ts[-1] + 10), (ts[10] + 1, ts[11] - 1), (0, ts[-1] * 2)]
+        bounds += [tuple(sorted(rng.integers(ts[0] - 5_000_000, ts[-1] + 5_000_000, 2))) for _ in range(50)]
+        for since, until in bounds:
+            expected = self.store.load("BTC/USD", "1h", int(since), int(until))
+            got = self.store.load_range("BTC/USD", "1h", int(since), int(until))
+            self.assertEqual(len(got), len(expected))
+            if len(expected):
+                pd.testing.assert_frame_equal(got, expected)
+        
+        # Datetime-string timestamps (fetcher files) are searched too
+        path = self.store.path("ETH/USD", "1h")
+        strings = df.assign(timestamp=pd.to_datetime(df["timestamp"], unit="ms").astype(str))
+        strings.to_csv(path, index=False)
+        got = self.store.load_range("ETH/USD", "1h", "2024-01-02 00:00", "2024-01-02 05:00")
+        np.testing.assert_array_equal(got["timestamp"], ts[24:30])
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the persistent backtest result cache."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "results.sqlite")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_persists_and_evicts_lru_by_size(self):
+        cache = ResultCache(self.path, max_bytes=3000)
+        for name in "abc":
+            cache.put(name, np.zeros(100))   # ~950 bytes pickled
+        self.assertIsNotNone(cache.get("a"))  # b is now least recent
+        cache.put("d", np.zeros(100))
+        self.assertEqual((len(cache), cache.evictions), (3, 1))
+        self.assertNotIn("b", cache)
+        self.assertLessEqual(cache.total_bytes, 3000)
+        cache.close()
+        
+        reopened = ResultCache(self.path, max_bytes=3000)
+        np.testing.assert_array_equal(reopened.get("d"), np.zeros(100))
+        reopened.close()
+    
+    def test_hit_skips_compute(self):
+        cache = ResultCache(self.path)
+        df = pd.DataFrame({"sharpe_ratio": [1.5, 0.2]})
+        key = make_key(kind="optimize", params={"rsi_windows": range(10, 21, 2)})
+        pd.testing.assert_frame_equal(cache.get_or_compute(key, lambda: df), df)
+        pd.testing.assert_frame_equal(cache.get_or_compute(key, lambda: self.fail("recomputed")), df)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+    
+    def test_key_sensitivity(self):
+        price = pd.Series(np.linspace(1, 2, 50), index=pd.date_range("2024-01-01", periods=50, freq="h"))
+        self.assertEqual(make_key(a=1, b=(2, 3)), make_key(b=[2, 3], a=1))
+        self.assertNotEqual(make_key(fees=0.001), make_key(fees=0.002))
+        self.assertEqual(data_digest(price), data_digest(price.copy()))
+        self.assertNotEqual(data_digest(price), data_digest(price.shift(1, freq="h")))
+        moved = price.copy()
+        moved.iloc[-1] += 1e-9
+        self.assertNotEqual(data_digest(price), data_digest(moved))
+
+
+def _scaled_task(state, x):
+    """Job-queue task: payload x the job's context."""
+    if x < 0:
+        raise ValueError("negative payload")
+    return x * state["scale"]
+
+
+class TestJobQueue(unittest.TestCase):
+    """Test the resumable sweep job queue."""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "jobs.sqlite")
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_local_workers_drain_queue_in_task_order(self):
+        queue = JobQueue(self.path)
+        self.assertTrue(queue.submit("job", _scaled_task, list(range(20)), context={"scale": 3}, combine=sum))
+        self.assertFalse(queue.submit("job", _scaled_task, list(range(20)), context={"scale": 3}))
+        self.assertEqual(run_local_workers(self.path, n_workers=2), 20)
+        self.assertEqual(queue.results("job"), [3 * x for x in range(20)])
+        self.assertEqual(queue.collect("job"), 3 * 190)
+        queue.close()
+    
+    def test_resume_after_crash(self):
+        queue = JobQueue(self.path, lease_seconds=0.0)
+        queue.submit("job", _scaled_task, [1, 2, 3, 4], context={"scale": 1})
+        self.assertEqual(run_worker(self.path, max_tasks=2), 2)          # Checkpointed
+        queue.claim("crashed-worker")                                     # Never completes
+        self.assertEqual(queue.progress("job"), {"pending": 1, "running": 1, "done": 2, "failed": 0})
+        with self.assertRaises(RuntimeError):
+            queue.collect("job")
+        
+        # The expired lease is taken over; finished tasks are not rerun
+        self.assertEqual(run_worker(self.path, lease_seconds=60), 2)
+        self.assertEqual(queue.collect("job"), [1, 2, 3, 4])
+        queue.close()
+    
+    def test_failures_retry_then_fail(self):
+        queue = JobQueue(self.path, max_attempts=2)
+        queue.submit("job", _scaled_task, [1, -1], context={"scale": 2})
+        self.assertEqual(run_worker(self.path, max_attempts=2), 1)
+        self.assertEqual(queue.progress("job")["failed"], 1)
+        self.assertIn("negative payload", queue.errors("job")[1])
+        with self.assertRaises(RuntimeError):
+            queue.collect("job")
+        self.assertEqual(queue.retry_failed("job"), 1)
+        self.assertEqual(queue.progress("job")["pending"], 1)
+        queue.close()
+    
+    @unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+    def test_walk_forward_job_matches_in_process(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backtest"))
+        from vectorbt_backtest import VAYUBacktester
+        
+        df = make_ohlcv(1500, seed=8)
+        price = pd.Series(df["close"].to_numpy(), index=pd.to_datetime(df["timestamp"], unit="ms"))
+        bt = VAYUBacktester(config={})
+        queue = JobQueue(self.path)
+        job_id = bt.submit_walk_forward(queue, price, train_size=800, test_size=200, step_size=250)
+        self.assertEqual(bt.submit_walk_forward(queue, price, train_size=800, test_size=200, step_size=250), job_id)
+        run_worker(self.path, job_id=job_id)
+        expected = bt.walk_forward_analysis(price, train_size=800, test_size=200, step_size=250)
+        pd.testing.assert_frame_equal(queue.collect(job_id), expected)
+        
+        grid = dict(rsi_windows=[7, 13], oversold_range=[30, 40], overbought_range=[60, 75])
+        job_id = bt.submit_optimize(queue, price, **grid)
+        run_worker(self.path, job_id=job_id)
+        key = ["rsi_period", "oversold", "overbought"]
+        pd.testing.assert_frame_equal(
+            queue.collect(job_id).set_index(key).sort_index(),
+            bt.optimize_parameters(price, **grid).set_index(key).sort_index()
+        )
+        queue.close()
+
+    @unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+    def test_optimize_job_matches_in_process(self):
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backtest"))
+        from vectorbt_backtest import VAYUBacktester
+
+        # Tied Sharpe ratios: the job must rank them in the same order
+        df = make_ohlcv(3000, seed=7)
+        price = pd.Series(df["close"].to_numpy(), index=pd.to_datetime(df["timestamp"], unit="ms"))
+        bt = VAYUBacktester(config={})
+        queue = JobQueue(self.path)
+        job_id = bt.submit_optimize(queue, price)
+        self.assertEqual(run_local_workers(self.path, n_workers=2), len(range(7, 21, 2)))
+        pd.testing.assert_frame_equal(
+            queue.collect(job_id),
+            bt.optimize_parameters(price)
+        )
+        queue.close()
+
+
 class TestBacktestEngine(unittest.TestCase):
     """Test backtesting framework."""
     
@@ -94,6 +1459,152 @@ class TestBacktestEngine(unittest.TestCase):
             self.assertTrue(True)
         except ImportError as e:
             self.fail(f"Import failed: {e}")
+    
+    @unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+    def test_shared_cash_respects_max_positions(self):
+        from src.backtest.backtest_engine import BacktestEngine
+        
+        class RandomSignals(BacktestEngine):
+            def generate_signals(self, close_prices):
+                rng = np.random.default_rng(1)
+                shape, idx, cols = close_prices.shape, close_prices.index, close_prices.columns
+                entries = pd.DataFrame(rng.random(shape) < 0.05, index=idx, columns=cols)
+                exits = pd.DataFrame(rng.random(shape) < 0.05, index=idx, columns=cols) & ~entries
+                return entries, exits
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HistoricalStore(tmp)
+            symbols = [f"C{i}/USD" for i in range(6)]
+            for i, symbol in enumerate(symbols):
+                df = make_ohlcv(600, seed=i, start_price=100.0)
+                store.save(df.iloc[100:] if i == 2 else df, symbol, "1h")   # One late listing
+            
+            for cap in (1, 3):
+                engine = RandomSignals(symbols, datetime(2024, 1, 1), datetime(2025, 1, 1),
+                                       store=store, max_positions=cap)
+                pf = engine.simulate(engine.load_close_prices())
+                
+                positions = pf.positions.records_arr
+                n = len(pf.wrapper.index)
+                opened = np.zeros(n + 1, dtype=int)
+                np.add.at(opened, positions["entry_idx"], 1)
+                np.add.at(opened, np.where(positions["status"] == 1, positions["exit_idx"], n), -1)
+                self.assertEqual(np.cumsum(opened).max(), cap)
+                self.assertGreaterEqual(pf.cash().min(), -1e-9)   # One account, never overdrawn
+    
+    @unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+    def test_cached_run_skips_simulation(self):
+        from src.backtest.backtest_engine import BacktestEngine
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HistoricalStore(tmp)
+            store.save(make_ohlcv(1500, start_price=100.0), "BTC/USD", "1h")
+            cache = ResultCache(os.path.join(tmp, "results.sqlite"))
+            
+            first = BacktestEngine(["BTC/USD"], datetime(2024, 1, 1), datetime(2025, 1, 1), store=store, cache=cache)
+            results = first.run()
+            
+            second = BacktestEngine(["BTC/USD"], datetime(2024, 1, 1), datetime(2025, 1, 1), store=store, cache=cache)
+            second.simulate = lambda close_prices: self.fail("simulated on a cache hit")
+            pd.testing.assert_series_equal(pd.Series(second.run()), pd.Series(results))
+            pd.testing.assert_series_equal(second.equity, first.equity)
+            
+            # Different costs: a different key
+            third = BacktestEngine(["BTC/USD"], datetime(2024, 1, 1), datetime(2025, 1, 1),
+                                   store=store, cache=cache, fees=0.002)
+            self.assertNotEqual(third.cache_key(), first.cache_key())
+            
+            # Different signal rules: a subclass misses the base engine's entry
+            class Periodic(BacktestEngine):
+                def generate_signals(self, close_prices):
+                    bar = np.arange(len(close_prices))[:, None] % 50
+                    shape = close_prices.shape
+                    return (pd.DataFrame(np.broadcast_to(bar == 0, shape), close_prices.index, close_prices.columns),
+                            pd.DataFrame(np.broadcast_to(bar == 25, shape), close_prices.index, close_prices.columns))
+            
+            other = Periodic(["BTC/USD"], datetime(2024, 1, 1), datetime(2025, 1, 1), store=store, cache=cache)
+            self.assertNotEqual(other.cache_key(), first.cache_key())
+            self.assertEqual(other.run()["total_trades"], 30)
+            self.assertEqual(results["total_trades"], first.run()["total_trades"])
+            cache.close()
+    
+    @unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+    def test_plot_downsampled_report(self):
+        from src.backtest.backtest_engine import BacktestEngine
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            store = HistoricalStore(tmp)
+            store.save(make_ohlcv(5000, start_price=100.0), "BTC/USD", "1h")
+            cache = ResultCache(os.path.join(tmp, "results.sqlite"))
+            BacktestEngine(["BTC/USD"], datetime(2024, 1, 1), datetime(2025, 1, 1), store=store, cache=cache).run()
+            
+            # A cached run has no portfolio but still plots
+            engine = BacktestEngine(["BTC/USD"], datetime(2024, 1, 1), datetime(2025, 1, 1), store=store, cache=cache)
+            engine.run()
+            self.assertIsNone(engine.portfolio)
+            path = os.path.join(tmp, "equity.html")
+            fig = engine.plot_equity_curve(path, max_points=300)
+            cache.close()
+            
+            self.assertTrue(os.path.getsize(path) > 0)
+            self.assertEqual(len(fig.data), 3)   # Price, equity, drawdown
+            for trace in fig.data:
+                self.assertLessEqual(len(trace.x), 300 + 2)
+
+
+@unittest.skipUnless(HAS_VBT, "vectorbt not installed")
+class TestReport(unittest.TestCase):
+    """Test downsampled equity/drawdown reports."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        index = pd.date_range("2020-01-01", periods=200_000, freq="1min")
+        self.equity = pd.Series(10000 * np.exp(np.cumsum(rng.normal(0, 1e-3, len(index)))), index=index)
+    
+    def test_lttb_size_and_endpoints(self):
+        from src.backtest.report import lttb_indices
+        
+        y = self.equity.to_numpy()
+        idx = lttb_indices(np.arange(len(y), dtype=float), y, 1000)
+        self.assertEqual(len(idx), 1000)
+        self.assertEqual((idx[0], idx[-1]), (0, len(y) - 1))
+        self.assertTrue(np.all(np.diff(idx) > 0))
+        np.testing.assert_array_equal(lttb_indices(np.arange(10.0), y[:10], 50), np.arange(10))
+    
+    @unittest.skipUnless(kernels.NUMBA_AVAILABLE, "numba not installed")
+    def test_numba_matches_python(self):
+        from src.backtest import report
+        
+        x = np.arange(5000, dtype=float)
+        y = self.equity.to_numpy()[:5000]
+        np.testing.assert_array_equal(report._lttb_nb(x, y, 200), report._lttb(x, y, 200))
+        np.testing.assert_array_equal(report._minmax_nb(y, 100), report._minmax(y, 100))
+    
+    def test_drawdown_extremes_survive(self):
+        from src.backtest.report import downsample, drawdown, minmax_indices, report_figure
+        
+        y = self.equity.to_numpy()
+        idx = minmax_indices(y, 500)
+        self.assertLessEqual(len(idx), 502)
+        self.assertIn(np.argmin(y), idx)
+        self.assertIn(np.argmax(y), idx)
+        
+        dd = drawdown(self.equity)
+        s = downsample(dd, 500, "minmax")
+        self.assertEqual(s.min(), dd.min())
+        
+        fig = report_figure(self.equity, n_points=500)
+        equity_trace, dd_trace = fig.data
+        trough = dd.idxmin()
+        peak = self.equity[:trough].idxmax()
+        self.assertIn(trough, pd.DatetimeIndex(equity_trace.x))
+        self.assertIn(peak, pd.DatetimeIndex(equity_trace.x))
+        self.assertAlmostEqual(min(dd_trace.y), dd.min() * 100)
+        
+        with self.assertRaises(ValueError):
+            downsample(self.equity, 500, "every_nth")
+        with self.assertRaisesRegex(ValueError, "all NaN"):
+            report_figure(pd.Series(np.nan, index=self.equity.index[:10]))
 
 
 class TestPerformanceTracker(unittest.TestCase):
@@ -116,7 +1627,30 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestRSIStrategy))
     suite.addTests(loader.loadTestsFromTestCase(TestRiskEngine))
     suite.addTests(loader.loadTestsFromTestCase(TestPortfolio))
+    suite.addTests(loader.loadTestsFromTestCase(TestStreamingIndicators))
+    suite.addTests(loader.loadTestsFromTestCase(TestIndicatorKernels))
+    suite.addTests(loader.loadTestsFromTestCase(TestRollingWindows))
+    suite.addTests(loader.loadTestsFromTestCase(TestTriggerPrices))
+    suite.addTests(loader.loadTestsFromTestCase(TestMemoization))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchSignals))
+    suite.addTests(loader.loadTestsFromTestCase(TestStrategyEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestEnsemble))
+    suite.addTests(loader.loadTestsFromTestCase(TestWindowedIndicators))
+    suite.addTests(loader.loadTestsFromTestCase(TestPrecision))
+    suite.addTests(loader.loadTestsFromTestCase(TestRanking))
+    suite.addTests(loader.loadTestsFromTestCase(TestTradingBot))
+    suite.addTests(loader.loadTestsFromTestCase(TestExits))
+    suite.addTests(loader.loadTestsFromTestCase(TestParameterSweep))
+    suite.addTests(loader.loadTestsFromTestCase(TestAdaptiveSearch))
+    suite.addTests(loader.loadTestsFromTestCase(TestSharedArrays))
+    suite.addTests(loader.loadTestsFromTestCase(TestParallelWalkForward))
+    suite.addTests(loader.loadTestsFromTestCase(TestEventBacktester))
+    suite.addTests(loader.loadTestsFromTestCase(TestMonteCarlo))
+    suite.addTests(loader.loadTestsFromTestCase(TestHistoricalStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestResultCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestJobQueue))
     suite.addTests(loader.loadTestsFromTestCase(TestBacktestEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestReport))
     suite.addTests(loader.loadTestsFromTestCase(TestPerformanceTracker))
     
     runner = unittest.TextTestRunner(verbosity=2)